@@ -0,0 +1,116 @@
+"""Run the benchmark suite, or compare a run against a baseline.
+
+Usage:
+    python -m benchmarks run [-o results.json] [-k pattern] [--repeat N]
+    python -m benchmarks compare results.json [--baseline benchmarks/baseline.json] [--threshold 0.1]
+
+A run records the best time per call of each benchmark. compare exits with status 1 when any
+benchmark is slower than its baseline by more than the threshold (10% by default).
+
+Timings are only comparable on the same machine, so the baseline is not committed. It is
+recorded locally, i.e. before starting on a change, with:
+    python -m benchmarks run -o benchmarks/baseline.json
+or `make bench_baseline`.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import sys
+import timeit
+
+from .suite import BENCHMARKS
+
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+
+def run(__pattern: str | None = None, repeat: int = 5) -> dict:
+    """Time every benchmark whose name contains the pattern.
+
+    :return: Dictionary of benchmark names to their best time per call, in seconds.
+    """
+    results = {}
+    for name, setup in BENCHMARKS.items():
+        if __pattern is not None and __pattern not in name:
+            continue
+        timer = timeit.Timer(setup())
+        number, _ = timer.autorange()
+        best = min(timer.repeat(repeat, number)) / number
+        results[name] = best
+        print(f"{name:<32} {best * 1e6:>14.1f} us")
+    return results
+
+
+def compare(__results: dict, __baseline: dict, threshold: float = 0.1) -> list[str]:
+    """Compare two runs, returning the names of benchmarks that regressed past the threshold."""
+    regressions = []
+    for name, time in __results.items():
+        if name not in __baseline:
+            print(f"{name:<32} {'(new)':>14}")
+            continue
+        change = time / __baseline[name] - 1
+        flag = ""
+        if change > threshold:
+            flag = " REGRESSION"
+            regressions.append(name)
+        print(f"{name:<32} {change:>+13.1%}{flag}")
+    return regressions
+
+
+def _load(__path: str) -> dict:
+    with open(__path, "r") as fp:
+        return json.load(fp)["results"]
+
+
+def main(__argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run the benchmarks.")
+    run_parser.add_argument("-o", "--output", help="Write the results to a JSON file.")
+    run_parser.add_argument("-k", dest="pattern", help="Only run matching benchmarks.")
+    run_parser.add_argument("--repeat", type=int, default=5)
+
+    compare_parser = commands.add_parser(
+        "compare", help="Compare a results file against a baseline."
+    )
+    compare_parser.add_argument("results")
+    compare_parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    compare_parser.add_argument("--threshold", type=float, default=0.1)
+
+    args = parser.parse_args(__argv)
+    if args.command == "run":
+        results = run(args.pattern, args.repeat)
+        if args.output:
+            with open(args.output, "w") as fp:
+                json.dump(
+                    {
+                        "python": platform.python_version(),
+                        "machine": platform.machine(),
+                        "results": results,
+                    },
+                    fp,
+                    indent=2,
+                )
+        return 0
+
+    for path in (args.results, args.baseline):
+        if not os.path.exists(path):
+            print(
+                f"No benchmark results at '{path}'. Record them on this machine with:\n"
+                f"    python -m benchmarks run -o {path}",
+                file=sys.stderr,
+            )
+            return 2
+    regressions = compare(_load(args.results), _load(args.baseline), args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,169 @@
+"""Benchmarks of the core generation paths.
+
+Each benchmark is a setup function registered with @benchmark. Setup runs once, outside of the
+timing, and returns the callable that is timed.
+"""
+from __future__ import annotations
+
+from typing import Callable
+
+import ecdypy as ec
+
+
+BENCHMARKS: dict[str, Callable[[], Callable[[], object]]] = {}
+
+
+def benchmark(__name: str):
+    """Register a benchmark setup function under the given name."""
+
+    def decorator(__setup):
+        BENCHMARKS[__name] = __setup
+        return __setup
+
+    return decorator
+
+
+def _register_tuple_construction(__width: int, __depth: int) -> None:
+    @benchmark(f"tuple_construct_w{__width}_d{__depth}")
+    def setup():
+        types = [ec.RTypes.u8, ec.RTypes.i16, ec.RTypes.u32, ec.RTypes.bool]
+        args = [types[i % len(types)] for i in range(__width)]
+        for _ in range(__depth - 1):
+            args = [tuple(args), ec.RTypes.u8]
+        # Types are interned in a weak table, so a Tuple that is not kept alive is built from
+        # scratch on every call.
+        return lambda: ec.Tuple(*args)
+
+
+for width, depth in ((4, 1), (64, 1), (1024, 1), (4, 16)):
+    _register_tuple_construction(width, depth)
+
+
+@benchmark("struct_value_from_w256")
+def _struct_value_from():
+    struct = ec.Struct({f"field_{i}": ec.RTypes.u32 for i in range(256)}, name="Wide")
+    values = {f"field_{i}": i for i in range(256)}
+    return lambda: struct.value_from(values)
+
+
+@benchmark("variable_declaration")
+def _variable_declaration():
+    typ = ec.Tuple(ec.RTypes.u8, ec.RTypes.u16, (ec.RTypes.i32, ec.RTypes.bool))
+    derive = ec.Derive("Debug", "Clone")
+
+    def run():
+        variable = ec.Variable("my_var", typ, [1, 2, (3, True)], macros=derive)
+        return str(variable.get_declaration())
+
+    return run
+
+
+@benchmark("codetext_append_10k")
+def _codetext_append():
+    def run():
+        text = ec.CodeText()
+        for i in range(10_000):
+            text.add_text(f"let x_{i} = {i};")
+        return text
+
+    return run
+
+
+@benchmark("codetext_iadd_10k")
+def _codetext_iadd():
+    def run():
+        text = ec.CodeText()
+        for i in range(10_000):
+            text += f"let x_{i} = {i};"
+        return text
+
+    return run
+
+
+@benchmark("codetext_builder_100k")
+def _codetext_builder():
+    def run():
+        builder = ec.CodeText.builder()
+        builder.extend(f"let x_{i} = {i};" for i in range(100_000))
+        return str(builder.freeze())
+
+    return run
+
+
+@benchmark("function_nested_d200")
+def _function_nested():
+    def run():
+        root = ec.Function("level_0")
+        current = root
+        for i in range(1, 200):
+            child = ec.Function(f"level_{i}")
+            child.add(ec.Variable(f"var_{i}", ec.RTypes.i32, i))
+            current.add(child.get_definition())
+            current = child
+        return str(root.get_definition())
+
+    return run
+
+
+@benchmark("match_10k_arms")
+def _match_arms():
+    def run():
+        match = ec.MatchStatement("value")
+        for i in range(10_000):
+            arm = ec.Arm(i)
+            arm.add(f"return {i};")
+            match.add(arm)
+        return str(match)
+
+    return run
+
+
+@benchmark("codewriter_render")
+def _codewriter_render():
+    writer = ec.CodeWriter()
+    writer.add_auto_gen_comment()
+    struct = ec.Struct({"a": "u8", "b": "u16", "c": "i64"}, name="Record")
+    writer.add(struct)
+    for i in range(500):
+        function = ec.Function(f"make_{i}", [{"seed": ec.RTypes.u64}], struct)
+        function.add(ec.Variable(f"value_{i}", struct, {"a": 1, "b": i, "c": -i}))
+        function.add(f"value_{i}")
+        writer.add(function)
+
+    def run():
+        # Mark the tree as changed, so that every render starts from a cold cache.
+        writer._mark_dirty()
+        return str(writer)
+
+    return run
+
+
+@benchmark("codewriter_fork_40")
+def _codewriter_fork():
+    prelude = ec.CodeWriter()
+    prelude.add_auto_gen_comment()
+    for i in range(2_000):
+        prelude.add(ec.Variable(f"value_{i}", ec.RTypes.u32, i).get_declaration())
+
+    def run():
+        # Forks share the prelude, so it is only rendered by the first of them.
+        prelude._mark_dirty()
+        targets = [prelude.fork() for _ in range(40)]
+        for i, target in enumerate(targets):
+            target.add(f"const TARGET: u32 = {i};")
+        return [str(x) for x in targets]
+
+    return run
+
+
+@benchmark("template_function_instantiate")
+def _template_function():
+    func = ec.Function(
+        ec.Placeholder("name"), [{"value": ec.Placeholder("T")}], ec.RTypes.bool
+    )
+    func.add(
+        ec.Variable("limit", ec.RTypes.u32, ec.Placeholder("limit", ec.RTypes.u32))
+    )
+    func.add("value < limit")
+    template = ec.Template(func.get_definition())
+    return lambda: template.render(name="is_small", T="u16", limit=1000)
@@ -1,17 +1,41 @@
 from ._meta import __version__, __source__
-from .codewriter import _CODEOBJECT_
-from .codewriter import CodeText
-from .codewriter import CodeWriter
-from .rtypes import RTypes
-from .rtypes import _TYPE_
-from .rtypes import Tuple
-from .rtypes import Struct
-from .rconstructs import Variable
-from .rconstructs import Function
-from .rconstructs import MatchStatement
-from .rconstructs import Arm
-from .macros import Derive
-from .macros import Macro
+
+# Public names are imported from their submodules on first access (PEP 562), so that
+# `import ecdypy` itself stays cheap for build scripts that only need part of the package.
+_LAZY_ATTRS = {
+    "_CODEOBJECT_": "codewriter",
+    "CodeText": "codewriter",
+    "CodeWriter": "codewriter",
+    "RTypes": "rtypes",
+    "_TYPE_": "rtypes",
+    "Tuple": "rtypes",
+    "Struct": "rtypes",
+    "Variable": "rconstructs",
+    "Function": "rconstructs",
+    "MatchStatement": "rconstructs",
+    "Arm": "rconstructs",
+    "StaticArray": "rconstructs",
+    "ConstArray": "rconstructs",
+    "StructOfArrays": "rconstructs",
+    "StaticTable": "rconstructs",
+    "Derive": "macros",
+    "Macro": "macros",
+    "Module": "crate",
+    "Crate": "crate",
+    "cached_fragment": "cache",
+    "Profiler": "codewriter",
+    "Template": "template",
+    "Placeholder": "template",
+    # Submodules
+    "diagnostics": None,
+    "codewriter": None,
+    "rtypes": None,
+    "rconstructs": None,
+    "macros": None,
+    "crate": None,
+    "cache": None,
+    "template": None,
+}
 
 __all__ = (
     "_CODEOBJECT_",
@@ -24,8 +48,37 @@ __all__ = (
     "Variable",
     "Function",
     "MatchStatement",
-    "Arm"
-    "Decorator",
+    "Arm",
+    "StaticArray",
+    "ConstArray",
+    "StructOfArrays",
+    "StaticTable",
     "Derive",
     "Macro",
+    "Module",
+    "Crate",
+    "cached_fragment",
+    "Profiler",
+    "Template",
+    "Placeholder",
+    "diagnostics",
 )
+
+
+def __getattr__(__name: str):
+    if __name not in _LAZY_ATTRS:
+        raise AttributeError(f"module {__name__!r} has no attribute {__name!r}")
+    from importlib import import_module
+
+    submodule = _LAZY_ATTRS[__name]
+    if submodule is None:
+        value = import_module(f"{__name__}.{__name}")
+    else:
+        value = getattr(import_module(f"{__name__}.{submodule}"), __name)
+    # Cache the value so that __getattr__ is only called once per name.
+    globals()[__name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
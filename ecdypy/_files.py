@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from typing import IO, Iterator
+import os
+import tempfile
+
+# Umask of the process, when it cannot be read without replacing it.
+_umask: int | None = None
+
+
+def _get_umask() -> int:
+    """Read the process umask, from /proc where it is available."""
+    global _umask
+    try:
+        with open("/proc/self/status", "rb") as fp:
+            for line in fp:
+                if line.startswith(b"Umask:"):
+                    return int(line.split()[1], 8)
+    except OSError:
+        pass
+    # Elsewhere the umask can only be read by replacing it, which changes the mode of files
+    # created by other threads in the meantime, so it is only read once.
+    if _umask is None:
+        _umask = os.umask(0)
+        os.umask(_umask)
+    return _umask
+
+
+def get_file_mode() -> int:
+    """Mode that open() gives new files, i.e. 0o666 without the bits set in the process umask."""
+    return 0o666 & ~_get_umask()
+
+
+@contextmanager
+def atomic_open(__path: str, suffix: str = "") -> Iterator[IO[str]]:
+    """Open a temporary file next to the path for writing, and rename it over the path once the
+    with block completes, so readers never observe a partially written file. The temporary file
+    is removed if the block raises.
+
+    :param __path: Path of the file to write.
+    :type __path: str
+    :param suffix: Suffix of the temporary file, defaults to ''
+    :type suffix: str, optional
+    :return: The temporary file, opened for writing text.
+    """
+    directory = os.path.dirname(__path)
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".ecdypy-", suffix=suffix)
+    try:
+        with os.fdopen(fd, "w") as fp:
+            # mkstemp creates private (0600) files, give the file the mode open() would have.
+            os.chmod(temp_path, get_file_mode())
+            yield fp
+        os.replace(temp_path, __path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
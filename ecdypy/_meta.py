@@ -1,3 +1,2 @@
 __version__ = 0.1
 __source__ = r"https://github.com/YammyToast/ecdypy"
-
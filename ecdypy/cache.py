@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+from typing import Callable
+import functools
+import hashlib
+import inspect
+import os
+import pickle
+import threading
+
+from ._files import atomic_open
+from .codewriter import CodeText
+
+
+DEFAULT_CACHE_DIR = ".ecdypy_cache"
+DEFAULT_MAX_SIZE = 256 * 1024 * 1024
+
+# Eviction shrinks the cache to this fraction of its maximum size, so that it is not scanned
+# again on every following write.
+_EVICT_TO = 0.75
+
+# Running estimate of the total size of each cache directory, in bytes, guarded by _sizes_lock.
+_sizes: dict[str, int] = {}
+_sizes_lock = threading.Lock()
+
+
+def _source_of(__func: Callable) -> bytes:
+    """Get the source of a function, falling back to its bytecode when the source is unavailable."""
+    try:
+        return inspect.getsource(__func).encode()
+    except (OSError, TypeError):
+        return __func.__code__.co_code
+
+
+def _key_of(
+    __func: Callable, __source: bytes, __args: tuple, __kwargs: dict
+) -> str | None:
+    """Hash a call into a cache key, or return None if its arguments cannot be pickled."""
+    try:
+        arguments = pickle.dumps((__args, sorted(__kwargs.items())), protocol=4)
+    except Exception:
+        # The repr of such objects usually holds their address, which changes on every run.
+        return None
+    digest = hashlib.sha256()
+    digest.update(f"{__func.__module__}.{__func.__qualname__}".encode())
+    digest.update(__source)
+    digest.update(arguments)
+    return digest.hexdigest()
+
+
+def _evict(__directory: str, __max_size: int) -> int:
+    """Remove the least recently used entries until the cache fits within the size limit.
+
+    :return: Total size of the remaining entries, in bytes.
+    :rtype: int
+    """
+    entries = []
+    total = 0
+    for entry in os.scandir(__directory):
+        if not entry.name.endswith(".rs"):
+            continue
+        stat = entry.stat()
+        entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total += stat.st_size
+    if total <= __max_size:
+        return total
+    entries.sort()
+    for _, size, path in entries:
+        if total <= __max_size:
+            break
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+    return total
+
+
+def cached_fragment(
+    __func: Callable | None = None,
+    directory: str | None = None,
+    max_size: int = DEFAULT_MAX_SIZE,
+):
+    """Decorator that caches the rendered output of a code-generating function on disk.
+
+    The output is keyed on a hash of the function's arguments and its own source, so editing the
+    function invalidates its entries. On a cache hit the function is not called at all, and the
+    cached text is returned as a CodeText. Calls with arguments that cannot be pickled are not
+    cached. The size of the cache is tracked as entries are written, and once it grows beyond
+    max_size bytes the least recently used entries are evicted.
+
+    The cache directory is taken from the directory argument, then the ECDYPY_CACHE_DIR
+    environment variable, and defaults to '.ecdypy_cache' in the working directory.
+
+    Examples:
+        >>> import ecdypy as ec
+        >>> @ec.cached_fragment
+        >>> def make_getter(name, typ):
+        >>>     func = ec.Function(f"get_{name}", returns=typ)
+        >>>     func.add(name)
+        >>>     return func.get_definition()
+        >>> \n
+        >>> cwr = ec.CodeWriter()
+        >>> cwr.add(make_getter("width", ec.RTypes.u16)) # Built and stored.
+        >>> cwr.add(make_getter("width", ec.RTypes.u16)) # Read from the cache.
+
+    :param directory: Cache directory, defaults to None
+    :type directory: str | None, optional
+    :param max_size: Maximum total size of the cache in bytes, defaults to 256MiB
+    :type max_size: int, optional
+    :return: The decorated function, which returns a CodeText.
+    """
+
+    def decorator(__func: Callable) -> Callable[..., CodeText]:
+        source = _source_of(__func)
+
+        @functools.wraps(__func)
+        def wrapper(*args, **kwargs) -> CodeText:
+            cache_dir = (
+                directory or os.environ.get("ECDYPY_CACHE_DIR") or DEFAULT_CACHE_DIR
+            )
+            key = _key_of(__func, source, args, kwargs)
+            if key is None:
+                return CodeText(str(__func(*args, **kwargs)))
+            path = os.path.join(cache_dir, f"{key}.rs")
+            try:
+                with open(path, "r") as fp:
+                    text = fp.read()
+                # Mark the entry as recently used.
+                os.utime(path)
+                return CodeText(text)
+            except FileNotFoundError:
+                pass
+
+            text = str(__func(*args, **kwargs))
+            os.makedirs(cache_dir, exist_ok=True)
+            with atomic_open(path) as fp:
+                fp.write(text)
+
+            # The directory is only scanned the first time it is written to, and whenever the
+            # estimate passes the limit. Concurrent writers must not lose each other's updates.
+            with _sizes_lock:
+                size = _sizes.get(cache_dir)
+                if size is None:
+                    size = _evict(cache_dir, max_size)
+                else:
+                    size += len(text.encode())
+                    if size > max_size:
+                        size = _evict(cache_dir, int(max_size * _EVICT_TO))
+                _sizes[cache_dir] = size
+            return CodeText(text)
+
+        return wrapper
+
+    if __func is not None:
+        return decorator(__func)
+    return decorator
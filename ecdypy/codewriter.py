@@ -1,19 +1,25 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import Iterable
+from typing import IO, Iterable, Iterator
 
 from collections import deque
 from dataclasses import dataclass
-import traceback
+import functools
+import itertools
+import os
+import re
+import weakref
 
 from ._meta import __version__, __source__
+from .diagnostics import report
 
 
-@dataclass
+@dataclass(frozen=True)
 class Formatter:
     """Formatter Interface Class
     Provides options for determining how a CodeWriter will format its text.
+    Formatters are immutable so that they can be shared between concurrent renders.
     WIP.
     """
 
@@ -27,9 +33,37 @@ default_formatter = Formatter(
 )
 
 
+_NAME_TOKEN_PATTERN = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+
+# Methods registered for instrumentation, as (class, attribute, category, namer) entries.
+_PROFILED_METHODS = []
+
+
+class _profiled(object):
+    """Method decorator registering the method for instrumentation by a Profiler.
+
+    The decorator replaces itself with the undecorated method as soon as its class is created,
+    so a registered method costs nothing until a Profiler is enabled.
+    """
+
+    def __init__(self, __category: str, __namer=None) -> None:
+        self._category = __category
+        self._namer = __namer
+
+    def __call__(self, __func):
+        self._func = __func
+        return self
+
+    def __set_name__(self, __owner: type, __name: str) -> None:
+        _PROFILED_METHODS.append((__owner, __name, self._category, self._namer))
+        setattr(__owner, __name, self._func)
+
+
 class _DECLARABLE_(ABC):
     """Base Class Interface for CodeObjects that can be declared separately from their normal representation."""
 
+    __slots__ = ()
+
     def __init__(self):
         pass
 
@@ -41,6 +75,8 @@ class _DECLARABLE_(ABC):
 class _DEFINABLE_(ABC):
     """Base Class Interface for CodeObjects that can be declared separately from their normal representation."""
 
+    __slots__ = ()
+
     def __init__(self):
         pass
 
@@ -49,19 +85,395 @@ class _DEFINABLE_(ABC):
         pass
 
 
-class _CONTAINER_(object):
-    def __init__(self, __init=None, __formatter: Formatter = default_formatter):
+class _MEMOIZED_(object):
+    """Base Class for CodeObjects that cache their rendered text.
+
+    Rendered text is stored per emitter and indentation depth, and is discarded whenever the
+    object, or any object nested inside of it, is mutated. Objects record the containers they
+    have been added to so that a mutation can mark every ancestor as dirty. Parents are held by
+    weak reference, so a node shared between many containers does not keep them alive.
+
+    Nodes are slotted rather than carrying a per-instance __dict__, which keeps large trees
+    compact. Subclasses declare their own attributes in __slots__.
+    """
+
+    __slots__ = ("_render_cache", "_parents", "_revision", "__weakref__")
+
+    def __new__(cls, *args, **kwargs):
+        self = object.__new__(cls)
+        self._render_cache = None
+        self._parents = None
+        self._revision = 0
+        return self
+
+    def __getstate__(self) -> dict:
+        # Caches and parent links are not part of the object; leaving them out keeps pickles
+        # small and stops a pickled node from dragging its whole ancestry along with it.
+        state = {}
+        for cls in type(self).__mro__:
+            for name in cls.__dict__.get("__slots__", ()):
+                if name not in _MEMOIZED_.__slots__ and hasattr(self, name):
+                    state[name] = getattr(self, name)
+        state.update(getattr(self, "__dict__", {}))
+        return state
+
+    def __setstate__(self, __state: dict) -> None:
+        for name, value in __state.items():
+            setattr(self, name, value)
+
+    def _add_parent(self, __parent: _MEMOIZED_) -> None:
+        if self._parents is None:
+            self._parents = set()
+        self._parents.add(weakref.ref(__parent))
+
+    def _mark_dirty(self) -> None:
+        """Discard the cached output of this object and every object containing it."""
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            node._revision += 1
+            node._render_cache = None
+            if node._parents:
+                dead = []
+                for ref in node._parents:
+                    parent = ref()
+                    if parent is None:
+                        dead.append(ref)
+                    else:
+                        stack.append(parent)
+                # Forget the parents that have since been collected.
+                node._parents.difference_update(dead)
+
+
+# Marks a cache miss, since a cached fragment may be empty, or None if nothing was written.
+_MISSING = object()
+
+
+class _Renderer(object):
+    """Single-pass renderer for trees of CodeObjects.
+
+    Every CodeObject writes its lines through the renderer exactly once, into one shared buffer.
+    Indentation is kept as a stack of prefixes that is applied to each line as it is written,
+    rather than being re-applied by every enclosing construct, so the total work is linear in
+    the size of the output.
+
+    Only the render root and its direct children store their output in the render cache. This
+    keeps the number of copies of each fragment constant regardless of how deeply it is nested.
+    When streaming to a sink, cached output is reused but nothing new is stored, since recording
+    a fragment would hold all of it in the buffer until it is complete.
+
+    The renderer is the render context: the formatter and the current indentation are passed
+    down through it and are never written onto the CodeObjects themselves. The same object can
+    therefore be shared between several parents, or rendered from several threads at once.
+    """
+
+    _MEMO_LEVELS = 2
+    _FLUSH_SIZE = 4096
+
+    def __init__(
+        self,
+        __formatter: Formatter = default_formatter,
+        __sink=None,
+        memo: bool = True,
+    ):
         self._formatter = __formatter
-        self._indent = 1
-        init = __init
-        if isinstance(init, CodeWriter):
-            self._code_obj_tree = init._code_obj_tree
-        elif isinstance(init, list):
-            self._code_obj_tree = deque(init)
-        elif init != None:
-            self._code_obj_tree = deque([init])
+        self._separator = __formatter._separator
+        self._unit = " " * __formatter._indent_spaces
+        self._prefixes = [""]
+        self._buf = []
+        self._started = False
+        self._sink = __sink
+        self._memo = memo
+        self._open_scopes = 0
+
+    def indent(self) -> None:
+        """Increase the indentation of subsequent lines by one level."""
+        self._prefixes.append(self._prefixes[-1] + self._unit)
+
+    def dedent(self) -> None:
+        """Decrease the indentation of subsequent lines by one level."""
+        self._prefixes.pop()
+
+    def column(self) -> int:
+        """Width of the current indentation, i.e. the column subsequent lines start at."""
+        return len(self._prefixes[-1])
+
+    def line(self, __text: str = "") -> None:
+        """Write text at the current indentation. Multi-line text is indented line by line."""
+        if "\n" in __text:
+            for part in __text.split("\n"):
+                self.line(part)
+            return
+        buf = self._buf
+        if self._started:
+            buf.append(self._separator)
+        self._started = True
+        prefix = self._prefixes[-1]
+        buf.append(prefix + __text if prefix and __text else __text)
+        if self._sink is not None and len(buf) >= self._FLUSH_SIZE:
+            self.flush()
+
+    def _fragment(self, __text: str) -> None:
+        """Write pre-rendered (and already indented) text."""
+        buf = self._buf
+        if self._started:
+            buf.append(self._separator)
+        self._started = True
+        buf.append(__text)
+        if self._sink is not None and len(buf) >= self._FLUSH_SIZE:
+            self.flush()
+
+    def render(self, __object) -> None:
+        """Write a CodeObject, LazyString or plain text."""
+        if isinstance(__object, LazyString):
+            if __object._emitter is None:
+                self.line(str(__object))
+            else:
+                self.emit(__object._emitter)
+            return
+        emitter = getattr(__object, "_emit", None)
+        if emitter is None:
+            self.line(str(__object))
+        else:
+            self.emit(emitter)
+
+    @_profiled(
+        "render",
+        lambda self, emitter: (type(emitter.__self__).__name__, emitter.__name__),
+    )
+    def emit(self, __emitter) -> None:
+        """Run a bound emitter method, reusing or storing its object's cached output."""
+        node = __emitter.__self__
+        if not (self._memo and isinstance(node, _MEMOIZED_)):
+            __emitter(self)
+            return
+
+        key = (__emitter.__name__, len(self._prefixes) - 1, self._formatter)
+        cache = node._render_cache
+        text = _MISSING if cache is None else cache.get(key, _MISSING)
+        if text is not _MISSING:
+            # An empty fragment is still a (blank) line, joined to the others by a separator.
+            if text is not None:
+                self._fragment(text)
+            return
+        if self._sink is not None or self._open_scopes >= self._MEMO_LEVELS:
+            __emitter(self)
+            return
+
+        revision = node._revision
+        started = self._started
+        start = len(self._buf)
+        self._open_scopes += 1
+        try:
+            __emitter(self)
+        finally:
+            self._open_scopes -= 1
+        # Skip the separator that joins this fragment to whatever was written before it.
+        if len(self._buf) == start:
+            text = None
         else:
-            self._code_obj_tree = deque()
+            text = "".join(self._buf[start + 1 if started else start :])
+        # Publish a new cache rather than updating the shared one in place, and drop the result
+        # if the object was mutated while it was being rendered.
+        if node._revision == revision:
+            node._render_cache = {**(node._render_cache or {}), key: text}
+
+    def take(self) -> str:
+        """Return and clear everything written so far."""
+        text = "".join(self._buf)
+        self._buf.clear()
+        return text
+
+    def flush(self) -> None:
+        """Write the buffer to the sink."""
+        if self._buf:
+            self._sink(self.take())
+
+
+def _render(__emitter, __formatter: Formatter = default_formatter) -> str:
+    """Render a single bound emitter method to a string."""
+    renderer = _Renderer(__formatter)
+    renderer.emit(__emitter)
+    return renderer.take()
+
+
+def _render_object(__object, __formatter: Formatter = default_formatter) -> str | None:
+    """Render a single item of a Container's tree to a string, or None if it writes nothing."""
+    renderer = _Renderer(__formatter)
+    renderer.render(__object)
+    return renderer.take() if renderer._started else None
+
+
+def _render_batch(
+    __objects: list, __formatter: Formatter = default_formatter
+) -> str | None:
+    """Render a batch of items of a Container's tree, i.e. in a worker process."""
+    renderer = _Renderer(__formatter)
+    for object in __objects:
+        renderer.render(object)
+    return renderer.take() if renderer._started else None
+
+
+class _Segment(_MEMOIZED_):
+    """Frozen run of children, shared by every container whose tree includes it.
+
+    A segment is never modified once it is created. It is rendered, and its output cached, as a
+    single unit, so a run of children shared between many containers is only rendered once.
+    """
+
+    __slots__ = ("_items", "_length")
+
+    def __init__(self, __items: list) -> None:
+        self._items = __items
+        self._length = len(__items)
+        for item in __items:
+            node = item._obj if isinstance(item, LazyString) else item
+            if isinstance(node, _MEMOIZED_):
+                node._add_parent(self)
+
+    def _emit(self, __renderer: _Renderer) -> None:
+        for object in self._items:
+            __renderer.render(object)
+
+
+class _Concat(_MEMOIZED_):
+    """Immutable concatenation of two frozen trees of children."""
+
+    __slots__ = ("_left", "_right", "_length")
+
+    def __init__(self, __left: _Segment | _Concat, __right: _Segment | _Concat) -> None:
+        self._left = __left
+        self._right = __right
+        self._length = __left._length + __right._length
+        __left._add_parent(self)
+        __right._add_parent(self)
+
+
+def _join(__left: _Segment | _Concat | None, __right: _Segment | _Concat | None):
+    if __left is None:
+        return __right
+    if __right is None:
+        return __left
+    return _Concat(__left, __right)
+
+
+class _ChildList(object):
+    """Persistent, copy-on-write list of the children of a container.
+
+    Children are appended to a private tail. When the list is shared, i.e. a CodeWriter is
+    forked or added to another container, the tail is frozen into an immutable _Segment and
+    joined onto the frozen root. Every list holding the root can then keep appending to its own
+    tail without affecting the others, so sharing is O(1) and shared children are stored once.
+    """
+
+    __slots__ = ("_root", "_tail")
+
+    def __init__(self, __root: _Segment | _Concat | None = None) -> None:
+        self._root = __root
+        self._tail = []
+
+    def append(self, __object) -> None:
+        self._tail.append(__object)
+
+    def freeze(self) -> _Segment | _Concat | None:
+        """Freeze the tail onto the root, and return the root."""
+        if self._tail:
+            # The tail list is handed over to the segment rather than copied.
+            self._root = _join(self._root, _Segment(self._tail))
+            self._tail = []
+        return self._root
+
+    def concat(self, __other: _ChildList) -> _Segment | _Concat | None:
+        """Append every child of another list by sharing its root, and return the new root."""
+        root = __other.freeze()
+        if root is not None:
+            self._root = _join(self.freeze(), root)
+        return self._root
+
+    def clear(self) -> None:
+        self._root = None
+        self._tail = []
+
+    def segments(self) -> Iterator[_Segment]:
+        """Yield the frozen segments of the list in order."""
+        stack = [self._root] if self._root is not None else []
+        while stack:
+            node = stack.pop()
+            if type(node) is _Concat:
+                stack.append(node._right)
+                stack.append(node._left)
+            else:
+                yield node
+
+    def nodes(self) -> Iterator:
+        """Yield the units to render: each frozen segment, then each child in the tail."""
+        yield from self.segments()
+        yield from self._tail
+
+    def drain(self) -> Iterator:
+        """Empty the list, yielding its children in order.
+
+        Each child is released as soon as it has been yielded, and each segment as soon as it
+        has been reached, unless they are shared with another list.
+        """
+        stack = [self._root] if self._root is not None else []
+        tail = self._tail
+        self.clear()
+        # Children are popped off reversed copies, so that the generator never holds on to a
+        # child that has already been yielded.
+        tail.reverse()
+        while stack:
+            node = stack.pop()
+            if type(node) is _Concat:
+                stack.append(node._right)
+                stack.append(node._left)
+                del node
+                continue
+            items = node._items[::-1]
+            del node
+            while items:
+                yield items.pop()
+        while tail:
+            yield tail.pop()
+
+    def __iter__(self) -> Iterator:
+        for segment in self.segments():
+            yield from segment._items
+        yield from self._tail
+
+    def __getitem__(self, __index: int):
+        length = len(self)
+        index = __index + length if __index < 0 else __index
+        if not 0 <= index < length:
+            raise IndexError("child index out of range")
+        node = self._root
+        if node is None or index >= node._length:
+            return self._tail[index - (node._length if node is not None else 0)]
+        while type(node) is _Concat:
+            if index < node._left._length:
+                node = node._left
+            else:
+                index -= node._left._length
+                node = node._right
+        return node._items[index]
+
+    def __len__(self) -> int:
+        root = self._root
+        return len(self._tail) + (root._length if root is not None else 0)
+
+    def __bool__(self) -> bool:
+        return bool(self._tail) or self._root is not None
+
+
+class _CONTAINER_(_MEMOIZED_):
+    __slots__ = ("_formatter", "_code_obj_tree")
+
+    def __init__(self, __init=None, __formatter: Formatter = default_formatter):
+        self._formatter = __formatter
+        # The child list is only allocated once the first child is added.
+        self._code_obj_tree = ()
+        if __init is not None:
+            self.add(list(__init) if isinstance(__init, deque) else __init)
 
     def add(self, __other: str | _CODEOBJECT_ | list[_CODEOBJECT_] | _CONTAINER_):
         """Add a CodeObject to the Container's tree.
@@ -87,52 +499,125 @@ class _CONTAINER_(object):
                 return
 
             if isinstance(__other, _DECLARABLE_):
-                self._code_obj_tree.append(__other.get_declaration())
+                declaration = __other.get_declaration()
+                if not isinstance(declaration, LazyString):
+                    # Keep track of the declared object, i.e. for CodeWriter.tree_shake.
+                    declaration = LazyString(__other, __other.get_declaration)
+                self._append(declaration)
 
             if isinstance(__other, _DEFINABLE_):
-                self._code_obj_tree.append(__other.get_definition())
-            elif isinstance(__other, _CONTAINER_):
-                self._code_obj_tree.extend(__other._code_obj_tree)
+                self._append(__other.get_definition())
+            elif isinstance(__other, _CONTAINER_) and not isinstance(
+                __other, _CODEOBJECT_
+            ):
+                self._share(__other)
 
             if isinstance(__other, str):
-                self._code_obj_tree.append(CodeText(__other))
+                self._append(CodeText(__other))
             if (
                 isinstance(__other, CodeText)
                 or isinstance(__other, _CODEOBJECT_)
                 or isinstance(__other, LazyString)
             ):
-                self._code_obj_tree.append(__other)
+                self._append(__other)
+
+            self._mark_dirty()
 
         except TypeError as e:
             print(f"No Implementation for adding type '{type(__other)}' to CodeWriter.")
             raise
 
+    def _append(self, __object) -> None:
+        """Append an object to the tree and register this container as its parent."""
+        tree = self._code_obj_tree
+        if type(tree) is not _ChildList:
+            tree = self._code_obj_tree = _ChildList()
+        tree.append(__object)
+        node = __object._obj if isinstance(__object, LazyString) else __object
+        if isinstance(node, _MEMOIZED_):
+            node._add_parent(self)
+
+    def _share(self, __other: _CONTAINER_) -> None:
+        """Append every child of another container, sharing its tree rather than copying it."""
+        if not __other._code_obj_tree:
+            return
+        tree = self._code_obj_tree
+        if type(tree) is not _ChildList:
+            tree = self._code_obj_tree = _ChildList()
+        tree.concat(__other._code_obj_tree)._add_parent(self)
+
+    def _references(self) -> list:
+        """Objects and names the children of the container refer to, for CodeWriter.tree_shake."""
+        return [x._obj if isinstance(x, LazyString) else x for x in self._code_obj_tree]
+
+    def _nodes(self) -> Iterator:
+        """Units of the tree to render, see _ChildList.nodes."""
+        tree = self._code_obj_tree
+        return tree.nodes() if tree else iter(())
+
+    def _drain(self) -> Iterator:
+        """Empty the tree, yielding its children in order."""
+        tree = self._code_obj_tree
+        return tree.drain() if tree else iter(())
+
     def empty(self: _CONTAINER_):
         """Empty the container's tree.
         :return: True if the function executed successfully.
         :rtype: True
         """
-        self._code_obj_tree.clear()
+        if self._code_obj_tree:
+            self._code_obj_tree.clear()
+        self._mark_dirty()
         return True
 
+    def iter_chunks(self, drain: bool = False) -> Iterator[str]:
+        """Yield the code representation of the Container's tree one fragment at a time.
+
+        Fragments are produced lazily as the tree is walked, so the full output is never
+        materialized as a single string. Joining every yielded fragment is equivalent to
+        the Container's __str__.
+
+        Examples:
+            >>> import ecdypy as ec
+            >>> cwr = ec.CodeWriter()
+            >>> cwr.add(["Line 1", "Line 2"])
+            >>> for chunk in cwr.iter_chunks():
+            >>>     print(chunk, end="")
+            >>> # Line 1
+            >>> # Line 2
+
+        :param drain: Remove each CodeObject from the tree once it has been rendered, defaults to False
+        :type drain: bool, optional
+        :return: Iterator over the rendered fragments of the tree.
+        :rtype: Iterator[str]
+        """
+        if drain:
+            self._mark_dirty()
+        renderer = _Renderer(self._formatter, memo=not drain)
+        objects = self._drain() if drain else self._nodes()
+        for object in objects:
+            renderer.render(object)
+            if chunk := renderer.take():
+                yield chunk
+
+    def _emit(self, __renderer: _Renderer) -> None:
+        for object in self._nodes():
+            __renderer.render(object)
+
     def __str__(self):
         """Output the contents of the Container's tree.
         The generated string will be the code representation of all CodeObjects added to the Container.
         :return: String containing lines seperated with the formatting line seperator that is the code representation of all CodeObjects stored in the container.
         :rtype: str
         """
-        buf = []
-        for object in self._code_obj_tree:
-            if isinstance(object, LazyString):
-                if isinstance(object._obj, _CONTAINER_):
-                    object._obj._indent = self._indent + 1
-        buf = [f"{str(x)}" for x in self._code_obj_tree]
-        return self._formatter._separator.join(buf)
+        return _render(self._emit, self._formatter)
 
 
 class _CODEOBJECT_(ABC):
     """Base Class Interface for generated CodeObjects to ensure the CodeWriter can handle them correctly."""
 
+    __slots__ = ()
+
     def __init__(self, __priority: int = -1):
         self._priority = __priority
 
@@ -141,14 +626,49 @@ class _CODEOBJECT_(ABC):
         pass
 
 
-@dataclass
 class LazyString(_CODEOBJECT_):
-    _obj: _DECLARABLE_ | _DEFINABLE_
-    _method: function
+    """Deferred text of a declaration or definition, evaluated when it is converted to str."""
+
+    __slots__ = ("_obj", "_method", "_emitter")
 
+    def __init__(
+        self,
+        _obj: _DECLARABLE_ | _DEFINABLE_,
+        _method: function,
+        _emitter: function | None = None,
+    ) -> None:
+        self._obj = _obj
+        self._method = _method
+        self._emitter = _emitter
+
+    def __repr__(self) -> str:
+        return f"LazyString(_obj={self._obj!r}, _method={self._method!r}, _emitter={self._emitter!r})"
+
+    def __eq__(self, __other) -> bool:
+        if type(__other) is not LazyString:
+            return NotImplemented
+        return (self._obj, self._method, self._emitter) == (
+            __other._obj,
+            __other._method,
+            __other._emitter,
+        )
+
+    __hash__ = None
+
+    @_profiled("lazy")
     def __str__(self) -> str:
         return self._method()
 
+    def __reduce__(self):
+        # Bound methods are stored by name so that only the object itself is pickled.
+        emitter = self._emitter.__name__ if self._emitter is not None else None
+        return (_unpickle_lazy_string, (self._obj, self._method.__name__, emitter))
+
+
+def _unpickle_lazy_string(__obj, __method: str, __emitter: str | None) -> LazyString:
+    emitter = getattr(__obj, __emitter) if __emitter is not None else None
+    return LazyString(__obj, getattr(__obj, __method), emitter)
+
 
 # ==============================================================================================
 # ==============================================================================================
@@ -172,6 +692,10 @@ class CodeText(_CODEOBJECT_, _CONTAINER_):
         >>> # Line 2
     """
 
+    # The text buffer is the only child container of a CodeText.
+    __slots__ = ("_text", "_priority")
+
+    @_profiled("construct")
     def __init__(self, __text: str | list[str] | None = None):
         """CodeText Constructor
 
@@ -185,7 +709,7 @@ class CodeText(_CODEOBJECT_, _CONTAINER_):
 
         :param __text: str | list[str]. Text to add to the CodeWriter tree, defaults to None
         """
-        self._text = deque()
+        self._text = []
         if __text != None:
             self.add_text(__text)
         # super(_CODEOBJECT_, self).__init__(1)
@@ -226,34 +750,142 @@ class CodeText(_CODEOBJECT_, _CONTAINER_):
                 self._text.append("")
             else:
                 raise
+            self._mark_dirty()
         except Exception as e:
-            print(e)
-            print(f"Cannot add type '{type(__text)}' to a CodeText object.")
-            print(f"Type: '{type(__text)}' not defined for CodeText.")
-
-    def __add__(self, __other: str | list[str]) -> CodeText:
-        """Add text to the CodeText"""
-        return CodeText(self._text + __other)
+            report(
+                "invalid-value",
+                "CodeText",
+                f"Cannot add type '{type(__text)}' to a CodeText object.",
+                value=__text,
+            )
 
     def __str__(self, __formatter: Formatter = default_formatter) -> str:
         """Read from the CodeText buffer."""
-        buf = [str(x) for x in self._text]
-        return __formatter._separator.join(buf)
+        return _render(self._emit, __formatter)
+
+    def _emit(self, __renderer: _Renderer) -> None:
+        for line in self._text:
+            __renderer.line(str(line))
 
     def __add__(self, __other):
-        """Add text to the CodeText"""
-        self.add_text(__other)
-        return CodeText(self)
+        """Return a new CodeText holding the text of both operands."""
+        text = CodeText(self)
+        text.add_text(__other)
+        return text
 
     def __iadd__(self, __other):
-        """Append text to the CodeText"""
+        """Append text to the CodeText in place."""
         self.add_text(__other)
-        return CodeText(self)
+        return self
 
     def __len__(self):
         """Return the number of lines in the buffer."""
         return len(self._text)
 
+    def _references(self) -> list:
+        """Lines of the CodeText, which may name declarations, for CodeWriter.tree_shake."""
+        return self._text
+
+    @staticmethod
+    def builder() -> CodeTextBuilder:
+        """Create a builder for accumulating a large number of lines.
+
+        Examples:
+            >>> import ecdypy as ec
+            >>> builder = ec.CodeText.builder()
+            >>> builder.append("// Lookup table")
+            >>> builder.extend(f"const V_{i}: u32 = {i};" for i in range(100_000))
+            >>> text = builder.freeze()
+
+        :return: An empty CodeTextBuilder.
+        :rtype: CodeTextBuilder
+        """
+        return CodeTextBuilder()
+
+    def freeze(self) -> FrozenCodeText:
+        """Get an immutable copy of the CodeText, with its lines joined ahead of time.
+
+        :return: FrozenCodeText holding the current lines of the CodeText.
+        :rtype: FrozenCodeText
+        """
+        return FrozenCodeText(self._text)
+
+
+class CodeTextBuilder(object):
+    """Accumulates lines for a CodeText.
+
+    Lines are appended to a plain list, with none of the change tracking of a CodeText, so
+    building a block of n lines is O(n). The builder is finished with build(), or with freeze()
+    when the text will not change again.
+    """
+
+    __slots__ = ("_lines",)
+
+    def __init__(self) -> None:
+        self._lines = []
+
+    def append(self, __text: str = "") -> CodeTextBuilder:
+        """Append a single line."""
+        self._lines.append(str(__text))
+        return self
+
+    def extend(self, __lines: Iterable[str]) -> CodeTextBuilder:
+        """Append every line of an iterable, i.e. a list or a generator."""
+        self._lines.extend(map(str, __lines))
+        return self
+
+    def __iadd__(self, __text: str) -> CodeTextBuilder:
+        return self.append(__text)
+
+    def __len__(self) -> int:
+        return len(self._lines)
+
+    def build(self) -> CodeText:
+        """Move the accumulated lines into a new CodeText and reset the builder."""
+        text = CodeText()
+        text._text, self._lines = self._lines, []
+        return text
+
+    def freeze(self) -> FrozenCodeText:
+        """Join the accumulated lines into a FrozenCodeText and reset the builder."""
+        lines, self._lines = self._lines, []
+        return FrozenCodeText(lines)
+
+
+class FrozenCodeText(_CODEOBJECT_):
+    """Immutable block of text, joined into a single string ahead of time.
+
+    At the top level of a tree the joined string is written as a single fragment. Nested inside
+    a construct, it is indented line by line like a CodeText.
+    """
+
+    __slots__ = ("_text", "_count")
+
+    def __init__(self, __lines: Iterable[str] = ()) -> None:
+        lines = [str(x) for x in __lines]
+        self._text = "\n".join(lines)
+        # Lines may themselves span several lines, i.e. an instantiated Template.
+        self._count = self._text.count("\n") + 1 if lines else 0
+
+    def __str__(self, __formatter: Formatter = default_formatter) -> str:
+        return _render(self._emit, __formatter)
+
+    def _emit(self, __renderer: _Renderer) -> None:
+        if not self._count:
+            return
+        if __renderer.column() == 0 and __renderer._separator == "\n":
+            __renderer._fragment(self._text)
+        else:
+            __renderer.line(self._text)
+
+    def __len__(self) -> int:
+        """Return the number of lines in the text."""
+        return self._count
+
+    def _references(self) -> list:
+        """Text of the FrozenCodeText, which may name declarations, for CodeWriter.tree_shake."""
+        return [self._text]
+
 
 # ==============================================================================================
 # ==============================================================================================
@@ -274,10 +906,15 @@ class CodeWriter(_CONTAINER_):
         >>> text = text + "Line 2"
     """
 
+    __slots__ = ()
+
+    @_profiled("construct")
     def __init__(
         self, __init: deque | None = None, __formatter: Formatter = default_formatter
     ):
-        """_summary_
+        """CodeWriter Constructor
+
+        A CodeWriter built from another CodeWriter shares its tree, as with fork().
 
         Examples:
             >>> cwr_one = ec.CodeWriter("my_text")
@@ -288,14 +925,34 @@ class CodeWriter(_CONTAINER_):
             >>>                # text
             >>> assert str(cwr_two) == str(cwr_three)
 
-        :param __init: _description_, defaults to None
-        :type __init: deque | None, optional
-        :param __formatter: _description_, defaults to default_formatter
+        :param __init: Item(s) to add to the CodeWriter tree, defaults to None
+        :type __init: str | list | CodeWriter | CodeObject | None, optional
+        :param __formatter: Formatter used to render the tree, defaults to default_formatter
         :type __formatter: Formatter, optional
         """
-        self._formatter = __formatter
-        self._indent = 0
-        _CONTAINER_.__init__(self)
+        _CONTAINER_.__init__(self, __init, __formatter)
+
+    def fork(self) -> CodeWriter:
+        """Create a new CodeWriter starting with the same contents, in O(1).
+
+        The two CodeWriters share their existing tree, which is stored and rendered only once.
+        Items added to either CodeWriter afterwards are only added to that CodeWriter.
+
+        Examples:
+            >>> import ecdypy as ec
+            >>> prelude = ec.CodeWriter()
+            >>> prelude.add_auto_gen_comment("MIT")
+            >>> targets = {}
+            >>> for target in ("x86_64", "aarch64"):
+            >>>     targets[target] = prelude.fork()
+            >>>     targets[target].add(f'const TARGET: &str = "{target}";')
+
+        :return: The new CodeWriter.
+        :rtype: CodeWriter
+        """
+        writer = CodeWriter(None, self._formatter)
+        writer._share(self)
+        return writer
 
     def add_auto_gen_comment(
         self, __license: str | None = None, __author: str | list[str] | None = None
@@ -342,7 +999,226 @@ class CodeWriter(_CONTAINER_):
 
         self.add(text)
 
-    def __add__(self, __other: str | Iterable[_CODEOBJECT_] | CodeText):
+    def deduplicate(self, include_text: bool = False) -> int:
+        """Remove top-level items whose output exactly repeats an earlier item.
+
+        Each item is fingerprinted by its rendered form, which is looked up in a hash index, so
+        the pass is linear in the number of items. Rendering is memoized, so the items are not
+        rendered again when the CodeWriter is output. Only declarations and definitions are
+        deduplicated, unless include_text is set, since repeated plain text such as a separator
+        comment is usually intentional.
+
+        Examples:
+            >>> import ecdypy as ec
+            >>> point = ec.Struct({"x": "i32", "y": "i32"}, name="Point")
+            >>> cwr = ec.CodeWriter()
+            >>> cwr.add([point, "// lines", point])
+            >>> saved = cwr.deduplicate()
+            >>> print(len(cwr)) # 2
+
+        :param include_text: Also deduplicate CodeTexts and other plain text, defaults to False
+        :type include_text: bool, optional
+        :return: Number of bytes removed from the output.
+        :rtype: int
+        """
+        formatter = self._formatter
+        separator = len(formatter._separator.encode())
+        seen = set()
+        kept = []
+        saved = 0
+        for item in self._code_obj_tree:
+            if include_text or not isinstance(item, (CodeText, FrozenCodeText)):
+                text = _render_object(item, formatter)
+                # Empty output cannot be told apart from a blank line, so it is always kept.
+                if text:
+                    if text in seen:
+                        saved += len(text.encode()) + separator
+                        continue
+                    seen.add(text)
+            kept.append(item)
+        if saved:
+            tree = self._code_obj_tree = _ChildList()
+            tree._tail = kept
+            self._mark_dirty()
+        return saved
+
+    def tree_shake(self, __roots: Iterable) -> int:
+        """Remove top-level declarations that cannot be reached from the given roots.
+
+        Declarations are followed through the types of Function parameters and returns, Struct
+        fields, Tuple members and Variables, and through the bodies of Functions. Names in text,
+        i.e. a type given as "Vec<Point>" or a line of a Function body, are resolved through an
+        index of the top-level declarations by name. Each object is visited once, so the pass is
+        linear in the size of the tree.
+
+        Plain text at the top level is always kept, and is treated as a root.
+
+        Examples:
+            >>> import ecdypy as ec
+            >>> point = ec.Struct({"x": "i32", "y": "i32"}, name="Point")
+            >>> unused = ec.Struct({"a": "u8"}, name="Unused")
+            >>> origin = ec.Function("origin", returns=point)
+            >>> origin.add("Point { x: 0, y: 0 }")
+            >>> cwr = ec.CodeWriter()
+            >>> cwr.add([point, unused, origin])
+            >>> print(cwr.tree_shake([origin])) # 1
+
+        :param __roots: Objects or names of the declarations to keep, along with everything they refer to.
+        :type __roots: Iterable
+        :return: Number of top-level items removed.
+        :rtype: int
+        """
+        items = list(self._code_obj_tree)
+        by_name = {}
+        stack = list(__roots)
+        for item in items:
+            if isinstance(item, LazyString):
+                name = getattr(item._obj, "_name", None)
+                if isinstance(name, str):
+                    by_name.setdefault(name, []).append(item._obj)
+            else:
+                stack.append(item)
+
+        reached = set()
+        while stack:
+            node = stack.pop()
+            if isinstance(node, LazyString):
+                node = node._obj
+            if isinstance(node, str):
+                for token in _NAME_TOKEN_PATTERN.findall(node):
+                    stack.extend(by_name.get(token, ()))
+                continue
+            references = getattr(node, "_references", None)
+            if references is None or id(node) in reached:
+                continue
+            reached.add(id(node))
+            stack.extend(references())
+
+        kept = [
+            x for x in items if not isinstance(x, LazyString) or id(x._obj) in reached
+        ]
+        removed = len(items) - len(kept)
+        if removed:
+            tree = self._code_obj_tree = _ChildList()
+            tree._tail = kept
+            self._mark_dirty()
+        return removed
+
+    def write_to(self, __sink: IO[str], drain: bool = False) -> int:
+        """Write the CodeWriter's output to a file-like sink, fragment by fragment.
+
+        The output is streamed straight into the sink rather than being built as one string.
+        When draining, CodeObjects are dropped from the tree as soon as they are written,
+        keeping memory usage bounded regardless of the size of the output.
+
+        Examples:
+            >>> import ecdypy as ec
+            >>> cwr = ec.CodeWriter()
+            >>> cwr.add(["Line 1", "Line 2"])
+            >>> with open("main.rs", "w") as fp:
+            >>>     cwr.write_to(fp, drain=True)
+            >>> print(len(cwr)) # 0
+
+        :param __sink: Object with a write(str) method, e.g. an open text file or pipe.
+        :type __sink: IO[str]
+        :param drain: Remove each CodeObject from the tree once it has been written, defaults to False
+        :type drain: bool, optional
+        :return: Number of characters written to the sink.
+        :rtype: int
+        """
+        write = __sink.write
+        count = 0
+
+        def sink(__chunk: str) -> None:
+            nonlocal count
+            write(__chunk)
+            count += len(__chunk)
+
+        if drain:
+            self._mark_dirty()
+        renderer = _Renderer(self._formatter, sink, memo=not drain)
+        objects = self._drain() if drain else self._nodes()
+        for object in objects:
+            renderer.render(object)
+        renderer.flush()
+        return count
+
+    def render_threaded(self, __workers: int | None = None) -> str:
+        """Render the CodeWriter's top-level items concurrently on a thread pool.
+
+        Items are rendered independently and stitched back together in order, so the result is
+        equal to the CodeWriter's __str__. Since rendering does not mutate the tree, items that
+        share sub-trees can safely be rendered at the same time.
+
+        Examples:
+            >>> import ecdypy as ec
+            >>> cwr = ec.CodeWriter()
+            >>> cwr.add([ec.Function(f"func_{i}").get_definition() for i in range(1000)])
+            >>> assert cwr.render_threaded(8) == str(cwr)
+
+        :param __workers: Maximum number of threads, defaults to the ThreadPoolExecutor default.
+        :type __workers: int | None, optional
+        :return: String containing the code representation of all CodeObjects in the CodeWriter.
+        :rtype: str
+        """
+        # Imported here rather than at the top of the module, as it is slow to import.
+        from concurrent.futures import ThreadPoolExecutor
+
+        formatter = self._formatter
+        with ThreadPoolExecutor(__workers) as executor:
+            fragments = executor.map(
+                lambda x: _render_object(x, formatter), tuple(self._code_obj_tree)
+            )
+            # Blank lines are kept, only items that wrote nothing at all are skipped.
+            return formatter._separator.join([x for x in fragments if x is not None])
+
+    def render_parallel(
+        self, __workers: int | None = None, chunksize: int | None = None
+    ) -> str:
+        """Render the CodeWriter's top-level items on a pool of worker processes.
+
+        Items are sent to the workers in batches to keep inter-process overhead low, and the
+        rendered batches are stitched back together in order, so the result is equal to the
+        CodeWriter's __str__. Every item in the tree must be picklable.
+
+        Examples:
+            >>> import ecdypy as ec
+            >>> cwr = ec.CodeWriter()
+            >>> cwr.add([ec.Function(f"func_{i}").get_definition() for i in range(10000)])
+            >>> assert cwr.render_parallel(4) == str(cwr)
+
+        :param __workers: Maximum number of processes, defaults to the number of CPUs.
+        :type __workers: int | None, optional
+        :param chunksize: Number of items per batch, defaults to a few batches per worker.
+        :type chunksize: int | None, optional
+        :return: String containing the code representation of all CodeObjects in the CodeWriter.
+        :rtype: str
+        """
+        from concurrent.futures import ProcessPoolExecutor
+
+        formatter = self._formatter
+        items = list(self._code_obj_tree)
+        workers = __workers or os.cpu_count() or 1
+        if chunksize is None:
+            chunksize = max(1, -(-len(items) // (workers * 4)))
+        batches = [items[i : i + chunksize] for i in range(0, len(items), chunksize)]
+        with ProcessPoolExecutor(workers) as executor:
+            fragments = executor.map(
+                _render_batch, batches, itertools.repeat(formatter, len(batches))
+            )
+            return formatter._separator.join([x for x in fragments if x is not None])
+
+    def __add__(self, __other: str | Iterable[_CODEOBJECT_] | CodeText | CodeWriter):
+        """Add item(s) to the CodeWriter, and return it.
+
+        The CodeWriter is modified in place. To combine writers without modifying either, add to a
+        fork: ``cwr.fork() + other``.
+        """
+        self.add(__other)
+        return self
+
+    def __iadd__(self, __other: str | Iterable[_CODEOBJECT_] | CodeText | CodeWriter):
+        """Add item(s) to the CodeWriter in place."""
         self.add(__other)
         return self
 
@@ -350,5 +1226,159 @@ class CodeWriter(_CONTAINER_):
         return len(self._code_obj_tree)
 
 
+# ==============================================================================================
+# ==============================================================================================
+
+
+class Profiler(object):
+    """Opt-in profiler recording spans of construction, validation and rendering.
+
+    While a Profiler is enabled, the registered methods of every construct are wrapped so that
+    each call records a span: construction (__init__), validation (value_from), LazyString
+    evaluation and rendering (each emitter run by the renderer). When no Profiler is enabled
+    the methods are the plain, unwrapped functions, so there is no overhead at all.
+
+    Spans can be exported as Chrome trace-event JSON, which can be opened in Perfetto or
+    chrome://tracing, or aggregated into a table of call counts and cumulative time per class.
+    Cumulative times are inclusive of nested spans.
+
+    Examples:
+        >>> import ecdypy as ec
+        >>> with ec.Profiler() as profiler:
+        >>>     cwr = ec.CodeWriter()
+        >>>     cwr.add(ec.Variable("my_var_1", ec.RTypes.i32, 10))
+        >>>     str(cwr)
+        >>> profiler.export_chrome_trace("trace.json")
+        >>> print(profiler.table())
+        >>> # category     class                        calls    total (ms)
+        >>> # construct    Variable                         1         0.041
+        >>> # ...
+    """
+
+    _active = None
+
+    def __init__(self) -> None:
+        self._events = []
+        self._originals = []
+        self._origin = 0
+
+    def enable(self) -> None:
+        """Start recording spans. Only one Profiler can be enabled at a time."""
+        if Profiler._active is not None:
+            raise RuntimeError("Another Profiler is already enabled.")
+        # Import the construct modules, so that all of their methods are registered.
+        from . import macros, rconstructs, rtypes
+        import time
+
+        Profiler._active = self
+        self._origin = time.perf_counter_ns()
+        for owner, name, category, namer in _PROFILED_METHODS:
+            original = owner.__dict__[name]
+            self._originals.append((owner, name, original))
+            setattr(owner, name, self._instrument(original, name, category, namer))
+
+    def disable(self) -> None:
+        """Stop recording spans and restore the original methods."""
+        for owner, name, original in reversed(self._originals):
+            setattr(owner, name, original)
+        self._originals.clear()
+        if Profiler._active is self:
+            Profiler._active = None
+
+    def _instrument(self, __func, __name: str, __category: str, __namer):
+        from threading import get_ident
+        import time
+
+        events = self._events
+        clock = time.perf_counter_ns
+
+        @functools.wraps(__func)
+        def wrapper(*args, **kwargs):
+            start = clock()
+            try:
+                return __func(*args, **kwargs)
+            finally:
+                end = clock()
+                cls, method = (
+                    __namer(*args) if __namer else (type(args[0]).__name__, __name)
+                )
+                events.append(
+                    (__category, cls, method, start, end - start, get_ident())
+                )
+
+        return wrapper
+
+    def clear(self) -> None:
+        """Discard every recorded span."""
+        self._events.clear()
+
+    def aggregate(self) -> dict[tuple[str, str], tuple[int, float]]:
+        """Aggregate the recorded spans per category and class.
+
+        :return: Dictionary of (category, class) to (call count, cumulative time in seconds).
+        :rtype: dict[tuple[str, str], tuple[int, float]]
+        """
+        totals = {}
+        for category, cls, _, _, duration, _ in self._events:
+            count, total = totals.get((category, cls), (0, 0))
+            totals[(category, cls)] = (count + 1, total + duration)
+        return {x: (y[0], y[1] / 1e9) for x, y in totals.items()}
+
+    def table(self) -> str:
+        """Format the aggregate as a table, sorted by cumulative time.
+
+        :return: The table as str.
+        :rtype: str
+        """
+        rows = sorted(self.aggregate().items(), key=lambda x: -x[1][1])
+        lines = [f"{'category':<12} {'class':<24} {'calls':>9} {'total (ms)':>13}"]
+        for (category, cls), (count, total) in rows:
+            lines.append(f"{category:<12} {cls:<24} {count:>9} {total * 1e3:>13.3f}")
+        return "\n".join(lines)
+
+    def get_chrome_trace(self) -> dict:
+        """Get the recorded spans as Chrome trace-event JSON data.
+
+        :return: Trace data, with one complete ('X') event per span.
+        :rtype: dict
+        """
+        origin = self._origin
+        pid = os.getpid()
+        return {
+            "traceEvents": [
+                {
+                    "name": f"{cls}.{method}",
+                    "cat": category,
+                    "ph": "X",
+                    "ts": (start - origin) / 1e3,
+                    "dur": duration / 1e3,
+                    "pid": pid,
+                    "tid": tid,
+                    "args": {"class": cls},
+                }
+                for category, cls, method, start, duration, tid in self._events
+            ],
+            "displayTimeUnit": "ms",
+        }
+
+    def export_chrome_trace(self, __path: str) -> None:
+        """Write the recorded spans to a Chrome trace-event JSON file.
+
+        :param __path: Path of the trace file.
+        :type __path: str
+        """
+        import json
+
+        with open(__path, "w") as fp:
+            json.dump(self.get_chrome_trace(), fp)
+
+    def __enter__(self) -> Profiler:
+        self.enable()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.disable()
+
+
 if __name__ == "__main__":
     print(__name__)
@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+import os
+
+from ._files import atomic_open, get_file_mode
+from .codewriter import CodeWriter
+from .diagnostics import report
+from .rtypes import InvalidName, _IDENTIFIER_PATTERN
+
+
+# ==============================================================================================
+# ==============================================================================================
+
+
+class Module(object):
+    """Class for creating a Rust module that is emitted as its own source file.
+
+    Each Module owns a CodeWriter holding the module's code, a set of paths brought into scope
+    with `use`, and any number of child Modules. The `mod` declarations of child Modules and the
+    `use` list are generated automatically when the Module is written.
+
+    Examples:
+        >>> import ecdypy as ec
+        >>> crate = ec.Crate()
+        >>> models = crate.add_module("models")
+        >>> models.use("std::fmt", "std::collections::HashMap", "std::fmt")
+        >>> models.add(ec.Struct({"A": "u8"}, name="Model"))
+        >>> print(models.get_text())
+        >>> # use std::collections::HashMap;
+        >>> # use std::fmt;
+        >>> #
+        >>> # struct Model {
+        >>> #     A: u8
+        >>> # }
+    """
+
+    def __init__(
+        self,
+        __name: str,
+        __writer: CodeWriter | None = None,
+        public: bool = True,
+    ) -> None:
+        """Ecdypy Module Constructor
+
+        :param __name: In-code name of the module. I.e. mod my_module
+        :type __name: str
+        :param __writer: CodeWriter holding the module's code, defaults to an empty CodeWriter.
+        :type __writer: CodeWriter | None, optional
+        :param public: Declare the module with `pub mod`, defaults to True
+        :type public: bool, optional
+        """
+        try:
+            if _IDENTIFIER_PATTERN.search(__name) is None:
+                raise InvalidName(__name)
+
+            self._name = __name
+            self._writer = __writer if __writer is not None else CodeWriter()
+            self._public = public
+            self._uses = set()
+            self._modules = dict()
+
+        except InvalidName as e:
+            report(
+                "invalid-name",
+                "Module",
+                f"Invalid module name: '{e.args[0]}' provided in module creation. "
+                "https://rust-lang.github.io/api-guidelines/naming.html",
+                value=e.args[0],
+            )
+
+    def add(self, __other) -> None:
+        """Add a CodeObject to the Module's CodeWriter. See CodeWriter.add."""
+        self._writer.add(__other)
+
+    def add_module(self, __module: str | Module, public: bool = True) -> Module:
+        """Add a child Module, which is declared with `mod` in this Module's file.
+
+        :param __module: Name of a new Module, or an existing Module.
+        :type __module: str | Module
+        :param public: Declare a new module with `pub mod`, defaults to True
+        :type public: bool, optional
+        :return: The child Module.
+        :rtype: Module
+        """
+        module = (
+            __module if isinstance(__module, Module) else Module(__module, None, public)
+        )
+        self._modules[module._name] = module
+        return module
+
+    def use(self, *args: str) -> None:
+        """Bring paths into scope in the Module. Duplicate paths are only written once.
+
+        Examples:
+            >>> import ecdypy as ec
+            >>> module = ec.Module("models")
+            >>> module.use("std::fmt", "crate::types::Model")
+        """
+        self._uses.update(str(x) for x in args)
+
+    def get_name(self) -> str:
+        """Returns the name of the Module.
+
+        :return: Name of Module object as str.
+        :rtype: str
+        """
+        return self._name
+
+    def get_writer(self) -> CodeWriter:
+        """Returns the CodeWriter holding the Module's code.
+
+        :return: The Module's CodeWriter.
+        :rtype: CodeWriter
+        """
+        return self._writer
+
+    def _get_header(self) -> list[str]:
+        """Generate the sorted `use` list and `mod` declarations of the Module."""
+        buf = [f"use {x};" for x in sorted(self._uses)]
+        if buf and self._modules:
+            buf.append("")
+        for name in sorted(self._modules):
+            visibility = "pub " if self._modules[name]._public else ""
+            buf.append(f"{visibility}mod {name};")
+        return buf
+
+    def get_text(self) -> str:
+        """Get the full source text of the Module's file.
+
+        :return: The `use` list, `mod` declarations and code of the Module.
+        :rtype: str
+        """
+        header = self._get_header()
+        body = str(self._writer)
+        if not header:
+            return body
+        return "\n".join(header) + ("\n\n" + body if body else "")
+
+    def _write(self, __path: str) -> None:
+        """Atomically write the Module's file by writing to a temporary file and renaming it."""
+        with atomic_open(__path, suffix=".rs") as fp:
+            header = self._get_header()
+            if header:
+                fp.write("\n".join(header))
+                if len(self._writer) > 0:
+                    fp.write("\n\n")
+            self._writer.write_to(fp)
+            fp.write("\n")
+
+
+class Crate(Module):
+    """Class for emitting a multi-file Rust crate from a tree of Modules.
+
+    The Crate is the root Module of the tree and is written to `src/lib.rs` (or `src/main.rs`).
+    Child Modules are written to `src/<mod>.rs`, and their own children to
+    `src/<mod>/<child>.rs`. Files are written concurrently from a thread pool.
+
+    Examples:
+        >>> import ecdypy as ec
+        >>> crate = ec.Crate()
+        >>> models = crate.add_module("models")
+        >>> models.add(ec.Struct({"A": "u8"}, name="Model"))
+        >>> crate.write("my_crate", workers=8)
+        >>> # my_crate/src/lib.rs    -> pub mod models;
+        >>> # my_crate/src/models.rs -> struct Model { A: u8 }
+    """
+
+    def __init__(
+        self,
+        __writer: CodeWriter | None = None,
+        binary: bool = False,
+    ) -> None:
+        """Ecdypy Crate Constructor
+
+        :param __writer: CodeWriter holding the crate root's code, defaults to an empty CodeWriter.
+        :type __writer: CodeWriter | None, optional
+        :param binary: Write the crate root to main.rs rather than lib.rs, defaults to False
+        :type binary: bool, optional
+        """
+        super().__init__("main" if binary else "lib", __writer)
+
+    def get_files(self) -> dict[str, Module]:
+        """Map the relative path of every file in the crate to the Module written to it.
+
+        :return: Dictionary of relative file paths to Modules.
+        :rtype: dict[str, Module]
+        """
+        files = {os.path.join("src", f"{self._name}.rs"): self}
+        stack = [(module, "src") for module in self._modules.values()]
+        while stack:
+            module, directory = stack.pop()
+            files[os.path.join(directory, f"{module._name}.rs")] = module
+            child_directory = os.path.join(directory, module._name)
+            stack.extend((x, child_directory) for x in module._modules.values())
+        return files
+
+    def write(self, __path: str, workers: int | None = None) -> list[str]:
+        """Write every Module of the crate to its file under the given crate directory.
+
+        Files are written concurrently, and each file is written to a temporary file first and
+        then renamed into place, so readers never observe a partially written file.
+
+        :param __path: Root directory of the crate (the directory containing `src`).
+        :type __path: str
+        :param workers: Maximum number of writer threads, defaults to the ThreadPoolExecutor default.
+        :type workers: int | None, optional
+        :return: List of the paths of every written file.
+        :rtype: list[str]
+        """
+        files = {os.path.join(__path, x): y for x, y in self.get_files().items()}
+        for directory in {os.path.dirname(x) for x in files}:
+            os.makedirs(directory, exist_ok=True)
+
+        # Where the umask cannot be read from /proc it is read by replacing it, which must be done
+        # before any writer threads are started.
+        get_file_mode()
+        with ThreadPoolExecutor(workers) as executor:
+            futures = [executor.submit(y._write, x) for x, y in files.items()]
+            for future in futures:
+                future.result()
+        return list(files)
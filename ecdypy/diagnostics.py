@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator, NamedTuple
+
+
+PRINT = "print"
+STRICT = "strict"
+COLLECT = "collect"
+SILENT = "silent"
+
+_MODES = (PRINT, STRICT, COLLECT, SILENT)
+
+
+class Diagnostic(NamedTuple):
+    """Record of a single invalid input.
+
+    :param code: Short kebab-case identifier of the kind of error, i.e. 'invalid-name'.
+    :param construct: Name of the type or construct reporting the error, i.e. 'u8' or 'Variable'.
+    :param message: Human readable description of the error.
+    :param field: Name of the field or argument at fault, if any.
+    :param value: The offending value, if any.
+    :param stack: Formatted stack at the point of the report, only captured when requested.
+    """
+
+    code: str
+    construct: str
+    message: str
+    field: str | None = None
+    value: Any = None
+    stack: str | None = None
+
+    def __str__(self) -> str:
+        field = f".{self.field}" if self.field is not None else ""
+        return f"[{self.code}] {self.construct}{field}: {self.message}"
+
+
+class DiagnosticError(Exception):
+    """Raised for every reported Diagnostic when the collector is in strict mode."""
+
+    def __init__(self, __diagnostic: Diagnostic) -> None:
+        super().__init__(str(__diagnostic))
+        self.diagnostic = __diagnostic
+
+
+class Collector(object):
+    """Receives the Diagnostics reported while generating code.
+
+    Modes:
+        print: Print each Diagnostic as it is reported. The default.
+
+        strict: Raise a DiagnosticError for each Diagnostic.
+
+        collect: Store each Diagnostic, to be reported in one batch with summary().
+
+        silent: Discard every Diagnostic.
+
+    Stacks are not captured unless capture_stack is set, since walking the stack for each of
+    thousands of bad inputs dominates the cost of bulk generation.
+
+    Examples:
+        >>> import ecdypy as ec
+        >>> with ec.diagnostics.collect() as collector:
+        >>>     ec.Variable("my var", ec.RTypes.u8, 1)
+        >>>     ec.RTypes.bool.value.value_from("maybe")
+        >>> print(collector.summary())
+        >>> # 2 diagnostics (invalid-name: 1, invalid-value: 1)
+        >>> # [invalid-name] Variable: Invalid 'name' argument provided in variable assignment.
+        >>> # [invalid-value] bool: Cannot assign value: maybe to type bool.
+    """
+
+    def __init__(self, mode: str = PRINT, capture_stack: bool = False) -> None:
+        """Ecdypy Collector Constructor
+
+        :param mode: One of 'print', 'strict', 'collect' or 'silent', defaults to 'print'
+        :type mode: str, optional
+        :param capture_stack: Capture the stack of each report, defaults to False
+        :type capture_stack: bool, optional
+        """
+        if mode not in _MODES:
+            raise ValueError(f"Unknown diagnostics mode: '{mode}' (one of {_MODES}).")
+        self.mode = mode
+        self.capture_stack = capture_stack
+        self._diagnostics = []
+
+    def report(
+        self,
+        __code: str,
+        __construct: str,
+        __message: str,
+        field: str | None = None,
+        value: Any = None,
+    ) -> None:
+        """Record a Diagnostic according to the collector's mode."""
+        mode = self.mode
+        if mode == SILENT:
+            return
+        stack = None
+        if self.capture_stack:
+            # Only imported when stacks are captured, since it is slow to import.
+            import traceback
+
+            stack = "".join(traceback.format_stack()[:-2])
+        diagnostic = Diagnostic(
+            __code, str(__construct), __message, field, value, stack
+        )
+        if mode == COLLECT:
+            self._diagnostics.append(diagnostic)
+        elif mode == STRICT:
+            raise DiagnosticError(diagnostic)
+        else:
+            if stack is not None:
+                print(stack, end="")
+            print(diagnostic)
+
+    @property
+    def diagnostics(self) -> list[Diagnostic]:
+        """List of the Diagnostics collected so far."""
+        return list(self._diagnostics)
+
+    def clear(self) -> None:
+        """Discard every collected Diagnostic."""
+        self._diagnostics.clear()
+
+    def summary(self) -> str:
+        """Report every collected Diagnostic in one batch, headed by a count of each code.
+
+        :return: The batch report as str.
+        :rtype: str
+        """
+        diagnostics = self._diagnostics
+        counts = Counter(x.code for x in diagnostics)
+        plural = "" if len(diagnostics) == 1 else "s"
+        head = f"{len(diagnostics)} diagnostic{plural}"
+        if counts:
+            head += " (" + ", ".join(f"{x}: {y}" for x, y in counts.items()) + ")"
+        return "\n".join([head] + [str(x) for x in diagnostics])
+
+    def __len__(self) -> int:
+        return len(self._diagnostics)
+
+
+_collector: ContextVar[Collector] = ContextVar(
+    "ecdypy_diagnostics", default=Collector()
+)
+
+
+def get_collector() -> Collector:
+    """Returns the Collector of the current context."""
+    return _collector.get()
+
+
+def set_collector(__collector: Collector) -> None:
+    """Replace the Collector of the current context."""
+    _collector.set(__collector)
+
+
+@contextmanager
+def collect(mode: str = COLLECT, capture_stack: bool = False) -> Iterator[Collector]:
+    """Install a new Collector for the duration of a with block.
+
+    The Collector is held in a context variable, so threads and asyncio tasks running
+    concurrently each report to their own Collector.
+
+    Examples:
+        >>> import ecdypy as ec
+        >>> with ec.diagnostics.collect("strict"):
+        >>>     ec.RTypes.u8.value.value_from("abc") # Raises DiagnosticError
+
+    :param mode: Mode of the Collector, defaults to 'collect'
+    :type mode: str, optional
+    :param capture_stack: Capture the stack of each report, defaults to False
+    :type capture_stack: bool, optional
+    :return: The installed Collector.
+    """
+    token = _collector.set(Collector(mode, capture_stack))
+    try:
+        yield _collector.get()
+    finally:
+        _collector.reset(token)
+
+
+def report(
+    __code: str,
+    __construct: str,
+    __message: str,
+    field: str | None = None,
+    value: Any = None,
+) -> None:
+    """Report a Diagnostic to the Collector of the current context. See Collector.report."""
+    _collector.get().report(__code, __construct, __message, field, value)
@@ -3,6 +3,8 @@ from __future__ import annotations
 """ Abstract Base Class """
 from abc import ABC, abstractmethod
 
+from .codewriter import _profiled
+
 
 class Macro:
     """Helper Class for creating generic Macro definitions.
@@ -15,6 +17,9 @@ class Macro:
         >>> # let my_var_2: i16 = 127;
     """
 
+    __slots__ = ("_text",)
+
+    @_profiled("construct")
     def __init__(self, __text) -> None:
         self._text = str(__text)
 
@@ -50,6 +55,9 @@ class Derive:
         >>> # let my_var_1: i32 = -5;
     """
 
+    __slots__ = ("_args",)
+
+    @_profiled("construct")
     def __init__(self, *args) -> None:
         arg_vals = list(args)
         arg_vals = [str(x) for x in arg_vals]
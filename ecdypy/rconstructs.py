@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-import traceback
+from typing import Iterable
 
 from collections import deque
 
@@ -14,19 +14,37 @@ from .codewriter import (
     _DECLARABLE_,
     _DEFINABLE_,
     _CONTAINER_,
+    _MEMOIZED_,
     LazyString,
+    _Renderer,
+    _render,
+    _profiled,
 )
+from .diagnostics import report
+from .template import Placeholder
 from .rtypes import (
     _TYPE_,
+    _NUMBER_,
+    _FLOAT_,
     RTypes,
     Tuple,
     Struct,
     IncorrectArgCount,
     InvalidName,
+    UnknownTypeArgument,
+    UnknownArgKeys,
+    AttributesNotSatisfied,
     _normalize_arg_type,
+    _as_list,
+    _get_numpy,
+    _IDENTIFIER_PATTERN,
+    _as_sequence,
 )
 
 
+_VARIABLE_NAME_PATTERN = re.compile(r"^([a-zA-Z\-\_]{1}[a-zA-Z\-\_0-9]*)$")
+
+
 class InvalidMacroArg(Exception):
     pass
 
@@ -43,11 +61,15 @@ class ArmAlreadyExists(Exception):
     pass
 
 
+class InvalidArrayValues(Exception):
+    pass
+
+
 # ==============================================================================================
 # ==============================================================================================
 
 
-class Variable(_DECLARABLE_):
+class Variable(_DECLARABLE_, _MEMOIZED_):
     """Class for creating Rust Variables.
 
     Variables can be declared/initialized as well as be used as any 'value' argument.
@@ -61,6 +83,9 @@ class Variable(_DECLARABLE_):
 
     """
 
+    __slots__ = ("_name", "_type", "_value", "_macros")
+
+    @_profiled("construct")
     def __init__(self, *args, **kwargs) -> None:
         """Ecdypy Variable Constructor
 
@@ -120,19 +145,25 @@ class Variable(_DECLARABLE_):
             self._macros = arg_vals.get("macros")
 
         except IncorrectArgCount as e:
-            traceback.print_stack()
-            print(
-                f"\nRequired Args Missing: {e.args[0]} ('name' and 'type' required).\n"
+            report(
+                "arg-count",
+                "Variable",
+                f"Required Args Missing: {e.args[0]} ('name' and 'type' required).",
             )
         except InvalidName as e:
-            traceback.print_stack()
-            print(
-                r"""\nInvalid 'name' argument provided in variable assignment.\n
-                  https://rust-lang.github.io/api-guidelines/naming.html\n"""
+            report(
+                "invalid-name",
+                "Variable",
+                "Invalid 'name' argument provided in variable assignment. "
+                "https://rust-lang.github.io/api-guidelines/naming.html",
             )
         except InvalidMacroArg as e:
-            traceback.print_stack()
-            print(f"\nInvalid Macro Argument given. (in {e.args[0]})")
+            report(
+                "invalid-macro",
+                "Variable",
+                f"Invalid Macro Argument given. (in {e.args[0]})",
+                value=e.args[0],
+            )
 
     @staticmethod
     def _parse_args(__args_list, __kwargs_list):
@@ -148,11 +179,7 @@ class Variable(_DECLARABLE_):
             arg_dict[i] = a
 
         if (n := arg_dict["name"]) != None:
-            arg_dict["name"] = (
-                n
-                if re.search(r"^([a-zA-Z\-\_]{1}[a-zA-Z\-\_0-9]*)$", n) != None
-                else -1
-            )
+            arg_dict["name"] = n if _VARIABLE_NAME_PATTERN.search(n) != None else -1
         if (t := arg_dict["type"]) != None:
             t = _normalize_arg_type(t)
 
@@ -167,8 +194,9 @@ class Variable(_DECLARABLE_):
 
     @staticmethod
     def _match_value(__type, __value):
-        if isinstance(__value, Variable):
+        if isinstance(__value, (Variable, Placeholder)):
             # Change this should we want to do internal type checking?
+            # Placeholders are filtered when their Template is instantiated.
             return __value
 
         if isinstance(__type, _TYPE_):
@@ -193,19 +221,22 @@ class Variable(_DECLARABLE_):
         :return: LazyString which can be evaluated to retrieve the variable's declaration.
         :rtype: LazyString
         """
-        return LazyString(self, getattr(self, "_get_declaration"))
+        return LazyString(self, self._get_declaration, self._emit_declaration)
 
     def _get_declaration(self, __formatter: Formatter = default_formatter) -> str:
-        buf = ""
+        return _render(self._emit_declaration, __formatter)
+
+    def _emit_declaration(self, __renderer: _Renderer) -> None:
         if self._macros != None:
-            buf = buf + "\n".join(self._macros) + "\n"
+            for macro in self._macros:
+                __renderer.line(macro)
 
         typ = self._type.value if isinstance(self._type, RTypes) else self._type
 
         # This code feels awful
         val = self._value
         val_fmt = ""
-        if isinstance(self._type, Struct):
+        if isinstance(self._type, Struct) or isinstance(val, Placeholder):
             val_fmt = val
         elif self._type == RTypes.char:
             val_fmt = f"'{val}'"
@@ -214,11 +245,8 @@ class Variable(_DECLARABLE_):
         else:
             val_fmt = str(val)
 
-        buf = (
-            buf
-            + f"let {str(self._name)}: {str(typ)} = {val_fmt}{';' if val_fmt[-1] != ';' else ''}"
-        )
-        return buf
+        terminator = ";" if val_fmt[-1] != ";" else ""
+        __renderer.line(f"let {str(self._name)}: {str(typ)} = {val_fmt}{terminator}")
 
     def get_name(self) -> str:
         """Returns the set name of the variable as a string. This is equivalent to casting the variable as a string.
@@ -236,6 +264,10 @@ class Variable(_DECLARABLE_):
         """
         return self._name
 
+    def _references(self) -> list:
+        """Objects and names the Variable refers to, for CodeWriter.tree_shake."""
+        return [self._type, self._value]
+
     def get_type(self) -> _TYPE_:
         """Returns the object instance used as the variable's type.
 
@@ -271,6 +303,797 @@ class Variable(_DECLARABLE_):
 # ==============================================================================================
 
 
+def _escape(__text: str) -> str:
+    """Escape text for use inside a Rust char or string literal."""
+    return (
+        __text.replace("\\", "\\\\")
+        .replace("'", "\\'")
+        .replace('"', '\\"')
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+        .replace("\t", "\\t")
+        .replace("\0", "\\0")
+    )
+
+
+def _literal_formatter(__type, __radix: int = 10, __suffix: bool = False):
+    """Return a callable that formats a single, already filtered, value of a type as a literal."""
+    if isinstance(__type, Tuple):
+        formatters = [
+            _literal_formatter(x, __radix, __suffix) for x in __type._type_tree
+        ]
+        trailing = "," if len(formatters) == 1 else ""
+        return (
+            lambda x: "("
+            + ", ".join([f(y) for f, y in zip(formatters, x)])
+            + trailing
+            + ")"
+        )
+    if isinstance(__type, str):
+        __type = RTypes[__type]
+    suffix = str(__type.value) if __suffix else ""
+    if __type == RTypes.char:
+        return lambda x: f"'{_escape(x)}'"
+    if __type == RTypes.str:
+        return lambda x: f'"{_escape(x)}"'
+    if __type == RTypes.bool:
+        return str
+    if isinstance(__type.value, _FLOAT_):
+        nan = f"{__type.value}::NAN"
+        return lambda x: nan if x != x else f"{float(x)!r}{suffix}"
+    if isinstance(__type.value, _NUMBER_):
+        return (("{:#x}" if __radix == 16 else "{}") + suffix).format
+    raise UnknownTypeArgument(__type)
+
+
+def _static_type_name(__type) -> str:
+    """Return the Rust type of a value stored in a static, where a str is borrowed as &'static str."""
+    if isinstance(__type, Tuple):
+        return f"({', '.join(_static_type_name(x) for x in __type._type_tree)})"
+    if isinstance(__type, str):
+        __type = RTypes[__type]
+    if __type == RTypes.str:
+        return "&'static str"
+    return str(__type.value if isinstance(__type, RTypes) else __type)
+
+
+class StaticArray(_DECLARABLE_):
+    """Class for creating Rust static arrays from large arrays of values.
+
+    Values can be given as a NumPy array, an array.array, any other object supporting the buffer
+    protocol, or (nested) lists. Multi-dimensional arrays are emitted as nested fixed-size arrays.
+    The literal is filtered and formatted in large vectorized chunks and written straight to the
+    renderer, so tables with millions of elements can be streamed with CodeWriter.write_to.
+    Integer elements are clamped to the range of their type. The whole array is filtered when it
+    is created, and an array holding values that cannot be assigned to its type (i.e. 2.5 or NaN
+    for a u8) is reported and not created.
+
+    Examples:
+        >>> import ecdypy as ec
+        >>> import numpy as np
+        >>> table = ec.StaticArray("TABLE", ec.RTypes.u16, np.arange(4))
+        >>> print(table.get_declaration())
+        >>> # static TABLE: [u16; 4] = [
+        >>> #     0, 1, 2, 3,
+        >>> # ];
+        >>> \n
+        >>> grid = ec.ConstArray("GRID", ec.RTypes.u8, np.eye(2), radix=16, suffix=True)
+        >>> print(grid.get_declaration())
+        >>> # const GRID: [[u8; 2]; 2] = [
+        >>> #     [0x1u8, 0x0u8],
+        >>> #     [0x0u8, 0x1u8],
+        >>> # ];
+    """
+
+    _keyword = "static"
+    _CHUNK_SIZE = 1 << 16
+
+    @_profiled("construct")
+    def __init__(
+        self,
+        __name: str,
+        __type: RTypes | Tuple | str,
+        __values,
+        shape: tuple[int, ...] | None = None,
+        radix: int = 10,
+        suffix: bool = False,
+        width: int = 100,
+        public: bool = False,
+        macros=None,
+        validated: bool = False,
+    ) -> None:
+        """Ecdypy StaticArray Constructor
+
+        :param __name: In-code name of the array. I.e. static MY_TABLE
+        :type __name: str
+        :param __type: Element type of the array, either a numeric, bool, char or str RTypes, or a Tuple.
+        :type __type: RTypes | Tuple | str
+        :param __values: Elements of the array. Tuple elements are given as sequences, or as the last axis of a NumPy array.
+        :param shape: Dimensions of the array, defaults to the shape of the values.
+        :type shape: tuple[int, ...] | None, optional
+        :param radix: Write integer literals in decimal (10) or hexadecimal (16), defaults to 10
+        :type radix: int, optional
+        :param suffix: Write numeric literals with a type suffix, i.e. 1u16, defaults to False
+        :type suffix: bool, optional
+        :param width: Maximum width of the emitted lines, defaults to 100
+        :type width: int, optional
+        :param public: Declare the array with `pub`, defaults to False
+        :type public: bool, optional
+        :param macros: Macros to assign to the array.
+        :type macros: Macro | list[Macro] | None, optional
+        :param validated: The values were already filtered through the element type, so they are not filtered again, defaults to False
+        :type validated: bool, optional
+        """
+        try:
+            if _IDENTIFIER_PATTERN.search(__name) is None:
+                raise InvalidName(__name)
+            typ = __type if isinstance(__type, Tuple) else _normalize_arg_type(__type)
+            if not isinstance(typ, (Tuple, RTypes)):
+                raise UnknownTypeArgument(__type)
+            if radix not in (10, 16):
+                raise ValueError(radix)
+
+            values, value_shape = StaticArray._flatten_values(typ, __values)
+            shape = tuple(shape) if shape is not None else value_shape
+            count = 1
+            for dimension in shape:
+                count *= dimension
+            if not shape or count != len(values):
+                raise IncorrectArgCount(shape, len(values))
+            vectorized = isinstance(typ, RTypes) and isinstance(typ.value, _NUMBER_)
+            if vectorized and not validated:
+                filtered, _, invalid = typ.value._filter_many(values)
+                if invalid is not None:
+                    invalid = zip(_as_list(values), _as_list(invalid))
+                    raise InvalidArrayValues([x for x, y in invalid if y])
+                values = filtered
+
+            self._name = __name
+            self._type = typ
+            self._values = values
+            self._shape = shape
+            self._radix = radix
+            self._suffix = suffix
+            self._width = width
+            self._public = public
+            self._macros = (
+                None
+                if macros is None
+                else [str(macros)]
+                if not isinstance(macros, list)
+                else [str(x) for x in macros]
+            )
+            self._vectorized = vectorized
+            self._validate = (
+                (lambda x, t=typ: t._verify_vals(x, True))
+                if isinstance(typ, Tuple)
+                else typ.value._compile_validator()
+            )
+            self._literal = _literal_formatter(typ, radix, suffix)
+
+        except InvalidName as e:
+            report(
+                "invalid-name",
+                type(self).__name__,
+                f"Invalid array name: '{e.args[0]}' provided in array creation. "
+                "https://rust-lang.github.io/api-guidelines/naming.html",
+                value=e.args[0],
+            )
+        except UnknownTypeArgument as e:
+            report(
+                "unknown-type",
+                type(self).__name__,
+                f"Unsupported array element type: '{e.args[0]}'.",
+                value=e.args[0],
+            )
+        except IncorrectArgCount as e:
+            report(
+                "arg-count",
+                type(self).__name__,
+                f"Array shape {e.args[0]} does not match the number of values ({e.args[1]}).",
+                value=e.args[0],
+            )
+        except InvalidArrayValues as e:
+            report(
+                "invalid-value",
+                type(self).__name__,
+                f"{len(e.args[0])} values cannot be assigned to type {typ.value}, "
+                f"i.e. {e.args[0][0]}.",
+                value=e.args[0],
+            )
+        except ValueError as e:
+            report(
+                "invalid-value",
+                type(self).__name__,
+                f"Unsupported radix: {e.args[0]} (10 or 16 required).",
+                field="radix",
+                value=e.args[0],
+            )
+
+    @staticmethod
+    def _flatten_values(__type, __values) -> tuple:
+        """Flatten the values into a one-dimensional sequence and find the shape they were given in."""
+        np = _get_numpy()
+        if isinstance(__type, Tuple):
+            if np is not None and isinstance(__values, np.ndarray):
+                width = __values.shape[-1]
+                return __values.reshape(-1, width).tolist(), __values.shape[:-1]
+            values = list(__values)
+            return values, (len(values),)
+        if np is not None:
+            values = np.asarray(__values)
+            return values.reshape(-1), values.shape
+
+        values = _as_sequence(__values)
+        shape = [len(values)]
+        first = values
+        while len(first) and isinstance(first[0], (list, tuple)):
+            first = first[0]
+            shape.append(len(first))
+        if len(shape) > 1:
+            values = Tuple._flatten_args(values)
+        return values, tuple(shape)
+
+    def get_declaration(self, __formatter: Formatter = default_formatter) -> LazyString:
+        """Get the string representation of the array declaration.
+
+        :return: LazyString which can be evaluated to retrieve the array's declaration.
+        :rtype: LazyString
+        """
+        return LazyString(self, self._get_declaration, self._emit_declaration)
+
+    def _get_declaration(self, __formatter: Formatter = default_formatter) -> str:
+        return _render(self._emit_declaration, __formatter)
+
+    def get_type(self) -> str:
+        """Returns the Rust type of the array, i.e. [[u8; 4]; 2].
+
+        :return: Type of the array as str.
+        :rtype: str
+        """
+        typ = _static_type_name(self._type)
+        for dimension in reversed(self._shape):
+            typ = f"[{typ}; {dimension}]"
+        return typ
+
+    def get_name(self) -> str:
+        """Returns the set name of the array as a string.
+
+        :return: Name given to the array.
+        :rtype: str
+        """
+        return self._name
+
+    def _references(self) -> list:
+        """Objects and names the array refers to, for CodeWriter.tree_shake."""
+        return [self._type]
+
+    def _format(self, __values) -> list[str]:
+        """Format a chunk of values as a list of literals."""
+        if not self._vectorized:
+            values = __values.tolist() if hasattr(__values, "tolist") else __values
+            return list(map(self._literal, map(self._validate, values)))
+
+        # The values were filtered when the array was created, and are only converted to
+        # Python numbers to write them as literals.
+        return list(map(self._literal, _as_list(__values)))
+
+    def _emit_declaration(self, __renderer: _Renderer) -> None:
+        if self._macros != None:
+            for macro in self._macros:
+                __renderer.line(macro)
+
+        visibility = "pub " if self._public else ""
+        head = f"{visibility}{self._keyword} {self._name}: {self.get_type()} ="
+        if len(self._values) == 0:
+            __renderer.line(f"{head} [];")
+            return
+        __renderer.line(f"{head} [")
+        __renderer.indent()
+        self._emit_block(__renderer, self._values, self._shape)
+        __renderer.dedent()
+        __renderer.line("];")
+
+    def _emit_block(self, __renderer: _Renderer, __values, __shape: tuple) -> None:
+        if len(__shape) == 1:
+            self._emit_row(__renderer, __values)
+            return
+
+        step = len(__values) // __shape[0]
+        inline = len(__shape) == 2 and 2 * step <= self._width
+        for i in range(__shape[0]):
+            block = __values[i * step : (i + 1) * step]
+            if inline:
+                # Short rows are kept on a single line when they fit.
+                text = f"[{', '.join(self._format(block))}],"
+                if __renderer.column() + len(text) <= self._width:
+                    __renderer.line(text)
+                    continue
+            __renderer.line("[")
+            __renderer.indent()
+            self._emit_block(__renderer, block, __shape[1:])
+            __renderer.dedent()
+            __renderer.line("],")
+
+    def _emit_row(self, __renderer: _Renderer, __values) -> None:
+        """Write a row of values, wrapped to fill the line width.
+
+        The row is formatted one chunk at a time, and items left over at the end of a chunk are
+        carried into the next one, so that only the last line of the row is ever short.
+        """
+        available = self._width - __renderer.column() + 1
+        chunk_size = self._CHUNK_SIZE
+        pending = []
+        for start in range(0, len(__values), chunk_size):
+            items = pending + self._format(__values[start : start + chunk_size])
+            # A line of n items takes n * (width + 2) - 1 columns, including the trailing comma.
+            per_line = max(1, available // (max(map(len, items)) + 2))
+            end = len(items) - len(items) % per_line
+            for i in range(0, end, per_line):
+                __renderer.line(", ".join(items[i : i + per_line]) + ",")
+            pending = items[end:]
+        if pending:
+            __renderer.line(", ".join(pending) + ",")
+
+    def __str__(self) -> str:
+        return self.get_name()
+
+
+class ConstArray(StaticArray):
+    """Class for creating Rust const arrays. See StaticArray.
+
+    Examples:
+        >>> import ecdypy as ec
+        >>> table = ec.ConstArray("SQUARES", ec.RTypes.u8, [0, 1, 4, 9])
+        >>> print(table.get_declaration())
+        >>> # const SQUARES: [u8; 4] = [
+        >>> #     0, 1, 4, 9,
+        >>> # ];
+    """
+
+    _keyword = "const"
+
+
+class StructOfArrays(_DECLARABLE_):
+    """Class for emitting columnar data as a struct-of-arrays.
+
+    Each field of the Struct is emitted as its own static array, followed by an accessor struct
+    holding a slice of every column, a static instance of it, and methods for reading rows back
+    as the Struct. Columns are taken from a NumPy structured array or a dictionary of columns,
+    and each numeric column is range-checked against its field's type in a single vectorized pass.
+
+    Ecdypy does not automatically declare Structs, so the Struct itself must still be declared.
+
+    Examples:
+        >>> import ecdypy as ec
+        >>> import numpy as np
+        >>> model = ec.Struct({"a": "u8", "b": "u16"}, name="Model")
+        >>> records = np.array([(1, 10), (2, 20)], dtype=[("a", "u1"), ("b", "u2")])
+        >>> columns = ec.StructOfArrays(model, records)
+        >>> print(columns.get_declaration())
+        >>> # pub static MODEL_A: [u8; 2] = [
+        >>> #     1, 2,
+        >>> # ];
+        >>> # pub static MODEL_B: [u16; 2] = [
+        >>> #     10, 20,
+        >>> # ];
+        >>> #
+        >>> # pub struct ModelColumns {
+        >>> #     pub a: &'static [u8],
+        >>> #     pub b: &'static [u16],
+        >>> # }
+        >>> # ...
+    """
+
+    @_profiled("construct")
+    def __init__(
+        self,
+        __struct: Struct,
+        __source,
+        name: str | None = None,
+        prefix: str | None = None,
+        public: bool = True,
+        **kwargs,
+    ) -> None:
+        """Ecdypy StructOfArrays Constructor
+
+        :param __struct: Struct describing the fields of each record.
+        :type __struct: Struct
+        :param __source: NumPy structured array, or dictionary of field names to columns.
+        :param name: Name of the accessor struct, defaults to the Struct's name followed by 'Columns'.
+        :type name: str | None, optional
+        :param prefix: Prefix of the column and accessor statics, defaults to the Struct's name in upper case.
+        :type prefix: str | None, optional
+        :param public: Declare every item with `pub`, defaults to True
+        :type public: bool, optional
+        :param \\*\\*kwargs: Formatting options passed on to each StaticArray, i.e. radix, suffix and width.
+        """
+        try:
+            self._struct = __struct
+            self._name = name if name is not None else f"{__struct.get_name()}Columns"
+            self._prefix = prefix if prefix is not None else __struct.get_name().upper()
+            self._public = public
+            if _IDENTIFIER_PATTERN.search(self._name) is None:
+                raise InvalidName(self._name)
+
+            columns = []
+            length = None
+            for field, (_, field_type) in __struct._fields.items():
+                if isinstance(field_type, Struct):
+                    raise UnknownTypeArgument(field_type)
+                column = __source[field]
+                if length is None:
+                    length = len(column)
+                elif len(column) != length:
+                    raise IncorrectArgCount(field, len(column), length)
+                column = StructOfArrays._check_column(field, field_type, column)
+                columns.append(
+                    (
+                        field,
+                        field_type,
+                        StaticArray(
+                            f"{self._prefix}_{field.upper()}",
+                            field_type,
+                            column,
+                            public=public,
+                            validated=True,
+                            **kwargs,
+                        ),
+                    )
+                )
+            self._columns = columns
+            self._length = length or 0
+
+        except InvalidName as e:
+            report(
+                "invalid-name",
+                "StructOfArrays",
+                f"Invalid accessor name: '{e.args[0]}' provided in struct-of-arrays creation. "
+                "https://rust-lang.github.io/api-guidelines/naming.html",
+                value=e.args[0],
+            )
+        except UnknownTypeArgument as e:
+            report(
+                "unknown-type",
+                "StructOfArrays",
+                f"Unsupported column type: '{e.args[0]}'.",
+                value=e.args[0],
+            )
+        except IncorrectArgCount as e:
+            report(
+                "arg-count",
+                "StructOfArrays",
+                f"Column '{e.args[0]}' has {e.args[1]} values ({e.args[2]} required).",
+                field=e.args[0],
+            )
+        except InvalidArrayValues as e:
+            report(
+                "invalid-value",
+                "StructOfArrays",
+                f"Column '{e.args[0]}' has {len(e.args[1])} values that cannot be assigned "
+                f"to its type, i.e. {e.args[1][0]}.",
+                field=e.args[0],
+                value=e.args[1],
+            )
+
+    @staticmethod
+    def _check_column(__field: str, __type, __column):
+        """Range-check a numeric column in one pass, reporting and clamping out-of-range values.
+
+        The filtered column is passed on to its StaticArray as validated, so it is only checked once.
+        """
+        if not (isinstance(__type, RTypes) and isinstance(__type.value, _NUMBER_)):
+            return __column
+        clamped, mask, invalid = __type.value._filter_many(__column)
+        if invalid is not None:
+            invalid = zip(_as_list(__column), _as_list(invalid))
+            raise InvalidArrayValues(__field, [x for x, y in invalid if y])
+        count = int(sum(mask))
+        if count > 0:
+            report(
+                "value-out-of-range",
+                "StructOfArrays",
+                f"{count} values out of range for type {__type.value}; clamped.",
+                field=__field,
+                value=count,
+            )
+        return clamped
+
+    def get_declaration(self, __formatter: Formatter = default_formatter) -> LazyString:
+        """Get the string representation of the column arrays and accessor struct.
+
+        :return: LazyString which can be evaluated to retrieve the declarations.
+        :rtype: LazyString
+        """
+        return LazyString(self, self._get_declaration, self._emit_declaration)
+
+    def _get_declaration(self, __formatter: Formatter = default_formatter) -> str:
+        return _render(self._emit_declaration, __formatter)
+
+    def get_columns(self) -> list[StaticArray]:
+        """Returns the StaticArray emitted for each field, in field order.
+
+        :return: List of column arrays.
+        :rtype: list[StaticArray]
+        """
+        return [x[2] for x in self._columns]
+
+    def get_name(self) -> str:
+        """Returns the name of the accessor struct.
+
+        :return: Name of the accessor struct as str.
+        :rtype: str
+        """
+        return self._name
+
+    def _references(self) -> list:
+        """Objects and names the columns refer to, for CodeWriter.tree_shake."""
+        return [self._struct]
+
+    def _emit_declaration(self, __renderer: _Renderer) -> None:
+        visibility = "pub " if self._public else ""
+        for _, _, column in self._columns:
+            __renderer.render(column.get_declaration())
+
+        __renderer.line()
+        __renderer.line(f"{visibility}struct {self._name} {{")
+        __renderer.indent()
+        for field, field_type, _ in self._columns:
+            typ = _static_type_name(field_type)
+            __renderer.line(f"{visibility}{field}: &'static [{typ}],")
+        __renderer.dedent()
+        __renderer.line("}")
+
+        __renderer.line()
+        __renderer.line(
+            f"{visibility}static {self._prefix}: {self._name} = {self._name} {{"
+        )
+        __renderer.indent()
+        for field, _, column in self._columns:
+            __renderer.line(f"{field}: &{column.get_name()},")
+        __renderer.dedent()
+        __renderer.line("};")
+
+        __renderer.line()
+        __renderer.line(f"impl {self._name} {{")
+        __renderer.indent()
+        __renderer.line(f"{visibility}fn len(&self) -> usize {{")
+        __renderer.indent()
+        __renderer.line(str(self._length))
+        __renderer.dedent()
+        __renderer.line("}")
+        __renderer.line()
+        __renderer.line(
+            f"{visibility}fn get(&self, index: usize) -> {self._struct.get_name()} {{"
+        )
+        __renderer.indent()
+        __renderer.line(f"{self._struct.get_name()} {{")
+        __renderer.indent()
+        for field, _, _ in self._columns:
+            __renderer.line(f"{field}: self.{field}[index],")
+        __renderer.dedent()
+        __renderer.line("}")
+        __renderer.dedent()
+        __renderer.line("}")
+        __renderer.dedent()
+        __renderer.line("}")
+
+    def __str__(self) -> str:
+        return self.get_name()
+
+
+class StaticTable(_DECLARABLE_):
+    """Class for streaming a static array of Struct literals from an iterable of rows.
+
+    Rows are consumed lazily while the table is rendered. Each row is validated through the
+    Struct's field types and written straight to the renderer, so when the table is streamed
+    with CodeWriter.write_to its memory usage stays constant regardless of the number of rows.
+    Rows are dictionaries of field names to values, or sequences of values in field order.
+    Invalid rows are reported, and left out of the table.
+
+    The length of the array is taken from the length argument. Otherwise, a re-iterable source
+    (i.e. a list, or any object whose __iter__ returns a fresh iterator) is filtered and
+    formatted in a pre-pass that counts its valid rows, and a one-shot iterator (i.e. a generator
+    or database cursor) is emitted as a slice, `&[Struct]`, which does not need its length up
+    front. Give the length to stream a re-iterable source. A one-shot iterator can only be
+    rendered once.
+
+    Examples:
+        >>> import csv
+        >>> import ecdypy as ec
+        >>> model = ec.Struct({"id": "u32", "name": "str"}, name="Model")
+        >>> with open("models.csv") as fp, open("models.rs", "w") as out:
+        >>>     cwr = ec.CodeWriter()
+        >>>     cwr.add(ec.StaticTable("MODELS", model, csv.DictReader(fp)))
+        >>>     cwr.write_to(out, drain=True)
+        >>> # static MODELS: &[Model] = &[
+        >>> #     Model { id: 1, name: "first" },
+        >>> #     ...
+        >>> # ];
+    """
+
+    @_profiled("construct")
+    def __init__(
+        self,
+        __name: str,
+        __struct: Struct,
+        __rows,
+        length: int | None = None,
+        public: bool = False,
+        macros=None,
+    ) -> None:
+        """Ecdypy StaticTable Constructor
+
+        :param __name: In-code name of the table. I.e. static MY_TABLE
+        :type __name: str
+        :param __struct: Struct of each row.
+        :type __struct: Struct
+        :param __rows: Iterable of rows, each a dict of field names to values or a sequence of values in field order.
+        :param length: Number of rows, defaults to counting a re-iterable source or emitting a slice.
+        :type length: int | None, optional
+        :param public: Declare the table with `pub`, defaults to False
+        :type public: bool, optional
+        :param macros: Macros to assign to the table.
+        :type macros: Macro | list[Macro] | None, optional
+        """
+        try:
+            if _IDENTIFIER_PATTERN.search(__name) is None:
+                raise InvalidName(__name)
+            for _, field_type in __struct._fields.values():
+                if isinstance(field_type, Struct):
+                    raise UnknownTypeArgument(field_type)
+
+            self._name = __name
+            self._struct = __struct
+            self._rows = __rows
+            self._length = length
+            self._public = public
+            self._macros = (
+                None
+                if macros is None
+                else [str(macros)]
+                if not isinstance(macros, list)
+                else [str(x) for x in macros]
+            )
+            self._literals = {
+                name: _literal_formatter(field_type)
+                for name, (_, field_type) in __struct._fields.items()
+            }
+
+        except InvalidName as e:
+            report(
+                "invalid-name",
+                "StaticTable",
+                f"Invalid table name: '{e.args[0]}' provided in table creation. "
+                "https://rust-lang.github.io/api-guidelines/naming.html",
+                value=e.args[0],
+            )
+        except UnknownTypeArgument as e:
+            report(
+                "unknown-type",
+                "StaticTable",
+                f"Unsupported table field type: '{e.args[0]}'.",
+                value=e.args[0],
+            )
+
+    def get_declaration(self, __formatter: Formatter = default_formatter) -> LazyString:
+        """Get the string representation of the table declaration.
+
+        :return: LazyString which can be evaluated to retrieve the table's declaration.
+        :rtype: LazyString
+        """
+        return LazyString(self, self._get_declaration, self._emit_declaration)
+
+    def _get_declaration(self, __formatter: Formatter = default_formatter) -> str:
+        return _render(self._emit_declaration, __formatter)
+
+    def get_name(self) -> str:
+        """Returns the set name of the table as a string.
+
+        :return: Name given to the table.
+        :rtype: str
+        """
+        return self._name
+
+    def _references(self) -> list:
+        """Objects and names the table refers to, for CodeWriter.tree_shake."""
+        return [self._struct]
+
+    def _get_lines(self) -> tuple[int | None, Iterable[str]]:
+        """Get the number of rows, and an iterable of the formatted valid rows.
+
+        A re-iterable source without a length is filtered and formatted in a pre-pass, so that its
+        valid rows can be counted, and the formatted rows are kept until they are written rather
+        than filtered a second time. Other sources are filtered lazily, row by row.
+        """
+        rows = map(self._verify_row, self._rows)
+        lines = (self._format_row(x) for x in rows if x is not None)
+        if self._length is None and iter(self._rows) is not self._rows:
+            lines = list(lines)
+            return len(lines), lines
+        return self._length, lines
+
+    def _verify_row(self, __row) -> list | None:
+        """Filter a row through the Struct's field types.
+
+        :return: The (field, value) pairs of the row, or None if the row is invalid.
+        :rtype: list | None
+        """
+        struct = self._struct
+        try:
+            pairs = (
+                list(__row.items())
+                if isinstance(__row, dict)
+                else list(zip(struct._fields, __row))
+            )
+            out, missing = struct._verify_vals(pairs)
+            if missing:
+                raise AttributesNotSatisfied(missing, __row)
+            if len(out) < len(pairs) or len(pairs) < len(__row):
+                raise UnknownArgKeys(__row)
+        except AttributesNotSatisfied as e:
+            report(
+                "missing-fields",
+                "StaticTable",
+                f"Row {e.args[1]} of table '{self._name}' is missing fields: {e.args[0]}.",
+                value=e.args[1],
+            )
+            return None
+        except UnknownArgKeys as e:
+            report(
+                "unknown-keys",
+                "StaticTable",
+                f"Row {e.args[0]} of table '{self._name}' has unknown fields.",
+                value=e.args[0],
+            )
+            return None
+        # Invalid values have already been reported by their type.
+        if any(y is None for _, y in out):
+            return None
+        return out
+
+    def _format_row(self, __pairs: list) -> str:
+        literals = self._literals
+        fields = ", ".join([f"{x}: {literals[x](y)}" for x, y in __pairs])
+        return f"{self._struct.get_name()} {{ {fields} }},"
+
+    def _emit_declaration(self, __renderer: _Renderer) -> None:
+        if self._macros != None:
+            for macro in self._macros:
+                __renderer.line(macro)
+
+        visibility = "pub " if self._public else ""
+        struct_name = self._struct.get_name()
+        length, lines = self._get_lines()
+        if length is None:
+            __renderer.line(f"{visibility}static {self._name}: &[{struct_name}] = &[")
+        else:
+            __renderer.line(
+                f"{visibility}static {self._name}: [{struct_name}; {length}] = ["
+            )
+        __renderer.indent()
+        count = 0
+        for line in lines:
+            __renderer.line(line)
+            count += 1
+        __renderer.dedent()
+        __renderer.line("];")
+        if length is not None and count != length:
+            report(
+                "arg-count",
+                "StaticTable",
+                f"Table '{self._name}' has {count} valid rows ({length} declared).",
+                value=count,
+            )
+
+    def __str__(self) -> str:
+        return self.get_name()
+
+
+# ==============================================================================================
+# ==============================================================================================
+
+
 class Function(_CONTAINER_, _DECLARABLE_, _DEFINABLE_):
     """Class for creating Rust Function.
 
@@ -291,6 +1114,9 @@ class Function(_CONTAINER_, _DECLARABLE_, _DEFINABLE_):
         >>> # }
     """
 
+    __slots__ = ("_name", "_parameters", "_returns")
+
+    @_profiled("construct")
     def __init__(self, *args, **kwargs) -> None:
         """Ecdypy Function Constructor
 
@@ -335,15 +1161,18 @@ class Function(_CONTAINER_, _DECLARABLE_, _DEFINABLE_):
             super().__init__()
 
         except InvalidName as e:
-            traceback.print_stack()
-            print(
-                f"""\nInvalid 'name' argument provided in function creation.\n
-                  https://rust-lang.github.io/api-guidelines/naming.html\n"""
+            report(
+                "invalid-name",
+                "Function",
+                "Invalid 'name' argument provided in function creation. "
+                "https://rust-lang.github.io/api-guidelines/naming.html",
             )
         except InvalidParameterArgument as e:
-            traceback.print_stack()
-            print(
-                f"""\nInvalid argument provided in function parameters: {e.args[0]}"""
+            report(
+                "invalid-parameter",
+                "Function",
+                f"Invalid argument provided in function parameters: {e.args[0]}",
+                value=e.args[0],
             )
 
     @staticmethod
@@ -361,11 +1190,7 @@ class Function(_CONTAINER_, _DECLARABLE_, _DEFINABLE_):
             arg_dict[i] = a
 
         if (n := arg_dict["name"]) != None:
-            arg_dict["name"] = (
-                n
-                if re.search(r"^([a-zA-Z\-\_]{1}[a-zA-Z\-\_0-9]*)$", n) != None
-                else -1
-            )
+            arg_dict["name"] = n if _VARIABLE_NAME_PATTERN.search(n) != None else -1
 
         if (p := arg_dict["parameters"]) != None:
             p = [p] if not isinstance(p, list) else p
@@ -407,7 +1232,7 @@ class Function(_CONTAINER_, _DECLARABLE_, _DEFINABLE_):
         :return: LazyString which can be evaluated to retrieve the variable's definition.
         :rtype: LazyString
         """
-        return LazyString(self, getattr(self, "_get_definition"))
+        return LazyString(self, self._get_definition, self._emit_definition)
 
     def get_declaration(self, __formatter: Formatter = default_formatter) -> LazyString:
         """Get the string representation of the variable declaration.
@@ -422,48 +1247,47 @@ class Function(_CONTAINER_, _DECLARABLE_, _DEFINABLE_):
         :return: LazyString which can be evaluated to retrieve the variable's declaration.
         :rtype: LazyString
         """
-        return LazyString(self, getattr(self, "_get_declaration"))
+        return LazyString(self, self._get_declaration, self._emit_declaration)
 
     def _get_definition(self, __formatter: Formatter = default_formatter):
-        """THIS LOOKS SO GOOD, GOOD JOB ME FOR SURE!"""
-        indent_spaces = " " * __formatter._indent_spaces * self._indent
-        # Start with name of function, parameters and return type.
-        # Add open curly bracket to start function closure
-        buf = [self._get_declaration().strip(";") + f" {{"]
-
-        # Iterate over lines in the closure.
-        for line in self._code_obj_tree:
-            # If line is a container we should tell it to increase its indent amount.
-            if isinstance(line, LazyString):
-                if isinstance(line._obj, _CONTAINER_):
-                    line._obj._indent = self._indent + 1
-            # Add the line to the buffer
-            buf.append(f"{indent_spaces}{str(line)}")
-
-        # Close open curly bracket
-        # Have one less indent as it looks nicer :)
-        buf.append(f"{' '*__formatter._indent_spaces*(self._indent-1)}}}")
-        return "\n".join(buf)
+        return _render(self._emit_definition, __formatter)
 
     def _get_declaration(self, __formatter: Formatter = default_formatter):
-        """THIS LOOKS SO GOOD, GOOD JOB ME FOR SURE!"""
-        buf = f"fn {self._name}("
+        return _render(self._emit_declaration, __formatter)
+
+    def _emit_definition(self, __renderer: _Renderer) -> None:
+        # Open the function closure, then write each line of the closure one level deeper.
+        __renderer.line(f"{self._signature()} {{")
+        __renderer.indent()
+        for line in self._nodes():
+            __renderer.render(line)
+        __renderer.dedent()
+        __renderer.line("}")
+
+    def _emit_declaration(self, __renderer: _Renderer) -> None:
+        __renderer.line(f"{self._signature()};")
+
+    def _references(self) -> list:
+        """Objects and names the Function refers to, for CodeWriter.tree_shake."""
+        refs = [typ for _, typ in self._parameters or ()]
+        refs.append(self._returns)
+        refs.extend(_CONTAINER_._references(self))
+        return refs
+
+    def _signature(self) -> str:
+        """Name of function, parameters and return type."""
+        params = ""
         if self._parameters != None:
-            for param in self._parameters:
-                typ = param[1].value if isinstance(param[1], RTypes) else param[1]
-                buf += f"{str(param[0])}: {str(typ)}, "
-            buf = buf.strip(", ")
-        buf += f")"
-
-        if self._returns != None:
-            typ = (
-                self._returns.value
-                if isinstance(self._returns, RTypes)
-                else self._returns
+            params = ", ".join(
+                f"{str(name)}: {str(typ.value if isinstance(typ, RTypes) else typ)}"
+                for name, typ in self._parameters
             )
-            buf += f" -> {typ}"
-        buf += f";"
-        return buf
+        if self._returns == None:
+            return f"fn {self._name}({params})"
+        typ = (
+            self._returns.value if isinstance(self._returns, RTypes) else self._returns
+        )
+        return f"fn {self._name}({params}) -> {typ}"
 
     def __str__(self):
         return self._name
@@ -476,6 +1300,9 @@ class Function(_CONTAINER_, _DECLARABLE_, _DEFINABLE_):
 class Arm(_CONTAINER_):
     """Helper class for creating Arms of a MatchStatement"""
 
+    __slots__ = ("_condition_value",)
+
+    @_profiled("construct")
     def __init__(
         self,
         __condition_value: str | int = "_",
@@ -488,20 +1315,37 @@ class Arm(_CONTAINER_):
     def get_condition_value(self):
         return self._condition_value
 
+    def _references(self) -> list:
+        """Objects and names the Arm refers to, for CodeWriter.tree_shake."""
+        return [self._condition_value, *_CONTAINER_._references(self)]
+
     def __str__(self):
-        buf = []
-        indent_spaces = " " * self._formatter._indent_spaces * self._indent
+        return _render(self._emit, self._formatter)
 
-        buf.append(f"{self._condition_value} => {{")
-        for code_object in self._code_obj_tree:
-            buf.append(
-                f"{indent_spaces + (' ' * self._formatter._indent_spaces)}{code_object}"
-            )
-        buf.append(f" {indent_spaces}}}")
-        return "\n".join(buf)
+    def _emit(self, __renderer: _Renderer) -> None:
+        self._emit_closure(__renderer, "}")
+
+    def _emit_match_arm(self, __renderer: _Renderer) -> None:
+        self._emit_closure(__renderer, "},")
+
+    def _emit_closure(self, __renderer: _Renderer, __closing: str) -> None:
+        __renderer.line(f"{self._condition_value} => {{")
+        __renderer.indent()
+        for code_object in self._nodes():
+            __renderer.render(code_object)
+        __renderer.dedent()
+        __renderer.line(__closing)
+
+
+# ==============================================================================================
+# ==============================================================================================
 
 
 class MatchStatement(_CONTAINER_, _CODEOBJECT_):
+    # Arms are held in _arm_list; the inherited child tree stays unallocated.
+    __slots__ = ("_parameter", "_arm_list")
+
+    @_profiled("construct")
     def __init__(
         self, __parameter: str | Variable, __formatter: Formatter = default_formatter
     ):
@@ -510,9 +1354,6 @@ class MatchStatement(_CONTAINER_, _CODEOBJECT_):
         self._formatter = __formatter
         super().__init__()
 
-        # Remove code tree from base class as it is ineffective deque.
-        del self._code_obj_tree
-
     def add(self, __other: Arm):
         try:
             if not isinstance(__other, Arm):
@@ -522,34 +1363,38 @@ class MatchStatement(_CONTAINER_, _CODEOBJECT_):
             if self._arm_list.get(key) != None:
                 raise ArmAlreadyExists(key)
             self._arm_list[key] = __other
+            __other._add_parent(self)
+            self._mark_dirty()
         except AddNoneArmToMatch as e:
-            traceback.print_stack()
-            print(
-                f"""\nCannot add type {type(e.args[0])} to MatchStatement. ({e.args[0]})"""
+            report(
+                "invalid-arm",
+                "MatchStatement",
+                f"Cannot add type {type(e.args[0])} to MatchStatement. ({e.args[0]})",
+                value=e.args[0],
             )
         except ArmAlreadyExists as e:
-            traceback.print_stack()
-            print(
-                f"""\nArm with case \"{e.args[0]}\", already exists on MatchStatement."""
+            report(
+                "duplicate-arm",
+                "MatchStatement",
+                f'Arm with case "{e.args[0]}", already exists on MatchStatement.',
+                value=e.args[0],
             )
 
-    def _build_closure(self, __arm: Arm):
-        buf = []
-        indent_spaces = " " * self._formatter._indent_spaces * self._indent
-        buf.append(f"{indent_spaces}{__arm._condition_value} => {{")
-        closure_indent = " " * self._formatter._indent_spaces * (self._indent + 1)
-        for code_object in __arm._code_obj_tree:
-            buf.append(f"{closure_indent}{code_object}")
-        buf.append(f"{indent_spaces}}},")
-        return buf
+    def _references(self) -> list:
+        """Objects and names the MatchStatement refers to, for CodeWriter.tree_shake."""
+        return [self._parameter, *self._arm_list.values()]
 
     def __str__(self):
-        buf = [f"match {self._parameter} {{"]
+        return _render(self._emit, self._formatter)
+
+    def _emit(self, __renderer: _Renderer) -> None:
+        __renderer.line(f"match {self._parameter} {{")
+        __renderer.indent()
         for arm in self._arm_list.values():
             if arm._condition_value == "_":
                 continue
-            buf.extend(self._build_closure(arm))
+            __renderer.emit(arm._emit_match_arm)
         if (x := self._arm_list.get("_")) != None:
-            buf.extend(self._build_closure(x))
-        buf.append(f"{' ' * self._formatter._indent_spaces * (self._indent - 1)}}}")
-        return "\n".join(buf)
+            __renderer.emit(x._emit_match_arm)
+        __renderer.dedent()
+        __renderer.line("}")
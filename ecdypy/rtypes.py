@@ -3,12 +3,51 @@ from __future__ import annotations
 """ Abstract Base Class """
 from abc import ABC, abstractmethod
 from enum import Enum
-import traceback
 
-from .codewriter import Formatter, default_formatter, _DECLARABLE_
+from .codewriter import Formatter, default_formatter, _DECLARABLE_, _profiled
+from .diagnostics import report, DiagnosticError
 
+from array import array
 import re
-import copy
+import weakref
+
+_numpy = False
+
+# Patterns are compiled once at import, rather than looked up in re's cache on every call.
+_IDENTIFIER_PATTERN = re.compile(r"^([a-zA-Z_]{1}[a-zA-Z_0-9]*)$")
+_ATTRIBUTE_NAME_PATTERN = re.compile(r"^([a-zA-Z_]{1}.*)$")
+_TRUE_PATTERN = re.compile(r"^(1|true|True)$")
+_FALSE_PATTERN = re.compile(r"^(0|false|False)$")
+
+
+def _get_numpy():
+    """Import NumPy on first use. Returns None when NumPy is not installed."""
+    global _numpy
+    if _numpy is False:
+        try:
+            import numpy as _numpy
+        except ImportError:
+            _numpy = None
+    return _numpy
+
+
+def _as_list(__values) -> list:
+    """Get the elements of an array of values, or of a mask, as a list."""
+    return (
+        __values.tolist()
+        if hasattr(__values, "tolist")
+        else list(_as_sequence(__values))
+    )
+
+
+def _as_sequence(__values):
+    """View a buffer-protocol object as a sequence of Python numbers, without NumPy."""
+    if isinstance(__values, (list, tuple, array)):
+        return __values
+    try:
+        return memoryview(__values).tolist()
+    except TypeError:
+        return list(__values)
 
 
 class UnknownTypeArgument(Exception):
@@ -50,6 +89,8 @@ class InvalidName(Exception):
 class _TYPE_(ABC):
     """Generic Interface for types in ecdypy."""
 
+    __slots__ = ("_display_form",)
+
     def __init__(self, __display_form: str) -> None:
         try:
             self._display_form = __display_form
@@ -66,6 +107,14 @@ class _TYPE_(ABC):
         """Check whether a provided value obeys the types constraints."""
         pass
 
+    def _compile_validator(self):
+        """Return a callable that filters a single value through the type.
+
+        Composite types call this once at construction, so that validating a value does not
+        need to dispatch on the type of each of their fields again.
+        """
+        return self.value_from
+
     @abstractmethod
     def __str__(self):
         pass
@@ -78,6 +127,9 @@ class _TYPE_(ABC):
 class _NUMBER_(_TYPE_):
     """Generic _TYPE_ interface-function implementations."""
 
+    __slots__ = ()
+
+    @_profiled("value_from")
     def value_from(self, __value):
         try:
             if self.is_ok(__value):
@@ -89,118 +141,336 @@ class _NUMBER_(_TYPE_):
             else:
                 raise
         except Exception:
-            print(f"Cannot assign value: {__value} to type {self._display_form}.")
+            report(
+                "invalid-value",
+                self._display_form,
+                f"Cannot assign value: {__value} to type {self._display_form}.",
+                value=__value,
+            )
 
     def is_ok(self, __value: int) -> bool:
         if type(__value) is not int:
             return False
         return int(__value) <= self.max_value and int(__value) >= self.min_value
 
+    def value_from_many(self, __values) -> tuple:
+        """Clamp a whole array of values to the type's range in one pass.
+
+        Accepts NumPy arrays, array.array or any object supporting the buffer protocol. When
+        NumPy is installed the check is vectorized and NumPy arrays are returned, otherwise lists.
+
+        Floats holding whole numbers are taken as integers. Other floats are clamped when they are
+        out of range, like value_from does, and rejected otherwise: values like 2.5, NaN or
+        infinities are reported, flagged in the mask and set to 0.
+
+        Examples:
+            >>> import ecdypy as ec
+            >>> import numpy as np
+            >>> values, mask = ec.RTypes.u8.value.value_from_many(np.array([-1, 5, 300, 2.5]))
+            >>> print(values) # [  0   5 255   0]
+            >>> print(mask)   # [ True False  True  True]
+
+        :return: The filtered values, and a mask that is True at every out-of-range or rejected position.
+        :rtype: tuple
+        """
+        values, mask, invalid = self._filter_many(__values)
+        if invalid is not None:
+            rejected = [x for x, y in zip(_as_list(__values), _as_list(invalid)) if y]
+            report(
+                "invalid-value",
+                self._display_form,
+                f"Cannot assign {len(rejected)} values to type {self._display_form}, "
+                f"i.e. {rejected[0]}.",
+                value=rejected,
+            )
+        return values, mask
+
+    def _filter_many(self, __values) -> tuple:
+        """Filter a whole array of values, see value_from_many.
+
+        :return: The filtered values, the mask, and a mask of the rejected values, or None if no value was rejected.
+        :rtype: tuple
+        """
+        min_value, max_value = self.min_value, self.max_value
+        np = _get_numpy()
+        if np is not None:
+            values = np.asarray(__values)
+            kind = values.dtype.kind
+            if kind == "b":
+                values = values.astype(np.uint8)
+                kind = "u"
+            if kind in "iu":
+                # Bounds outside of the array's dtype can never be exceeded, so clip them first.
+                info = np.iinfo(values.dtype)
+                low = max(min_value, int(info.min))
+                high = min(max_value, int(info.max))
+                mask = (values < low) | (values > high)
+                return np.clip(values, low, high), mask, None
+            if kind == "f" and not isinstance(__values, (list, tuple)):
+                dtype = np.uint64 if min_value >= 0 else np.int64
+                info = np.iinfo(dtype)
+                if info.min <= min_value and max_value <= info.max:
+                    return self._filter_floats(np, values, dtype)
+            # Keep the elements of a list as given, since NumPy promotes mixed ints and floats.
+            if not isinstance(__values, (list, tuple)):
+                __values = values.tolist()
+
+        values = _as_sequence(__values)
+        if all(type(x) is int for x in values):
+            mask = [not (min_value <= x <= max_value) for x in values]
+            clamped = [min(max(x, min_value), max_value) for x in values]
+            return clamped, mask, None
+
+        clamped = []
+        mask = []
+        invalid = []
+        for x in values:
+            if type(x) is float and x.is_integer():
+                x = int(x)
+            if type(x) is int:
+                clamped.append(min(max(x, min_value), max_value))
+                mask.append(not (min_value <= x <= max_value))
+                invalid.append(False)
+                continue
+            try:
+                whole = int(x) if type(x) is float else None
+            except (OverflowError, ValueError):
+                whole = None
+            if whole is not None and whole <= min_value:
+                clamped.append(min_value)
+                invalid.append(False)
+            elif whole is not None and whole >= max_value:
+                clamped.append(max_value)
+                invalid.append(False)
+            else:
+                clamped.append(0)
+                invalid.append(True)
+            mask.append(True)
+        return clamped, mask, invalid if any(invalid) else None
+
+    def _filter_floats(self, np, __values, __dtype) -> tuple:
+        """Filter a float array vectorized, converting it to the given integer dtype."""
+        min_value, max_value = self.min_value, self.max_value
+        whole = np.trunc(__values)
+        # Bounds are compared as floats, and a bound that is rounded outward when converted to a
+        # float excludes itself, so that every value within the float bounds fits the dtype.
+        low, high = float(min_value), float(max_value)
+        below = whole < low if int(low) >= min_value else whole <= low
+        above = whole > high if int(high) <= max_value else whole >= high
+        # Like value_from, a fraction is only clamped when it is out of range. NaN and infinities
+        # are never within range, and are rejected.
+        fraction = whole != __values
+        invalid = ~np.isfinite(__values) | (
+            fraction & ~(below | above | (whole == low) | (whole == high))
+        )
+        mask = below | above | fraction
+        out = np.where(mask, 0, whole).astype(__dtype)
+        out[below & ~invalid] = min_value
+        out[above & ~invalid] = max_value
+        out[fraction & (whole == low) & ~invalid] = min_value
+        out[fraction & (whole == high) & ~invalid] = max_value
+        return out, mask, invalid if invalid.any() else None
+
+    def is_ok_many(self, __values):
+        """Check a whole array of values against the type's range in one pass.
+
+        See value_from_many for the accepted inputs.
+
+        :return: Mask that is True at every position holding a valid value.
+        """
+        mask = self.value_from_many(__values)[1]
+        if isinstance(mask, list):
+            return [not x for x in mask]
+        return ~mask
+
+    def _compile_validator(self):
+        # Types with their own constraints (i.e. floats) keep their own value_from.
+        if type(self).is_ok is not _NUMBER_.is_ok:
+            return self.value_from
+        min_value, max_value, value_from = (
+            self.min_value,
+            self.max_value,
+            self.value_from,
+        )
+
+        def validate(__value):
+            if type(__value) is int and min_value <= __value <= max_value:
+                return __value
+            return value_from(__value)
+
+        return validate
+
     def __str__(self) -> str:
         return self._display_form
 
 
 class _U8_(_NUMBER_):
+    __slots__ = ()
     min_value = 0
     max_value = 255
 
 
 class _I8_(_NUMBER_):
+    __slots__ = ()
     min_value = -127
     max_value = 127
 
 
 class _U16_(_NUMBER_):
+    __slots__ = ()
     min_value = 0
     max_value = 65535
 
 
 class _I16_(_NUMBER_):
+    __slots__ = ()
     min_value = -32767
     max_value = 32767
 
 
 class _U32_(_NUMBER_):
+    __slots__ = ()
     min_value = 0
     max_value = (2**32) - 1
 
 
 class _I32_(_NUMBER_):
+    __slots__ = ()
     min_value = -((2**31) - 1)
     max_value = (2**31) - 1
 
 
 class _U64_(_NUMBER_):
+    __slots__ = ()
     min_value = 0
     max_value = (2**64) - 1
 
 
 class _I64_(_NUMBER_):
+    __slots__ = ()
     min_value = -((2**63) - 1)
     max_value = (2**63) - 1
 
 
 class _U128_(_NUMBER_):
+    __slots__ = ()
     min_value = 0
     max_value = (2**128) - 1
 
 
 class _I128_(_NUMBER_):
+    __slots__ = ()
     min_value = -((2**127) - 1)
     max_value = (2**127) - 1
 
 
 class _USIZE_(_NUMBER_):
+    __slots__ = ()
     min_value = 0
     max_value = (2**64) - 1
 
 
 class _ISIZE_(_NUMBER_):
+    __slots__ = ()
     min_value = -((2**63) - 1)
     max_value = (2**63) - 1
 
 
-class _F32_(_NUMBER_):
-    ok_pattern = r"([0-9]*\.[0-9]*_f32)"
+class _FLOAT_(_NUMBER_):
+    """Range-checking for floating point types."""
+
+    __slots__ = ()
+
+    float_max: float
+
+    @_profiled("value_from")
+    def value_from(self, __value):
+        """Filter a value through the type's finite range, see value_from_many."""
+        if type(__value) in (int, float):
+            if self.is_ok(__value):
+                return float(__value)
+            # NaN is kept, and anything else out of range is clamped to the largest finite value.
+            if __value != __value:
+                return __value
+            return self.float_max if __value > 0 else -self.float_max
+        report(
+            "invalid-value",
+            self._display_form,
+            f"Cannot assign value: {__value} to type {self._display_form}.",
+            value=__value,
+        )
+
+    def is_ok(self, __value) -> bool:
+        return type(__value) in (int, float) and abs(__value) <= self.float_max
+
+    def value_from_many(self, __values) -> tuple:
+        """Clamp a whole array of values to the type's finite range in one pass.
+
+        Infinities are clamped to the largest finite value. NaNs are flagged as out-of-range
+        and left as-is. See _NUMBER_.value_from_many for the accepted inputs.
+
+        :return: The clamped values, and a mask that is True at every out-of-range position.
+        :rtype: tuple
+        """
+        return self._filter_many(__values)[:2]
+
+    def _filter_many(self, __values) -> tuple:
+        float_max = self.float_max
+        np = _get_numpy()
+        if np is not None:
+            values = np.asarray(__values)
+            if values.dtype.kind != "f":
+                values = values.astype(np.float64)
+            # Comparisons with NaN are False, so NaNs are included in the mask.
+            mask = ~(np.abs(values) <= float_max)
+            return np.clip(values, -float_max, float_max), mask, None
+
+        values = _as_sequence(__values)
+        mask = [not (abs(x) <= float_max) for x in values]
+        clamped = [x if x != x else min(max(x, -float_max), float_max) for x in values]
+        return clamped, mask, None
+
+
+class _F32_(_FLOAT_):
+    __slots__ = ()
+
+    ok_pattern = re.compile(r"([0-9]*\.[0-9]*_f32)")
     min_value = 0
     max_value = (2**32) - 1
+    float_max = 3.4028234663852886e38
 
-    def is_ok(self, __value: str | int) -> bool:
-        return (
-            int(__value) > self.max_value
-            and int(__value) < self.min_value
-            and re.search(self.ok_pattern, __value) != None
-        )
 
+class _F64_(_FLOAT_):
+    __slots__ = ()
 
-class _F64_(_NUMBER_):
-    ok_pattern = r"([0-9]*\.[0-9]*_f64)"
+    ok_pattern = re.compile(r"([0-9]*\.[0-9]*_f64)")
     min_value = 0
     max_value = (2**64) - 1
-
-    def is_ok(self, __value: str | int) -> bool:
-        return (
-            int(__value) > self.max_value
-            and int(__value) < self.min_value
-            and re.search(self.ok_pattern, __value) != None
-        )
+    float_max = 1.7976931348623157e308
 
 
 class _BOOLEAN_(_TYPE_):
+    __slots__ = ()
+
+    @_profiled("value_from")
     def value_from(self, __value: bool | int | str) -> str:
         try:
             if not self.is_ok(__value):
                 raise
             __value = str(__value)
-            if re.search(r"^(1|true|True)$", __value) != None:
+            if _TRUE_PATTERN.search(__value) != None:
                 return "true"
-            elif re.search(r"^(0|false|False)$", __value) != None:
+            elif _FALSE_PATTERN.search(__value) != None:
                 return "false"
             else:
                 raise
         except Exception as e:
-            traceback.print_stack()
-            print(f"Cannot assign value: {__value} to type bool.")
+            report(
+                "invalid-value",
+                "bool",
+                f"Cannot assign value: {__value} to type bool.",
+                value=__value,
+            )
 
     def is_ok(self, __value) -> bool:
         if type(__value) is bool:
@@ -217,6 +487,9 @@ class _BOOLEAN_(_TYPE_):
 
 
 class _STR_(_TYPE_):
+    __slots__ = ()
+
+    @_profiled("value_from")
     def value_from(self, __value: str | int | bool) -> str:
         return str(__value)
 
@@ -233,22 +506,31 @@ class _CHAR_(_TYPE_):
     Valid Integer Values under: https://www.unicode.org/glossary/#unicode_scalar_value
     """
 
-    unicode_scalar_value_pattern = r"^(0x([0-9A-Fa-f]{0,3}|[0-9A-Fa-f]{5}|[0-9A-Da-d][0-7][0-9A-Fa-f]{2}|[E-Fe-f][0-9]{3}|10[0-9A-Fa-f]{4}))$"
+    __slots__ = ()
+
+    unicode_scalar_value_pattern = re.compile(
+        r"^(0x([0-9A-Fa-f]{0,3}|[0-9A-Fa-f]{5}|[0-9A-Da-d][0-7][0-9A-Fa-f]{2}|[E-Fe-f][0-9]{3}|10[0-9A-Fa-f]{4}))$"
+    )
 
+    @_profiled("value_from")
     def value_from(self, __value: str | int) -> str:
         try:
             if not self.is_ok(__value):
                 raise e
             if (
-                re.search(self.unicode_scalar_value_pattern, __value)
+                self.unicode_scalar_value_pattern.search(__value)
                 or type(__value) is int
             ):
                 return chr(__value)
             else:
                 return __value
         except Exception as e:
-            traceback.print_stack()
-            print(e)
+            report(
+                "invalid-value",
+                "char",
+                f"Cannot assign value: {__value} to type char.",
+                value=__value,
+            )
 
     def is_ok(self, __value: str | int):
         if type(__value) is int and chr(__value):
@@ -259,7 +541,7 @@ class _CHAR_(_TYPE_):
         elif type(__value) is str:
             if len(__value) == 1:
                 return True
-            elif re.search(self.unicode_scalar_value_pattern, __value) != None:
+            elif self.unicode_scalar_value_pattern.search(__value) != None:
                 return True
         return False
 
@@ -296,6 +578,10 @@ class RTypes(Enum):
     str = _STR_("str")
     char = _CHAR_("char")
 
+    def __reduce_ex__(self, __protocol):
+        # Members are looked up by name, as their values do not compare equal across processes.
+        return getattr, (self.__class__, self._name_)
+
 
 # ==============================================================================================
 # ==============================================================================================
@@ -308,7 +594,90 @@ def _normalize_arg_type(__type):
     return new
 
 
-class Tuple(_TYPE_):
+def _freeze_type_args(__value):
+    """Build a hashable key from raw type arguments. Raises TypeError if they are unhashable."""
+    if isinstance(__value, list):
+        return (list, tuple([_freeze_type_args(x) for x in __value]))
+    if isinstance(__value, tuple):
+        return (tuple, tuple([_freeze_type_args(x) for x in __value]))
+    if isinstance(__value, dict):
+        return (dict, tuple([(x, _freeze_type_args(y)) for x, y in __value.items()]))
+    if isinstance(__value, str):
+        return RTypes.__members__.get(__value, __value)
+    hash(__value)
+    return __value
+
+
+class _INTERNED_(object):
+    """Base Class for immutable type objects that are hash-consed.
+
+    Constructing a type from the same arguments as a live instance returns that instance rather
+    than building a new one. Instances compare and hash structurally, so types built from
+    different spellings of the same expression (i.e. "u8" and RTypes.u8) are still equal.
+    Interned instances are shared and must not be mutated.
+    """
+
+    _interned: weakref.WeakValueDictionary
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._interned = weakref.WeakValueDictionary()
+
+    def __new__(cls, *args, **kwargs):
+        try:
+            key = (_freeze_type_args(args), _freeze_type_args(kwargs))
+        except TypeError:
+            key = None
+        if key is not None and (instance := cls._interned.get(key)) is not None:
+            return instance
+        instance = super().__new__(cls)
+        instance._args_key = key
+        return instance
+
+    def _intern(self, __key: tuple) -> None:
+        """Register a freshly constructed instance under its argument and structural keys."""
+        self._key = __key
+        self._hash = hash((type(self), __key))
+        self._compile()
+        canonical = type(self)._interned.setdefault(("structure", __key), self)
+        if self._args_key is not None:
+            type(self)._interned[self._args_key] = canonical
+
+    def _compile(self) -> None:
+        """Build any callables derived from the type. Called after construction and unpickling."""
+        pass
+
+    def _is_constructed(self) -> bool:
+        return "_key" in self.__dict__
+
+    def __eq__(self, __other) -> bool:
+        if self is __other:
+            return True
+        if type(__other) is not type(self):
+            return NotImplemented
+        return self._hash == __other._hash and self._key == __other._key
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __reduce__(self):
+        state = self.__dict__.copy()
+        del state["_hash"], state["_args_key"], state["_validators"]
+        state.pop("_fields", None)
+        return (_unpickle_interned, (type(self), state))
+
+
+def _unpickle_interned(__cls: type, __state: dict) -> _INTERNED_:
+    instance = object.__new__(__cls)
+    instance.__dict__.update(__state)
+    # Hashes of members of RTypes differ between processes, so they must be recomputed.
+    instance._args_key = None
+    instance._hash = hash((__cls, instance._key))
+    instance._compile()
+    return __cls._interned.setdefault(("structure", instance._key), instance)
+
+
+class Tuple(_INTERNED_, _TYPE_):
     """Class for creating Rust Tuples for type declarations and value filtering.
 
     Used to set Rust data-types as a Tuple of existing or user-defined types.
@@ -329,6 +698,7 @@ class Tuple(_TYPE_):
         >>> print(complex_variable.get_declaration()) # let complex: (u8, (u16, u16))
     """
 
+    @_profiled("construct")
     def __init__(self, *args: _TYPE_ | list[_TYPE_], **kwargs) -> None:
         """Ecdypy Tuple Constructor
 
@@ -356,6 +726,8 @@ class Tuple(_TYPE_):
             >>> print(tuple_four) # ((i16, u16), i32)
 
         """
+        if self._is_constructed():
+            return
         try:
             check = kwargs.get("check") if type(kwargs.get("check")) is bool else True
             arg_list = Tuple._flatten_args(list(args))
@@ -366,10 +738,16 @@ class Tuple(_TYPE_):
             self._type_tree = types
             self._type_list = arg_list
             self._check = check
+            self._leaves = Tuple._build_layout(types)
+            self._intern(tuple(types))
 
         except UnknownTypeArgument as e:
-            traceback.print_stack()
-            print(f"\nUnknown type: '{e.args[0]}' provided in tuple assignment.\n")
+            report(
+                "unknown-type",
+                "Tuple",
+                f"Unknown type: '{e.args[0]}' provided in tuple assignment.",
+                value=e.args[0],
+            )
 
     @staticmethod
     def _check_arg_list(__list):
@@ -384,44 +762,67 @@ class Tuple(_TYPE_):
 
     @staticmethod
     def _convert_recursive_objects(__list):
-        if len(__list) == 0:
-            return __list
-        if isinstance(__list[0], tuple):
-            return [Tuple(list(__list[0]))] + Tuple._convert_recursive_objects(
-                __list[1:]
-            )
-        elif isinstance(__list[0], list):
-            return Tuple._convert_recursive_objects(
-                __list[0]
-            ) + Tuple._convert_recursive_objects(__list[1:])
-        __list[0] = _normalize_arg_type(__list[0])
-        return __list[:1] + Tuple._convert_recursive_objects(__list[1:])
+        """Normalize type arguments, flattening lists and converting tuples into nested Tuples."""
+        out = []
+        stack = [iter(__list)]
+        while stack:
+            for item in stack[-1]:
+                if isinstance(item, tuple):
+                    out.append(Tuple(list(item)))
+                elif isinstance(item, list):
+                    stack.append(iter(item))
+                    break
+                else:
+                    out.append(_normalize_arg_type(item))
+            else:
+                stack.pop()
+        return out
 
     @staticmethod
     def _flatten_args(__list):
+        """Flatten lists and tuples, and expand Tuples into their type trees.
+
+        Iterative, so that the cost is linear and wide arguments cannot exceed the recursion limit.
         """
-        Recursive Method Derived from:
-        https://stackabuse.com/python-how-to-flatten-list-of-lists/
-        """
-        if len(__list) == 0:
-            return __list
-        if isinstance(__list[0], list):
-            return Tuple._flatten_args(__list[0]) + Tuple._flatten_args(__list[1:])
-        if isinstance(__list[0], Tuple):
-            return __list[0].get_types() + Tuple._flatten_args(__list[1:])
-        if isinstance(__list[0], tuple):
-            return Tuple._flatten_args(list(__list[0])) + Tuple._flatten_args(
-                __list[1:]
-            )
-        return __list[:1] + Tuple._flatten_args(__list[1:])
+        out = []
+        stack = [iter(__list)]
+        while stack:
+            for item in stack[-1]:
+                if isinstance(item, (list, tuple)):
+                    stack.append(iter(item))
+                    break
+                elif isinstance(item, Tuple):
+                    out.extend(item.get_types())
+                else:
+                    out.append(item)
+            else:
+                stack.pop()
+        return out
 
     @staticmethod
     def _flatten_lists(__list):
-        if len(__list) == 0:
-            return __list
-        if isinstance(__list[0], list):
-            return Tuple._flatten_lists(__list[0]) + Tuple._flatten_lists(__list[1:])
-        return __list[:1] + Tuple._flatten_lists(__list[1:])
+        out = []
+        stack = [iter(__list)]
+        while stack:
+            for item in stack[-1]:
+                if isinstance(item, list):
+                    stack.append(iter(item))
+                    break
+                out.append(item)
+            else:
+                stack.pop()
+        return out
+
+    @staticmethod
+    def _build_layout(__type_tree) -> tuple:
+        """Compute the flat sequence of leaf types of a type tree, expanding nested Tuples."""
+        leaves = []
+        for item in __type_tree:
+            if isinstance(item, Tuple):
+                leaves.extend(item._leaves)
+            else:
+                leaves.append(item)
+        return tuple(leaves)
 
     def is_ok(self, *args: _TYPE_ | list[_TYPE_]) -> bool:
         """Checks whether a given set of values fits all of the Tuple's type constraints.
@@ -454,20 +855,24 @@ class Tuple(_TYPE_):
             return False
         return True
 
-    def _verify_vals(self, __args, __make_list: bool = False) -> list[_TYPE_]:
-        if __make_list == True:
-            __args = list(__args)
-
-        out_vals = []
-        for i, type_item in enumerate(self._type_tree):
+    def _compile(self) -> None:
+        validators = []
+        for type_item in self._type_tree:
             if type(type_item) is Tuple:
-                out_vals.append(type_item._verify_vals(__args[i], True))
+                validators.append(lambda x, t=type_item: t._verify_vals(x, True))
             elif type(type_item) is RTypes:
-                out_vals.append(type_item.value.value_from(__args[i]))
+                validators.append(type_item.value._compile_validator())
             else:
-                out_vals.append(RTypes[type_item].value.value_from(__args[i]))
-        return tuple(out_vals)
+                validators.append(lambda x, t=type_item: RTypes[t].value.value_from(x))
+        self._validators = tuple(validators)
+
+    def _verify_vals(self, __args, __make_list: bool = False) -> list[_TYPE_]:
+        if __make_list == True:
+            __args = list(__args)
+        validators = self._validators
+        return tuple([validators[i](__args[i]) for i in range(len(validators))])
 
+    @_profiled("value_from")
     def value_from(self, *args: _TYPE_ | list[_TYPE_]) -> tuple:
         """Filter a set of input values through the contraints of the Tuple's types.
 
@@ -502,8 +907,12 @@ class Tuple(_TYPE_):
             return tuple(self._verify_vals(arg_vals))
 
         except IncorrectArgCount as e:
-            traceback.print_stack()
-            print(f"\nInvalid number of args given: {y} ({x} required).\n")
+            report(
+                "arg-count",
+                str(self),
+                f"Invalid number of args given: {y} ({x} required).",
+                value=args,
+            )
 
     def get_types_count(self) -> int:
         """Returns the number of types in the Tuple, including those in nested Tuples.
@@ -511,13 +920,7 @@ class Tuple(_TYPE_):
         :return: Number of types in Tuple.
         :rtype: int
         """
-        count = 0
-        for t in self._type_tree:
-            if isinstance(t, Tuple):
-                count += t.get_types_count()
-            else:
-                count += 1
-        return count
+        return len(self._leaves)
 
     def get_types(self) -> list[str]:
         """Returns the type tree of the Tuple.
@@ -527,6 +930,10 @@ class Tuple(_TYPE_):
         """
         return self._type_tree
 
+    def _references(self) -> list:
+        """Objects and names the Tuple refers to, for CodeWriter.tree_shake."""
+        return self._type_tree
+
     def __str__(self):
         """Generates the string representation of the tuple.
         :return: String representation of tuple.
@@ -546,7 +953,7 @@ class Tuple(_TYPE_):
 # ==============================================================================================
 
 
-class Struct(_TYPE_, _DECLARABLE_):
+class Struct(_INTERNED_, _TYPE_, _DECLARABLE_):
     """Class for creating Rust Structs. Can be used as type arguments or for writing struct declarations.
 
     Struct objects can be passed as a type argument into any appropriate function. Ecdypy does not automatically declare Structs,
@@ -567,6 +974,7 @@ class Struct(_TYPE_, _DECLARABLE_):
 
     """
 
+    @_profiled("construct")
     def __init__(self, *args: _TYPE_ | list[_TYPE_], **kwargs) -> Struct:
         """Ecdypy Struct Constructor
 
@@ -605,6 +1013,8 @@ class Struct(_TYPE_, _DECLARABLE_):
             >>> #   C: i8
             >>> # }
         """
+        if self._is_constructed():
+            return
         try:
             check = kwargs.get("check") if type(kwargs.get("check")) is bool else True
             name = kwargs.get("name")
@@ -622,34 +1032,50 @@ class Struct(_TYPE_, _DECLARABLE_):
             self._type_list = arg_list
             self._type_tree = types
             self._name = name
+            self._intern((name, tuple(types)))
 
         except InvalidName as e:
-            traceback.print_stack()
-            print(f"\nInvalid or no 'name' argument provided in struct assignment.\n")
+            report(
+                "invalid-name",
+                "Struct",
+                "Invalid or no 'name' argument provided in struct assignment.",
+            )
         except UnknownTypeArgument as e:
-            traceback.print_stack()
-            print(f"\nUnknown type: '{e.args[0]}' provided in struct assignment.\n")
+            report(
+                "unknown-type",
+                "Struct",
+                f"Unknown type: '{e.args[0]}' provided in struct assignment.",
+                value=e.args[0],
+            )
         except InvalidStructAttributeName as e:
-            traceback.print_stack()
-            print(
-                f"\nInvalid attribute name: '{e.args[0]}' provided in struct assignment."
+            report(
+                "invalid-name",
+                "Struct",
+                f"Invalid attribute name: '{e.args[0]}' provided in struct assignment.",
+                field=e.args[0],
             )
+        except DiagnosticError:
+            raise
         except Exception as e:
-            traceback.print_stack()
-            print(f"\nCannot assign type: {type(e.args[0])} to struct. ({e.args[0]})\n")
+            report(
+                "unknown-type",
+                "Struct",
+                f"Cannot assign type: {type(e.args[0])} to struct. ({e.args[0]})",
+                value=e.args[0],
+            )
 
     @staticmethod
     def _check_arg_list(__list):
         for arg in __list:
             if type(arg) is dict:
                 for key, value in arg.items():
-                    if re.search(r"^([a-zA-Z_]{1}.*)$", key) is None:
+                    if _ATTRIBUTE_NAME_PATTERN.search(key) is None:
                         raise InvalidStructAttributeName(key)
                     Struct._check_arg_type(value)
             # Handle Tuples
             elif type(arg) is tuple and len(arg) == 2:
                 Struct._check_arg_type(arg[-1])
-                if re.search(r"^([a-zA-Z_]{1}.*)$", arg[0]) is None:
+                if _ATTRIBUTE_NAME_PATTERN.search(arg[0]) is None:
                     raise InvalidStructAttributeName(arg[0])
             else:
                 raise UnknownTypeArgument(arg)
@@ -731,39 +1157,46 @@ class Struct(_TYPE_, _DECLARABLE_):
         except Exception as e:
             raise e
 
-    def _verify_vals(self, __args: list):
-        arg_vals = __args
-        arg_ids = [x[0] for x in arg_vals]
-        arg_values = [x[1] for x in arg_vals]
-        tree_ids = [x[0] for x in self._type_tree]
-        tree_types = [x[1] for x in self._type_tree]
-        # Deep copy or else lists share pointer.
-        satisy_list = copy.deepcopy(tree_ids)
-        seen_list = []
-        out_vals = []
-        for i, arg in enumerate(arg_ids):
-            if arg in seen_list:
-                continue
-            seen_list.append(arg)
-            if not arg in tree_ids:
-                continue
-            satisy_list.remove(arg)
-
-            target_type = tree_types[tree_ids.index(arg)]
+    def _compile(self) -> None:
+        # Map each field name to its position and type, so lookups do not scan the type tree.
+        self._fields = {
+            name: (i, target_type)
+            for i, (name, target_type) in enumerate(self._type_tree)
+        }
+        validators = {}
+        for name, target_type in self._type_tree:
             if type(target_type) is Struct:
-                out = target_type._verify_vals(arg_values[i])
-                if len(out[1]) > 0:
-                    raise AttributesNotSatisfied(out[1], arg_values[i])
-                out_vals.append((arg, str(target_type)))
+                validators[name] = lambda x, t=target_type: t._verify_struct(x)
             elif type(target_type) is Tuple:
-                out = target_type.value_from(list(arg_values[i]))
-                out_vals.append((arg, out))
-
+                validators[name] = lambda x, t=target_type: t.value_from(list(x))
+            elif type(target_type) is RTypes:
+                validators[name] = target_type.value._compile_validator()
             else:
-                out_vals.append((arg, target_type.value.value_from(arg_values[i])))
+                validators[name] = lambda x, t=target_type: t.value.value_from(x)
+        self._validators = validators
+
+    def _verify_struct(self, __value) -> str:
+        """Validate the value of a field whose type is this Struct."""
+        out = self._verify_vals(__value)
+        if len(out[1]) > 0:
+            raise AttributesNotSatisfied(out[1], __value)
+        return str(self)
 
-        return out_vals, satisy_list
+    def _verify_vals(self, __args: list):
+        fields = self._fields
+        validators = self._validators
+        seen = set()
+        out_vals = []
+        for name, value in __args:
+            if name in seen or name not in fields:
+                continue
+            seen.add(name)
+            out_vals.append((name, validators[name](value)))
+
+        satisfy_list = [x for x in fields if x not in seen]
+        return out_vals, satisfy_list
 
+    @_profiled("value_from")
     def value_from(self, *args: _TYPE_ | list[_TYPE_]) -> str:
         """Filters a given set of values through their constraints of their respective type in the Struct's attributes.
 
@@ -798,23 +1231,35 @@ class Struct(_TYPE_, _DECLARABLE_):
             if len(out[1]) > 0:
                 raise AttributesNotSatisfied(out[1], arg_vals)
             if len(out[0]) < len(arg_vals):
-                dif = list(set(arg_vals) - set(out[0]))
+                # Keys that are unknown, or repeated after their first occurrence.
+                seen = set()
+                dif = [
+                    x
+                    for x, _ in arg_vals
+                    if x not in self._fields or x in seen or seen.add(x)
+                ]
                 raise UnknownArgKeys(dif)
 
-            buf = f"{self.get_name()} {{"
-            for pair in out[0]:
-                val = f"'{pair[1]}'" if isinstance(pair[1], str) else pair[1]
-                buf = buf + f"{pair[0]}: {val},"
-            buf = buf + "};"
-
-            return buf
+            buf = "".join(
+                [
+                    f"{x}: '{y}'," if isinstance(y, str) else f"{x}: {y},"
+                    for x, y in out[0]
+                ]
+            )
+            return f"{self.get_name()} {{{buf}}};"
         except UnknownArgKeys as e:
-            traceback.print_stack()
-            print(f"Unknown Key: '{e.args[0]}' provided. ({list(args)})'")
+            report(
+                "unknown-keys",
+                self.get_name(),
+                f"Unknown Key: '{e.args[0]}' provided.",
+                value=list(args),
+            )
         except AttributesNotSatisfied as e:
-            traceback.print_stack()
-            print(
-                f"Attributes with keys: {e.args[0]} not satisfied by input values. ({list(args)})"
+            report(
+                "missing-fields",
+                self.get_name(),
+                f"Attributes with keys: {e.args[0]} not satisfied by input values.",
+                value=list(args),
             )
 
     def get_types(self) -> list[str]:
@@ -825,6 +1270,10 @@ class Struct(_TYPE_, _DECLARABLE_):
         """
         return self._type_tree
 
+    def _references(self) -> list:
+        """Objects and names the Struct refers to, for CodeWriter.tree_shake."""
+        return [x for _, x in self._type_tree]
+
     def get_name(self) -> str:
         """Returns the name of the Struct.
 
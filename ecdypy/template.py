@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+from typing import Any, Callable
+import itertools
+import re
+
+from .codewriter import CodeWriter, Formatter, FrozenCodeText, default_formatter
+from .diagnostics import report
+from .rtypes import Struct, Tuple, _normalize_arg_type
+
+
+# Placeholder names may not contain double underscores or end with an underscore, so that the
+# end of a name is unambiguous within the sentinel. The sentinel of a typed Placeholder ends with
+# the index of its type, i.e. __ecdypy_limit_3t0__.
+_PLACEHOLDER_NAME_PATTERN = re.compile(r"^[A-Za-z](?:_?[A-Za-z0-9])*$")
+_SENTINEL_PATTERN = re.compile(
+    r"__ecdypy_([A-Za-z](?:_?[A-Za-z0-9])*)_(\d+)(?:t(\d+))?__"
+)
+
+_tokens = itertools.count()
+# Types of the typed Placeholders, by the index in their sentinel. The type travels with the
+# text of the sentinel, so it is found even once the Placeholder itself is gone, i.e. when it was
+# only formatted into a string. Each distinct type is stored once.
+_types: list = []
+_type_indices: dict = {}
+
+
+def _type_index(__type) -> int:
+    """Get the index of a type in the registry of Placeholder types, adding it if needed."""
+    index = _type_indices.get(__type)
+    if index is None:
+        index = _type_indices[__type] = len(_types)
+        _types.append(__type)
+    return index
+
+
+def _sentinel(__name: str, __token: int, __type: Any) -> str:
+    if __type is None:
+        return f"__ecdypy_{__name}_{__token}__"
+    return f"__ecdypy_{__name}_{__token}t{_type_index(__type)}__"
+
+
+class Placeholder(str):
+    """Named hole in a Template.
+
+    A Placeholder is a str whose text is a sentinel identifier. It can be given anywhere a
+    construct accepts a name or a type, and as the value of a Variable, and is passed through
+    validation as-is. Struct field types must still be concrete types.
+
+    Values are substituted verbatim, unless the Placeholder was given a type. The value of a typed
+    Placeholder is filtered through that type and formatted as a literal of it.
+
+    Examples:
+        >>> import ecdypy as ec
+        >>> name = ec.Placeholder("name")
+        >>> limit = ec.Placeholder("limit", ec.RTypes.u32)
+        >>> func = ec.Function(name, [{"value": ec.Placeholder("T")}], ec.RTypes.bool)
+        >>> func.add(ec.Variable("limit", ec.RTypes.u32, limit))
+        >>> func.add("value < limit")
+    """
+
+    def __new__(cls, __name: str, __type: Any = None) -> Placeholder:
+        if _PLACEHOLDER_NAME_PATTERN.search(__name) is None:
+            report(
+                "invalid-name",
+                "Placeholder",
+                f"Invalid placeholder name: '{__name}'. Names are letters, digits and single "
+                "underscores, starting with a letter.",
+                value=__name,
+            )
+        self = str.__new__(cls, _sentinel(__name, next(_tokens), __type))
+        self._name = __name
+        self._type = __type
+        return self
+
+    def get_name(self) -> str:
+        """Returns the name of the Placeholder, as given to Template.render."""
+        return self._name
+
+    def __reduce__(self):
+        return (_unpickle_placeholder, (str(self), self._name, self._type))
+
+
+def _unpickle_placeholder(__text: str, __name: str, __type: Any) -> Placeholder:
+    # Keep the original token, so that an unpickled tree still renders the same text. The index
+    # of the type is looked up again, as the registry may differ between processes.
+    token = int(_SENTINEL_PATTERN.fullmatch(__text).group(2))
+    self = str.__new__(Placeholder, _sentinel(__name, token, __type))
+    self._name = __name
+    self._type = __type
+    return self
+
+
+def _is_invalid(__value) -> bool:
+    """Check whether a filtered value, or any member of a filtered tuple, was rejected."""
+    if isinstance(__value, tuple):
+        return any(_is_invalid(x) for x in __value)
+    return __value is None
+
+
+def _value_formatter(__type) -> Callable[[Any], str | None]:
+    """Return a callable that filters a value through a type and formats it as a literal.
+
+    The callable returns None if the value was rejected, and reported, by the type.
+    """
+    from .rconstructs import _literal_formatter
+
+    typ = _normalize_arg_type(__type)
+    if isinstance(typ, Struct):
+        return typ.value_from
+    literal = _literal_formatter(typ)
+    if isinstance(typ, Tuple):
+        validate = lambda x: typ._verify_vals(x, True)
+    else:
+        validate = typ.value._compile_validator()
+
+    def convert(__value) -> str | None:
+        value = validate(__value)
+        return None if _is_invalid(value) else literal(value)
+
+    return convert
+
+
+class Template(object):
+    """Tree of CodeObjects containing Placeholders, compiled for fast mass instantiation.
+
+    The tree is rendered once, and its output split into literal segments and Placeholders.
+    Instantiating the Template only substitutes the values of the Placeholders between the
+    precomputed segments: no CodeObjects are built, validated or rendered.
+
+    The Template holds whatever adding the tree to a CodeWriter would output, and the tree is
+    not referenced after compilation.
+
+    Examples:
+        >>> import ecdypy as ec
+        >>> name = ec.Placeholder("name")
+        >>> func = ec.Function(name, [{"value": ec.Placeholder("T")}], ec.RTypes.bool)
+        >>> func.add(ec.Variable("limit", ec.RTypes.u32, ec.Placeholder("limit", ec.RTypes.u32)))
+        >>> func.add("value < limit")
+        >>> template = ec.Template(func.get_definition())
+        >>> print(template.render(name="is_small", T="u8", limit=16))
+        >>> # fn is_small(value: u8) -> bool {
+        >>> #     let limit: u32 = 16;
+        >>> #     value < limit
+        >>> # }
+        >>> \n
+        >>> cwr = ec.CodeWriter()
+        >>> for i in range(1000):
+        >>>     cwr.add(template.instantiate(name=f"is_small_{i}", T="u16", limit=i))
+    """
+
+    def __init__(self, __root, __formatter: Formatter = default_formatter) -> None:
+        """Ecdypy Template Constructor
+
+        :param __root: CodeObject, LazyString, Struct, CodeWriter or text containing Placeholders.
+        :param __formatter: Formatter used to render the tree, defaults to default_formatter
+        :type __formatter: Formatter, optional
+        """
+        text = str(CodeWriter(__root, __formatter))
+        parts = _SENTINEL_PATTERN.split(text)
+
+        # Parts alternate between a literal segment, and the name, token and type index of a
+        # placeholder.
+        fields = {}
+        slots = []
+        segments = [parts[0].replace("{", "{{").replace("}", "}}")]
+        for i in range(1, len(parts), 4):
+            name, index = parts[i], parts[i + 2]
+            if name not in fields:
+                fields[name] = len(slots)
+                if index is None:
+                    slots.append((name, str))
+                else:
+                    slots.append((name, _value_formatter(_types[int(index)])))
+            segments.append(f"{{{fields[name]}}}")
+            segments.append(parts[i + 3].replace("{", "{{").replace("}", "}}"))
+        self._format = "".join(segments)
+        self._slots = tuple(slots)
+
+    @property
+    def placeholders(self) -> tuple[str, ...]:
+        """Names of the Placeholders of the Template, in order of first appearance."""
+        return tuple(name for name, _ in self._slots)
+
+    def render(self, **values) -> str | None:
+        """Substitute a value for every Placeholder of the Template.
+
+        Values that the type of their Placeholder rejects are reported, and nothing is rendered.
+
+        :return: The code of the instance as str, or None if the values do not match the Placeholders.
+        :rtype: str | None
+        """
+        try:
+            args = [convert(values[name]) for name, convert in self._slots]
+        except KeyError:
+            missing = [name for name, _ in self._slots if name not in values]
+            report(
+                "missing-fields",
+                "Template",
+                f"Values are required for placeholders: {missing}",
+                value=missing,
+            )
+            return None
+        if None in args:
+            return None
+        if len(values) != len(args):
+            unknown = [x for x in values if x not in self.placeholders]
+            report(
+                "unknown-keys",
+                "Template",
+                f"Unknown placeholders given: {unknown}",
+                value=unknown,
+            )
+            return None
+        return self._format.format(*args)
+
+    __call__ = render
+
+    def instantiate(self, **values) -> FrozenCodeText | None:
+        """Substitute a value for every Placeholder, see render.
+
+        :return: The instance as a FrozenCodeText, ready to be added to a CodeWriter.
+        :rtype: FrozenCodeText | None
+        """
+        text = self.render(**values)
+        if text is None:
+            return None
+        return FrozenCodeText((text,))
@@ -0,0 +1,33 @@
+import sys
+import os
+import json
+
+current = os.path.dirname(os.path.realpath(__file__))
+parent = os.path.dirname(current)
+sys.path.append(parent)
+
+from benchmarks.suite import BENCHMARKS
+from benchmarks.__main__ import compare, main
+
+
+def test_benchmarks_run():
+    # Every benchmark must at least run once, so that the suite cannot silently rot.
+    for setup in BENCHMARKS.values():
+        setup()()
+
+
+def test_benchmarks_compare(tmp_path):
+    baseline = {"fast": 1.0, "slow": 1.0}
+    assert compare({"fast": 1.05, "slow": 1.5, "new": 1.0}, baseline) == ["slow"]
+    assert compare({"fast": 1.05, "slow": 1.5}, baseline, threshold=0.6) == []
+
+    results = tmp_path / "results.json"
+    stored = tmp_path / "baseline.json"
+    results.write_text(json.dumps({"results": {"fast": 2.0}}))
+    stored.write_text(json.dumps({"results": {"fast": 1.0}}))
+    assert main(["compare", str(results), "--baseline", str(stored)]) == 1
+    assert main(["compare", str(stored), "--baseline", str(stored)]) == 0
+
+    # A missing baseline is reported with how to record one, rather than a traceback.
+    missing = str(tmp_path / "missing.json")
+    assert main(["compare", str(results), "--baseline", missing]) == 2
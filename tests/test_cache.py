@@ -0,0 +1,105 @@
+from ecdypy.rtypes import RTypes, Tuple
+from ecdypy.rconstructs import Function, Variable
+from ecdypy.codewriter import CodeWriter, CodeText
+from ecdypy import cache
+from ecdypy.cache import cached_fragment
+import sys
+import os
+
+current = os.path.dirname(os.path.realpath(__file__))
+parent = os.path.dirname(current)
+sys.path.append(parent)
+
+
+# ==============================================================================================
+# ==============================================================================================
+
+
+def test_cached_fragment(tmp_path):
+    calls = []
+
+    @cached_fragment(directory=str(tmp_path))
+    def make_getter(name, typ):
+        calls.append(name)
+        func = Function(f"get_{name}", returns=typ)
+        func.add(Variable("value", Tuple(typ, typ), [1, 2]))
+        return func.get_definition()
+
+    first = make_getter("width", RTypes.u16)
+    second = make_getter("width", RTypes.u16)
+    assert isinstance(second, CodeText)
+    assert str(first) == str(second)
+    assert str(second).startswith("fn get_width() -> u16 {")
+    assert calls == ["width"]
+
+    make_getter("height", RTypes.u16)
+    assert calls == ["width", "height"]
+
+    # Cached text is re-indented when nested in another construct.
+    outer = Function("outer")
+    outer.add(second)
+    assert str(outer.get_definition()).split("\n")[1] == "    fn get_width() -> u16 {"
+
+
+def test_cached_fragment_eviction(tmp_path, monkeypatch):
+    scans = []
+    evict = cache._evict
+    monkeypatch.setattr(
+        cache, "_evict", lambda *args: scans.append(args[1]) or evict(*args)
+    )
+
+    @cached_fragment(directory=str(tmp_path), max_size=4096)
+    def make_text(i):
+        return CodeText("x" * 1000)
+
+    for i in range(20):
+        make_text(i)
+        sizes = [os.path.getsize(x) for x in tmp_path.iterdir()]
+        assert sum(sizes) <= 4096
+    # The directory is scanned on the first write, and then once per eviction rather than on
+    # every write.
+    assert scans == [4096] + [3072] * 8
+    assert len(os.listdir(tmp_path)) == 4
+
+
+def test_cached_fragment_unpicklable(tmp_path):
+    calls = []
+
+    @cached_fragment(directory=str(tmp_path))
+    def make_text(func):
+        calls.append(func)
+        return CodeText(func())
+
+    # Calls that cannot be keyed reliably are not cached.
+    assert str(make_text(lambda: "// text")) == "// text"
+    assert str(make_text(lambda: "// text")) == "// text"
+    assert len(calls) == 2 and not os.listdir(tmp_path)
+
+
+def test_cached_fragment_mode(tmp_path):
+    # The mode is read when an entry is written, rather than when the function is decorated.
+    @cached_fragment(directory=str(tmp_path))
+    def make_text():
+        return CodeText("// text")
+
+    umask = os.umask(0o027)
+    try:
+        make_text()
+    finally:
+        os.umask(umask)
+    (entry,) = tmp_path.iterdir()
+    assert entry.stat().st_mode & 0o777 == 0o640
+
+
+def test_cached_fragment_threads(tmp_path):
+    from concurrent.futures import ThreadPoolExecutor
+
+    @cached_fragment(directory=str(tmp_path))
+    def make_text(i):
+        return CodeText("x" * 100)
+
+    make_text(-1)
+    with ThreadPoolExecutor(8) as executor:
+        list(executor.map(make_text, range(400)))
+    # No concurrent update of the size estimate is lost.
+    assert cache._sizes[str(tmp_path)] == 401 * 100
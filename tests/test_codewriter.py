@@ -1,11 +1,26 @@
-from ecdypy.rtypes import RTypes
-from ecdypy.rconstructs import Variable, Function
-from ecdypy.codewriter import CodeWriter, CodeText, default_formatter
+from ecdypy.rtypes import RTypes, Struct
+from ecdypy.macros import Derive
+from ecdypy.rconstructs import Variable, Function, Arm, MatchStatement
+from ecdypy.codewriter import (
+    CodeWriter,
+    CodeText,
+    FrozenCodeText,
+    Profiler,
+    default_formatter,
+    _Renderer,
+)
+import json
+import io
+import pickle
+from concurrent.futures import ThreadPoolExecutor
 import sys
 import os
 
 import pytest
+import gc
 import re
+import tracemalloc
+import weakref
 import warnings
 
 current = os.path.dirname(os.path.realpath(__file__))
@@ -59,6 +74,47 @@ def test_codewriter_add_codetext():
         )
 
 
+def test_codetext_in_place_append():
+    text = CodeText("Line 1")
+    alias = text
+    text += "Line 2"
+    assert text is alias
+    assert len(text) == 2
+
+    combined = text + "Line 3"
+    assert len(combined) == 3
+    assert len(text) == 2
+
+
+def test_codetext_builder():
+    builder = CodeText.builder()
+    builder.append("// Header")
+    builder.extend(f"let x_{i} = {i};" for i in range(1000))
+    builder += "// Footer"
+    assert len(builder) == 1002
+
+    lines = ["// Header"] + [f"let x_{i} = {i};" for i in range(1000)] + ["// Footer"]
+    frozen = builder.freeze()
+    assert isinstance(frozen, FrozenCodeText)
+    assert len(frozen) == 1002 and len(builder) == 0
+    assert str(frozen) == "\n".join(lines)
+    assert str(CodeText("A").freeze()) == "A"
+
+    cwr = CodeWriter()
+    cwr.add(frozen)
+    cwr.add("Tail")
+    assert str(cwr) == "\n".join(lines + ["Tail"])
+
+    func = Function("outer")
+    func.add(CodeText.builder().extend(["a", "b"]).freeze())
+    assert re.sub(replace_pattern, "", str(func.get_definition())) == "fnouter(){ab}"
+    assert "\n    a\n    b\n" in str(func.get_definition())
+
+    text = CodeText.builder().extend(["a", "b"]).build()
+    assert isinstance(text, CodeText) and len(text) == 2
+    assert str(pickle.loads(pickle.dumps(frozen))) == str(frozen)
+
+
 def test_codewriter_concat():
     cwr = CodeWriter()
     cwr.add("Line 1")
@@ -79,6 +135,164 @@ def test_codewriter_concat():
     assert len(cwri) == 2
 
 
+def test_codewriter_drain_releases_written_nodes():
+    prelude = CodeWriter()
+    texts = [CodeText(f"Line {i}") for i in range(5)]
+    prelude.add(texts[:3])
+    cwr = CodeWriter(prelude)
+    cwr.add(texts[3:])
+    refs = [weakref.ref(x) for x in texts]
+    del prelude, texts
+
+    for i, chunk in enumerate(cwr.iter_chunks(drain=True)):
+        gc.collect()
+        assert chunk.endswith(f"Line {i}")
+        # Every node written before this chunk has been collected.
+        assert all(x() is None for x in refs[:i])
+        assert all(x() is not None for x in refs[i + 1 :])
+    gc.collect()
+    assert all(x() is None for x in refs)
+
+
+def test_codewriter_init():
+    cwr = CodeWriter(["Line 1", "Line 2"])
+    copy = CodeWriter(cwr)
+    assert str(copy) == str(cwr) == "Line 1\nLine 2"
+
+    # Writers built from another writer do not alias its tree.
+    copy.add("Line 3")
+    cwr.add("Other")
+    assert str(cwr) == "Line 1\nLine 2\nOther"
+    assert str(copy) == "Line 1\nLine 2\nLine 3"
+    assert str(CodeWriter("my_text")) == "my_text"
+
+
+def test_codewriter_fork():
+    shared = Function("shared")
+    prelude = CodeWriter()
+    prelude.add_auto_gen_comment()
+    prelude.add(shared)
+    prelude.add([f"// {i}" for i in range(100)])
+
+    forks = [prelude.fork() for _ in range(40)]
+    for i, fork in enumerate(forks):
+        fork.add(f"const TARGET: u8 = {i};")
+        assert fork._code_obj_tree._root is prelude._code_obj_tree._root
+    prelude.add("// prelude only")
+    assert len(forks[0]) == len(prelude) == 104
+    assert str(forks[1]).endswith("// 99\nconst TARGET: u8 = 1;")
+    assert forks[0]._code_obj_tree[-1] is forks[0]._code_obj_tree._tail[0]
+    assert forks[0]._code_obj_tree[1] is prelude._code_obj_tree[1]
+
+    # The shared prefix is rendered once, and reused by every fork.
+    segment = next(forks[0]._code_obj_tree.segments())
+    cache = segment._render_cache
+    assert cache is not None
+    str(forks[2])
+    assert segment._render_cache is cache
+
+    # Mutating a shared item is seen by every fork.
+    shared.add(Variable("my_var_1", RTypes.i32, 10))
+    assert "let my_var_1: i32 = 10;" in str(forks[0])
+    assert "let my_var_1: i32 = 10;" in str(prelude)
+
+    combined = forks[0].fork() + forks[1]
+    assert len(combined) == 208 and len(forks[0]) == 104
+    assert str(combined) == str(forks[0]) + "\n" + str(forks[1])
+    assert (combined + "// end") is combined and len(combined) == 209
+
+    # Draining a fork leaves the others intact.
+    expected = str(forks[3])
+    sink = io.StringIO()
+    forks[4].write_to(sink, drain=True)
+    assert len(forks[4]) == 0 and str(forks[3]) == expected
+    assert str(pickle.loads(pickle.dumps(combined))) == str(combined)
+
+
+def test_codewriter_deduplicate():
+    point = Struct({"x": "i32", "y": "i32"}, name="DedupPoint")
+    helper = Function("helper", [{"a": RTypes.u8}], RTypes.u8)
+    flag = Variable("flag", RTypes.bool, True, macros=Derive("Debug"))
+
+    cwr = CodeWriter()
+    for _ in range(100):
+        cwr.add([point, helper, flag.get_declaration(), "// ----", CodeText()])
+    expected = str(cwr)
+    cwr.add(Struct({"x": "i32", "y": "i32"}, name="DedupPoint"))
+    before = str(cwr)
+
+    saved = cwr.deduplicate()
+    after = str(cwr)
+    assert len(cwr) == 6 + 99 * 2
+    assert saved == len(before.encode()) - len(after.encode())
+    assert after.startswith(expected[: expected.index("// ----")])
+    assert after.count("// ----") == 100
+    assert cwr.deduplicate() == 0
+
+    # Shared trees are rebuilt rather than modified.
+    fork = cwr.fork()
+    cwr.add("// ----")
+    saved = fork.deduplicate(include_text=True)
+    assert str(fork) == after[: after.index("// ----")] + "// ----"
+    assert saved == len(after) - len(str(fork))
+    assert str(cwr).startswith(after)
+
+
+def test_codewriter_tree_shake():
+    point = Struct({"x": "i32", "y": "i32"}, name="ShakePoint")
+    line = Struct({"start": point, "end": point}, name="ShakeLine")
+    pair = Struct({"a": "u8", "b": "u8"}, name="ShakePair")
+    unused = Struct({"a": pair, "b": (RTypes.u8, RTypes.u16)}, name="ShakeUnused")
+    named = Struct({"a": "u16"}, name="ShakeNamed")
+    body = Struct({"a": "u32"}, name="ShakeBody")
+
+    length = Function("length", [{"line": line}], RTypes.f64)
+    helper = Function("helper", [{"value": "Vec<ShakeNamed>"}])
+    helper.add("let body = ShakeBody { a: 1 };")
+    main = Function("main")
+    main.add(Variable("origin", point, {"x": 0, "y": 0}))
+    main.add("helper(vec![]);")
+    dead = Function("dead", [{"pair": pair}], unused)
+
+    cwr = CodeWriter()
+    cwr.add("// header")
+    cwr.add([point, line, pair, unused, named, body, length, helper, main, dead])
+
+    assert cwr.tree_shake([main, "length"]) == 4
+    text = str(cwr)
+    for kept in (
+        "// header",
+        "struct ShakePoint",
+        "struct ShakeLine",
+        "struct ShakeNamed",
+    ):
+        assert kept in text
+    assert "struct ShakeBody" in text and "fn length" in text and "fn helper" in text
+    assert (
+        "ShakePair" not in text and "ShakeUnused" not in text and "fn dead" not in text
+    )
+    assert cwr.tree_shake([main, "length"]) == 0
+
+    # Frozen text, i.e. an instantiated Template, is scanned for names like a CodeText.
+    cwr = CodeWriter()
+    wrapper = Function("wrapper")
+    wrapper.add(CodeText("ShakeBody { a: 2 };").freeze())
+    cwr.add([point, body, named, pair, wrapper])
+    cwr.add(CodeText("fn top(p: ShakePoint) {}").freeze())
+    assert cwr.tree_shake([wrapper]) == 2
+    assert "struct ShakeBody" in str(cwr) and "struct ShakePoint" in str(cwr)
+
+    cwr = CodeWriter()
+    for i in range(2000):
+        struct = Struct({"a": "u8"}, name=f"Chain{i}")
+        func = Function(f"chain_{i}", [{"value": struct}])
+        if i:
+            func.add(f"chain_{i - 1}(value);")
+        cwr.add([struct, func])
+    assert cwr.tree_shake(["chain_999"]) == 1000 * 3
+    assert len(cwr) == 1000 * 3
+
+
 def test_codewriter_container():
     cwr = CodeWriter()
     my_parameter_map = [{"name": RTypes.str, "password": RTypes.str, "age": RTypes.u8}]
@@ -105,3 +319,234 @@ def test_codewriter_container():
 
     cwr.empty()
     assert str(cwr) == ""
+
+
+def test_codewriter_write_to():
+    cwr = CodeWriter()
+    my_func = Function("my_func", returns=RTypes.str)
+    my_func.add(Variable("my_var_1", RTypes.i32, 10))
+    cwr.add(["Line 1", my_func.get_definition(), "Line 2"])
+
+    expected = str(cwr)
+    assert "".join(cwr.iter_chunks()) == expected
+
+    sink = io.StringIO()
+    assert cwr.write_to(sink) == len(expected)
+    assert sink.getvalue() == expected
+    assert len(cwr) == 3
+
+    drained = io.StringIO()
+    cwr.write_to(drained, drain=True)
+    assert drained.getvalue() == expected
+    assert len(cwr) == 0
+
+
+def test_codewriter_write_to_buffer():
+    cwr = CodeWriter()
+    big = Function("big")
+    for i in range(20_000):
+        cwr.add(f"let x_{i} = {i};")
+        big.add(f"let y_{i} = {i};")
+    cwr.add(big.get_definition())
+
+    class Sink:
+        chunks = []
+
+        def write(self, __chunk):
+            self.chunks.append(len(__chunk))
+
+    # Output is flushed as it is written, rather than held until a memoized fragment completes.
+    count = cwr.write_to(Sink())
+    assert count == len(str(cwr)) > 500_000
+    # The buffer holds lines and the separators between them.
+    assert max(Sink.chunks) <= _Renderer._FLUSH_SIZE * len("    let y_19999 = 19999;")
+
+
+def test_codewriter_memoized_render():
+    cwr = CodeWriter()
+    outer = Function("outer")
+    inner = Function("inner")
+    inner.add(Variable("my_var_1", RTypes.i32, 10))
+    outer.add(inner.get_definition())
+    cwr.add(outer.get_definition())
+
+    first = str(cwr)
+    assert cwr._render_cache is not None
+    assert outer._render_cache is not None
+    assert str(cwr) == first
+
+    # Mutating a nested construct invalidates every ancestor.
+    inner.add(Variable("my_var_2", RTypes.i32, 20))
+    assert cwr._render_cache is None
+    assert outer._render_cache is None
+    cwr_str = re.sub(replace_pattern, "", str(cwr))
+    assert cwr_str == "fnouter(){fninner(){letmy_var_1:i32=10;letmy_var_2:i32=20;}}"
+
+    text = CodeText("Line 1")
+    cwr.add(text)
+    str(cwr)
+    text.add_text("Line 2")
+    assert str(cwr).endswith("Line 1\nLine 2")
+
+
+def test_codewriter_memoized_blank_lines():
+    cwr = CodeWriter()
+    cwr.add(["a", "", "b"])
+    assert str(cwr) == "a\n\nb"
+    cwr.add("c")
+    assert str(cwr) == "a\n\nb\nc"
+
+    # Cached fragments that are a blank line, or that write nothing at all.
+    cwr = CodeWriter()
+    cwr.add([CodeText(""), CodeWriter(), "x"])
+    first = str(cwr)
+    cwr.add("y")
+    assert first == "\nx" and str(cwr) == "\nx\ny"
+
+
+def test_codewriter_shared_child_does_not_keep_parents_alive():
+    shared = CodeText("// shared helper")
+    writers = []
+    for _ in range(1000):
+        cwr = CodeWriter()
+        cwr.add(shared)
+        str(cwr)
+        writers.append(weakref.ref(cwr))
+    del cwr
+    gc.collect()
+    assert all(x() is None for x in writers)
+
+    # Mutating the child prunes the dead parents, and still dirties live ones.
+    live = CodeWriter()
+    live.add(shared)
+    assert str(live) == "// shared helper"
+    shared.add_text("// more")
+    assert len(shared._parents) == 1
+    assert str(live) == "// shared helper\n// more"
+
+
+def test_codewriter_shared_subtree_threaded():
+    shared = Function("shared")
+    shared.add(Variable("my_var_1", RTypes.i32, 10))
+
+    outer = Function("outer")
+    outer.add(shared.get_definition())
+
+    cwr = CodeWriter()
+    cwr.add(shared.get_definition())
+    cwr.add(outer.get_definition())
+    for i in range(200):
+        func = Function(f"func_{i}")
+        func.add(shared.get_definition())
+        cwr.add(func.get_definition())
+
+    # The same Function is rendered at different depths without its indentation leaking.
+    assert str(shared.get_definition()).split("\n")[1] == "    let my_var_1: i32 = 10;"
+    assert (
+        str(outer.get_definition()).split("\n")[2] == "        let my_var_1: i32 = 10;"
+    )
+
+    expected = str(cwr)
+    assert cwr.render_threaded(8) == expected
+
+    blank = CodeWriter()
+    blank.add(["a", "", CodeWriter(), CodeText(""), "b"])
+    assert blank.render_threaded(2) == str(blank) == "a\n\n\nb"
+
+    with ThreadPoolExecutor(8) as executor:
+        results = list(executor.map(lambda _: str(cwr), range(16)))
+    assert all(x == expected for x in results)
+    assert str(shared.get_definition()).split("\n")[1] == "    let my_var_1: i32 = 10;"
+
+
+def test_codewriter_render_parallel():
+    cwr = CodeWriter()
+    for i in range(50):
+        func = Function(f"func_{i}", [{"a": RTypes.u8}], RTypes.str)
+        func.add(Variable("my_var_1", RTypes.i32, i, macros=Derive("Debug")))
+        cwr.add(func.get_definition())
+    cwr.add(Struct({"A": "u8", "B": "u16"}, name="my_struct"))
+
+    lazy = cwr._code_obj_tree[0]
+    copy = pickle.loads(pickle.dumps(lazy))
+    assert str(copy) == str(lazy)
+    assert copy._obj._parents is None
+
+    assert cwr.render_parallel(2, chunksize=8) == str(cwr)
+
+    blank = CodeWriter()
+    blank.add(["a", "", CodeWriter(), CodeText(""), "", "b"])
+    assert blank.render_parallel(2, chunksize=1) == str(blank) == "a\n\n\n\nb"
+
+
+def test_profiler(tmp_path):
+    init = Variable.__init__
+    with Profiler() as profiler:
+        assert Variable.__init__ is not init
+        with pytest.raises(RuntimeError):
+            Profiler().enable()
+
+        writer = CodeWriter()
+        function = Function("profiled")
+        function.add(Variable("my_var_1", RTypes.i32, 10))
+        writer.add(function)
+        str(writer)
+    # Disabling restores the original, unwrapped methods.
+    assert Variable.__init__ is init
+
+    totals = profiler.aggregate()
+    assert totals[("construct", "Variable")][0] == 1
+    assert totals[("construct", "Function")][0] == 1
+    assert totals[("render", "Function")][0] >= 1
+    assert totals[("value_from", "_I32_")][0] == 1
+    assert profiler.table().split("\n")[0].split() == [
+        "category",
+        "class",
+        "calls",
+        "total",
+        "(ms)",
+    ]
+
+    path = tmp_path / "trace.json"
+    profiler.export_chrome_trace(str(path))
+    events = json.loads(path.read_text())["traceEvents"]
+    assert {"Variable.__init__", "Function._emit_definition"} <= {
+        x["name"] for x in events
+    }
+    assert all(x["ph"] == "X" and x["dur"] >= 0 for x in events)
+
+    # Nothing is recorded once the profiler is disabled.
+    count = len(events)
+    Variable("my_var_2", RTypes.i32, 10)
+    assert len(profiler.get_chrome_trace()["traceEvents"]) == count
+
+
+# Upper bounds on the memory retained by a single freshly constructed node, in bytes.
+NODE_BYTES_BUDGET = {
+    "Variable": 160,
+    "CodeText": 256,
+    "Function": 160,
+    "Arm": 160,
+    "MatchStatement": 256,
+}
+
+
+def test_node_memory_budget():
+    names = [f"node_{i}" for i in range(5000)]
+    factories = {
+        "Variable": lambda x: Variable(x, RTypes.u8, 1),
+        "CodeText": lambda x: CodeText(x),
+        "Function": lambda x: Function(x),
+        "Arm": lambda x: Arm(x),
+        "MatchStatement": lambda x: MatchStatement(x),
+    }
+    for kind, factory in factories.items():
+        assert not hasattr(factory("warmup"), "__dict__")
+        tracemalloc.start()
+        try:
+            before = tracemalloc.get_traced_memory()[0]
+            nodes = [factory(x) for x in names]
+            used = tracemalloc.get_traced_memory()[0] - before
+        finally:
+            tracemalloc.stop()
+        assert used / len(nodes) <= NODE_BYTES_BUDGET[kind], kind
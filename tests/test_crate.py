@@ -0,0 +1,81 @@
+from ecdypy.rtypes import RTypes, Struct
+from ecdypy.rconstructs import Function
+from ecdypy.crate import Crate, Module
+import pytest
+import sys
+import os
+
+current = os.path.dirname(os.path.realpath(__file__))
+parent = os.path.dirname(current)
+sys.path.append(parent)
+
+
+# ==============================================================================================
+# ==============================================================================================
+
+
+def test_module_header():
+    module = Module("models")
+    module.use("std::fmt", "std::collections::HashMap", "std::fmt")
+    module.add_module("inner")
+    module.add_module("private", public=False)
+    module.add(Struct({"A": "u8"}, name="Model"))
+    assert module.get_text() == (
+        "use std::collections::HashMap;\n"
+        "use std::fmt;\n"
+        "\n"
+        "pub mod inner;\n"
+        "mod private;\n"
+        "\n"
+        "struct Model {\n"
+        "    A: u8\n"
+        "}"
+    )
+
+
+def test_crate_write(tmp_path):
+    crate = Crate()
+    crate.use("std::fmt")
+    for i in range(50):
+        module = crate.add_module(f"module_{i}")
+        module.add(Function(f"func_{i}", returns=RTypes.u8).get_definition())
+        module.add_module("nested").add("// nested")
+
+    written = crate.write(str(tmp_path), workers=8)
+    assert len(written) == 101
+
+    lib = (tmp_path / "src" / "lib.rs").read_text()
+    assert lib.startswith("use std::fmt;\n\npub mod module_0;\npub mod module_1;\n")
+    assert (tmp_path / "src" / "module_7.rs").read_text() == (
+        "pub mod nested;\n\nfn func_7() -> u8 {\n}\n"
+    )
+    assert (tmp_path / "src" / "module_7" / "nested.rs").read_text() == "// nested\n"
+    assert not [x for x in os.listdir(tmp_path / "src") if x.startswith(".ecdypy-")]
+
+
+def test_module_write_mode(tmp_path):
+    umask = os.umask(0o027)
+    try:
+        crate = Crate()
+        crate.add("// root")
+        path = crate.write(str(tmp_path))[0]
+    finally:
+        os.umask(umask)
+    # Files get the usual mode for the umask, rather than the private mode of a temporary file.
+    assert os.stat(path).st_mode & 0o777 == 0o640
+
+
+def test_module_write_failure(tmp_path, monkeypatch):
+    def chmod(*args):
+        raise PermissionError("chmod")
+
+    fds = os.listdir("/proc/self/fd") if os.path.isdir("/proc/self/fd") else None
+    monkeypatch.setattr(os, "chmod", chmod)
+    crate = Crate()
+    crate.add("// root")
+    with pytest.raises(PermissionError):
+        crate.write(str(tmp_path))
+    # The temporary file is removed and its descriptor closed.
+    assert os.listdir(tmp_path / "src") == []
+    if fds is not None:
+        assert len(os.listdir("/proc/self/fd")) == len(fds)
@@ -0,0 +1,74 @@
+from ecdypy import diagnostics
+from ecdypy.diagnostics import Collector, DiagnosticError
+from ecdypy.rtypes import RTypes, Tuple, Struct
+from ecdypy.rconstructs import Variable
+import threading
+
+import pytest
+
+
+def test_collect_mode():
+    with diagnostics.collect() as collector:
+        assert RTypes.bool.value.value_from("maybe") is None
+        Variable("my var", RTypes.u8, 1)
+        Struct({"A": "u8"}, name="collect_struct").value_from({"B": 1})
+
+    assert [x.code for x in collector.diagnostics] == [
+        "invalid-value",
+        "invalid-name",
+        "missing-fields",
+    ]
+    record = collector.diagnostics[0]
+    assert record.construct == "bool" and record.value == "maybe"
+    assert record.stack is None
+    assert collector.summary().startswith(
+        "3 diagnostics (invalid-value: 1, invalid-name: 1, missing-fields: 1)\n"
+        "[invalid-value] bool: Cannot assign value: maybe to type bool."
+    )
+
+    # The previous collector is restored after the block.
+    assert diagnostics.get_collector() is not collector
+
+
+def test_strict_and_silent_modes(capsys):
+    with diagnostics.collect("strict"):
+        with pytest.raises(DiagnosticError) as info:
+            Tuple(RTypes.u8, RTypes.u8).value_from(1, 2, 3)
+    assert info.value.diagnostic.code == "arg-count"
+
+    with diagnostics.collect("silent") as collector:
+        RTypes.u8.value.value_from("abc")
+    assert len(collector) == 0
+    assert capsys.readouterr().out == ""
+
+    RTypes.u8.value.value_from("abc")
+    assert (
+        capsys.readouterr().out
+        == "[invalid-value] u8: Cannot assign value: abc to type u8.\n"
+    )
+
+
+def test_capture_stack():
+    with diagnostics.collect(capture_stack=True) as collector:
+        RTypes.u8.value.value_from("abc")
+    assert "test_capture_stack" in collector.diagnostics[0].stack
+
+    with pytest.raises(ValueError):
+        Collector("loud")
+
+
+def test_collector_per_thread():
+    results = {}
+
+    def work(name, count):
+        with diagnostics.collect() as collector:
+            for _ in range(count):
+                RTypes.u8.value.value_from("abc")
+        results[name] = len(collector)
+
+    threads = [threading.Thread(target=work, args=(x, x)) for x in (1, 5, 9)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == {1: 1, 5: 5, 9: 9}
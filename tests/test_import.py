@@ -0,0 +1,78 @@
+import subprocess
+import sys
+import os
+
+import pytest
+
+current = os.path.dirname(os.path.realpath(__file__))
+parent = os.path.dirname(current)
+
+# Cumulative `-X importtime` cost of `import ecdypy, ecdypy.codewriter` in a fresh interpreter,
+# in microseconds, measured at 40-48ms. Since names are imported lazily, timing the bare import
+# alone would miss most of the cost.
+IMPORT_TIME_BUDGET = 55_000
+
+# Slow modules that are only imported by the functions that need them.
+DEFERRED_MODULES = ("concurrent.futures", "json", "threading", "traceback")
+
+
+def _run(__code: str, *args: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *args, "-c", __code],
+        cwd=parent,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def test_import_is_lazy():
+    result = _run(
+        "import sys, ecdypy\n"
+        "print(sorted(x for x in sys.modules if x.startswith('ecdypy')))\n"
+        "ecdypy.Variable\n"
+        "print(sorted(x for x in sys.modules if x.startswith('ecdypy')))\n"
+    )
+    before, after = result.stdout.splitlines()
+    assert before == "['ecdypy', 'ecdypy._meta']"
+    assert "'ecdypy.rconstructs'" in after and "'ecdypy.crate'" not in after
+
+
+def test_lazy_attributes():
+    import ecdypy
+
+    assert ecdypy.Variable.__module__ == "ecdypy.rconstructs"
+    assert ecdypy.diagnostics.__name__ == "ecdypy.diagnostics"
+    assert set(ecdypy.__all__) <= set(dir(ecdypy))
+    with pytest.raises(AttributeError):
+        ecdypy.NotAName
+
+
+def _import_times(__code: str) -> dict[str, int]:
+    """Cumulative import time of each top-level import made by the code, in microseconds."""
+    times = {}
+    for line in _run(__code, "-X", "importtime").stderr.splitlines()[1:]:
+        _, cumulative, name = line.split("|")
+        # Nested imports are indented, and already counted by the import that made them.
+        if not name[1:].startswith(" "):
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_import_time_budget():
+    startup = _import_times("pass")
+    # Take the best of a few runs, so that a single slow run on a busy machine does not fail.
+    timings = []
+    for _ in range(5):
+        times = _import_times("import ecdypy, ecdypy.codewriter")
+        timings.append(sum(y for x, y in times.items() if x not in startup))
+    assert min(timings) <= IMPORT_TIME_BUDGET, min(timings)
+
+
+def test_deferred_imports():
+    result = _run(
+        "import sys, ecdypy\n"
+        "ecdypy.Variable, ecdypy.CodeWriter().add('x')\n"
+        f"print([x for x in {DEFERRED_MODULES!r} if x in sys.modules])\n"
+    )
+    assert result.stdout.strip() == "[]"
@@ -1,7 +1,20 @@
 from ecdypy.macros import Macro, Derive
 from ecdypy.rtypes import RTypes, Tuple, Struct
-from ecdypy.rconstructs import Variable, Function, MatchStatement, Arm
+from ecdypy.rconstructs import (
+    Variable,
+    Function,
+    MatchStatement,
+    Arm,
+    StaticArray,
+    ConstArray,
+    StructOfArrays,
+    StaticTable,
+)
 from ecdypy.codewriter import CodeWriter
+from ecdypy import diagnostics, rtypes
+from ecdypy.diagnostics import DiagnosticError
+from array import array
+import io
 import sys
 import os
 
@@ -9,6 +22,8 @@ import warnings
 
 import re
 
+import pytest
+
 current = os.path.dirname(os.path.realpath(__file__))
 parent = os.path.dirname(current)
 sys.path.append(parent)
@@ -183,3 +198,263 @@ def test_match_statement():
         match_one_str
         == """matchmy_param{test=>{letmy_var_1:i32=10;},_=>{letmy_var_2:(u8,u64,u16,u32,u128,(u16,u16))=(1,1,2,3,4,(5,6));},}"""
     )
+
+
+def test_functions_nested_indentation():
+    outer = Function("outer")
+    inner = Function("inner")
+    inner.add(Variable("my_var_1", RTypes.i32, 10, macros=Derive("Debug")))
+    outer.add(inner.get_definition())
+    assert str(outer.get_definition()) == (
+        "fn outer() {\n"
+        "    fn inner() {\n"
+        "        #[derive(Debug)]\n"
+        "        let my_var_1: i32 = 10;\n"
+        "    }\n"
+        "}"
+    )
+
+    # Deep nesting renders every level exactly once, without recursing through str().
+    root = Function("level_0")
+    current = root
+    for i in range(1, 200):
+        child = Function(f"level_{i}")
+        current.add(child.get_definition())
+        current = child
+    lines = str(root.get_definition()).split("\n")
+    assert len(lines) == 400
+    assert lines[199] == " " * 4 * 199 + "fn level_199() {"
+    assert lines[-1] == "}"
+
+
+def test_static_array():
+    table = StaticArray("TABLE", RTypes.u8, [0, 1, 4, 9, 300, -3])
+    assert str(table.get_declaration()) == (
+        "static TABLE: [u8; 6] = [\n" "    0, 1, 4, 9, 255, 0,\n" "];"
+    )
+
+    hex_table = ConstArray(
+        "HEX", RTypes.u16, array("H", [1, 255, 4096]), radix=16, suffix=True
+    )
+    assert str(hex_table.get_declaration()) == (
+        "const HEX: [u16; 3] = [\n" "    0x1u16, 0xffu16, 0x1000u16,\n" "];"
+    )
+
+    pairs = StaticArray("PAIRS", Tuple(RTypes.u8, RTypes.char), [(1, "a"), (2, "'")])
+    assert str(pairs.get_declaration()) == (
+        "static PAIRS: [(u8, char); 2] = [\n" "    (1, 'a'), (2, '\\''),\n" "];"
+    )
+
+    nested = StaticArray("GRID", RTypes.i8, [[1, -2], [3, -4]], public=True)
+    assert str(nested.get_declaration()) == (
+        "pub static GRID: [[i8; 2]; 2] = [\n" "    [1, -2],\n" "    [3, -4],\n" "];"
+    )
+
+    # Long rows wrap at the line width, and the trailing partial line is kept last.
+    wrapped = StaticArray("WRAP", RTypes.u32, list(range(100)), width=40)
+    lines = str(wrapped.get_declaration()).split("\n")
+    assert all(len(x) <= 40 for x in lines)
+    assert lines[1] == "    0, 1, 2, 3, 4, 5, 6, 7, 8,"
+    assert re.sub(replace_pattern, "", "".join(lines[1:-1])) == "".join(
+        f"{x}," for x in range(100)
+    )
+
+
+def test_static_array_numpy():
+    np = pytest.importorskip("numpy")
+    values = np.arange(12, dtype=np.int64).reshape(2, 3, 2)
+    grid = StaticArray("GRID", RTypes.u16, values, width=30)
+    assert grid.get_type() == "[[[u16; 2]; 3]; 2]"
+    assert re.sub(replace_pattern, "", str(grid.get_declaration())) == (
+        "staticGRID:[[[u16;2];3];2]=[[[0,1],[2,3],[4,5],],[[6,7],[8,9],[10,11],],];"
+    )
+
+    floats = StaticArray("F", RTypes.f32, np.array([1.5, np.nan, 2]), suffix=True)
+    assert "1.5f32, f32::NAN, 2.0f32," in str(floats.get_declaration())
+
+    reshaped = ConstArray("FLAT", RTypes.u8, np.zeros(6), shape=(3, 2))
+    assert reshaped.get_type() == "[[u8; 2]; 3]"
+
+    # Whole floats are taken as integers, other floats are reported rather than truncated.
+    grid = StaticArray("EYE", RTypes.u8, np.eye(2))
+    assert "[1, 0],\n    [0, 1]," in str(grid.get_declaration())
+    clamped = StaticArray("CLAMPED", RTypes.u8, np.array([-0.5, 300.5, 7.0]))
+    assert "    0, 255, 7,\n" in str(clamped.get_declaration())
+    with diagnostics.collect() as collector:
+        lossy = StaticArray("LOSSY", RTypes.u8, np.array([2.5, 300.5, np.nan, 7.0]))
+    assert [x.code for x in collector.diagnostics] == ["invalid-value"]
+    assert collector.diagnostics[0].construct == "StaticArray"
+    assert collector.diagnostics[0].value[0] == 2.5
+    assert len(collector.diagnostics[0].value) == 2
+    assert not hasattr(lossy, "_values")
+    with pytest.raises(DiagnosticError), diagnostics.collect(diagnostics.STRICT):
+        StaticArray("LOSSY", RTypes.u8, np.array([1.0, 2.5]))
+
+    # Large tables stream through the renderer in chunks rather than one big string.
+    big = np.arange(300_000) % 256
+    writer = CodeWriter()
+    writer.add(StaticArray("BIG", RTypes.u8, big))
+    sink = io.StringIO()
+    writer.write_to(sink)
+    text = sink.getvalue()
+    assert text.startswith("static BIG: [u8; 300000] = [\n    0, 1, 2,")
+    assert text.endswith("223,\n];")
+    assert text.count(",") == 300_000
+
+
+def test_static_array_without_numpy(monkeypatch):
+    monkeypatch.setattr(rtypes, "_numpy", None)
+    grid = StaticArray("GRID", RTypes.u8, [[1, 2], [3, 400]], radix=16)
+    assert re.sub(replace_pattern, "", str(grid.get_declaration())) == (
+        "staticGRID:[[u8;2];2]=[[0x1,0x2],[0x3,0xff],];"
+    )
+
+    floats = StaticArray("F", RTypes.u8, array("d", [1.0, 300.0]))
+    assert "    1, 255,\n" in str(floats.get_declaration())
+    with diagnostics.collect() as collector:
+        StaticArray("F", RTypes.u8, array("d", [1.0, 2.5]))
+    assert len(collector) == 1 and collector.diagnostics[0].value == [2.5]
+    buffer = StaticArray("BUF", RTypes.u8, b"\x01\x02")
+    assert str(buffer.get_declaration()) == "static BUF: [u8; 2] = [\n    1, 2,\n];"
+
+
+def test_struct_of_arrays():
+    model = Struct({"a": "u8", "b": (RTypes.i8, RTypes.i8)}, name="Model")
+    columns = StructOfArrays(model, {"a": [1, 300], "b": [(1, 2), (3, -4)]})
+    assert [x.get_name() for x in columns.get_columns()] == ["MODEL_A", "MODEL_B"]
+    assert re.sub(replace_pattern, "", str(columns.get_declaration())) == (
+        "pubstaticMODEL_A:[u8;2]=[1,255,];"
+        "pubstaticMODEL_B:[(i8,i8);2]=[(1,2),(3,-4),];"
+        "pubstructModelColumns{puba:&'static[u8],pubb:&'static[(i8,i8)],}"
+        "pubstaticMODEL:ModelColumns=ModelColumns{a:&MODEL_A,b:&MODEL_B,};"
+        "implModelColumns{pubfnlen(&self)->usize{2}"
+        "pubfnget(&self,index:usize)->Model{Model{a:self.a[index],b:self.b[index],}}}"
+    )
+
+
+def test_struct_of_arrays_numpy(monkeypatch):
+    np = pytest.importorskip("numpy")
+    model = Struct({"id": "u32", "level": "u8"}, name="Record")
+    records = np.zeros(1000, dtype=[("id", "u4"), ("level", "i2")])
+    records["id"] = np.arange(1000)
+    records["level"] = np.arange(1000) - 500
+    columns = StructOfArrays(model, records, name="Records", prefix="RECORDS")
+    ids, levels = columns.get_columns()
+    assert ids.get_type() == "[u32; 1000]"
+    text = str(levels.get_declaration())
+    assert text.startswith("pub static RECORDS_LEVEL: [u8; 1000] = [\n    0, 0, 0,")
+    assert text.endswith("255, 255,\n];")
+
+    # Columns are filtered once, by the StructOfArrays, and invalid values reject it.
+    calls = []
+    filter_many = rtypes._NUMBER_._filter_many
+    monkeypatch.setattr(
+        rtypes._NUMBER_,
+        "_filter_many",
+        lambda self, x: calls.append(len(x)) or filter_many(self, x),
+    )
+    StructOfArrays(model, records)
+    assert calls == [1000, 1000]
+    records = {"id": np.arange(2), "level": np.array([1.0, 2.5])}
+    with diagnostics.collect() as collector:
+        StructOfArrays(model, records)
+    assert [(x.code, x.field, x.value) for x in collector.diagnostics] == [
+        ("invalid-value", "level", [2.5])
+    ]
+
+
+def test_struct_of_arrays_str():
+    model = Struct({"id": "u8", "name": "str"}, name="Named")
+    columns = StructOfArrays(model, {"id": [1, 2], "name": ["a", "b"]})
+    assert columns.get_columns()[1].get_type() == "[&'static str; 2]"
+    text = re.sub(replace_pattern, "", str(columns.get_declaration()))
+    assert 'pubstaticNAMED_NAME:[&\'staticstr;2]=["a","b",];' in text
+    assert "pubname:&'static[&'staticstr]," in text
+    pair = StaticArray("PAIRS", Tuple(RTypes.u8, RTypes.str), [(1, "a")])
+    assert pair.get_type() == "[(u8, &'static str); 1]"
+
+
+def test_static_table():
+    model = Struct({"id": "u32", "name": "str", "ok": "bool"}, name="Model")
+    rows = [{"id": 1, "name": 'a"b', "ok": 1}, (2, "c", False)]
+    table = StaticTable("MODELS", model, rows)
+    assert str(table.get_declaration()) == (
+        "static MODELS: [Model; 2] = [\n"
+        '    Model { id: 1, name: "a\\"b", ok: true },\n'
+        '    Model { id: 2, name: "c", ok: false },\n'
+        "];"
+    )
+
+    # One-shot iterators are emitted as a slice.
+    table = StaticTable("MODELS", model, iter(rows), public=True)
+    assert str(table.get_declaration()).startswith(
+        "pub static MODELS: &[Model] = &[\n    Model { id: 1,"
+    )
+
+    # Invalid rows are reported and left out, and the length only counts the valid ones.
+    bad_rows = rows + [{"id": 1}, {"id": 3, "name": "d", "ok": True, "x": 0}]
+    bad_rows += [(-4, "e", True), ("five", "f", True)]
+    with diagnostics.collect() as collector:
+        text = str(StaticTable("MODELS", model, bad_rows).get_declaration())
+        str(StaticTable("MODELS", model, rows, length=3).get_declaration())
+    assert text.startswith("static MODELS: [Model; 3] = [\n")
+    assert "Model { id: 0," in text and "None" not in text and "id: 3" not in text
+    assert [x.code for x in collector.diagnostics] == [
+        "missing-fields",
+        "unknown-keys",
+        "invalid-value",
+        "arg-count",
+    ]
+    with pytest.raises(DiagnosticError):
+        with diagnostics.collect("strict"):
+            str(StaticTable("MODELS", model, [{"id": 1}]).get_declaration())
+
+
+def test_static_table_floats():
+    model = Struct({"x": "f32", "id": "u8"}, name="Point")
+    rows = [{"x": 1.5, "id": 1}, {"x": -2.0, "id": 2}, (1e39, 3), (float("nan"), 4)]
+    with diagnostics.collect() as collector:
+        text = str(StaticTable("POINTS", model, rows).get_declaration())
+    assert not collector.diagnostics
+    assert text == (
+        "static POINTS: [Point; 4] = [\n"
+        "    Point { x: 1.5, id: 1 },\n"
+        "    Point { x: -2.0, id: 2 },\n"
+        "    Point { x: 3.4028234663852886e+38, id: 3 },\n"
+        "    Point { x: f32::NAN, id: 4 },\n"
+        "];"
+    )
+
+
+def test_static_table_single_pass():
+    class Rows:
+        consumed = 0
+
+        def __iter__(self):
+            for row in [(1, 2), (3, 4)]:
+                Rows.consumed += 1
+                yield row
+
+    model = Struct({"id": "u32", "value": "i16"}, name="Row")
+    text = str(StaticTable("ROWS", model, Rows()).get_declaration())
+    # The rows are counted, filtered and formatted in a single pass.
+    assert text.startswith("static ROWS: [Row; 2] = [") and Rows.consumed == 2
+
+
+def test_static_table_streaming():
+    model = Struct({"id": "u32", "value": "i16"}, name="Row")
+    rows = ((i, -i) for i in range(20_000))
+    writer = CodeWriter()
+    writer.add(StaticTable("ROWS", model, rows, length=20_000))
+
+    chunks = []
+    sink = io.StringIO()
+    sink.write = chunks.append
+    writer.write_to(sink, drain=True)
+    # The rows are flushed to the sink while the table is still being rendered.
+    assert len(chunks) > 1
+    text = "".join(chunks)
+    assert text.startswith(
+        "static ROWS: [Row; 20000] = [\n    Row { id: 0, value: 0 },"
+    )
+    assert text.endswith("    Row { id: 19999, value: -19999 },\n];")
@@ -1,10 +1,14 @@
 import sys
 import os
 import re
+import pickle
 
 import pytest
 import warnings
 
+from array import array
+
+from ecdypy import diagnostics, rtypes
 from ecdypy.rtypes import RTypes, Tuple, Struct
 
 current = os.path.dirname(os.path.realpath(__file__))
@@ -224,3 +228,133 @@ def test_struct_assignment():
 
     # three_declaration = re.sub(replace_pattern, "", struct_three.get_declaration())
     # assert three_declaration == r"structstruct_three{A:u8,B:u8,C:struct_two,D:(u8,u8)}"
+
+
+def test_type_interning():
+    tuple_one = Tuple(RTypes.u16, RTypes.u16)
+    assert Tuple(RTypes.u16, RTypes.u16) is tuple_one
+    assert Tuple("u16", "u16") == tuple_one
+    assert hash(Tuple("u16", "u16")) == hash(tuple_one)
+    assert Tuple("u16", "u8") != tuple_one
+    assert len({tuple_one, Tuple(RTypes.u16, "u16"), Tuple(("u8", "u8"))}) == 2
+
+    struct_one = Struct({"A": "u8", "B": tuple_one}, name="struct_one")
+    assert Struct({"A": "u8", "B": tuple_one}, name="struct_one") is struct_one
+    assert (
+        Struct(("A", RTypes.u8), ("B", ("u16", "u16")), name="struct_one") == struct_one
+    )
+    assert Struct({"A": "u8", "B": tuple_one}, name="struct_two") != struct_one
+
+    assert pickle.loads(pickle.dumps(tuple_one)) is tuple_one
+    assert pickle.loads(pickle.dumps(struct_one)) is struct_one
+
+
+def test_tuple_wide_layout():
+    width = 5000
+    wide = Tuple(["u8"] * (width - 2), ("u16", ("u32",)), check=True)
+    assert wide.get_types_count() == width
+    values = [1] * (width - 2) + [(2, (3,))]
+    assert wide.value_from(values) == tuple([1] * (width - 2) + [(2, (3,))])
+    assert wide.is_ok(*values) == True
+    assert wide.is_ok(*values[1:]) == False
+
+    assert Tuple._flatten_args([[1, [2, (3, 4)]], 5]) == [1, 2, 3, 4, 5]
+    assert Tuple._flatten_lists([[1, [2, (3, 4)]], 5]) == [1, 2, (3, 4), 5]
+
+
+def test_compiled_validators():
+    tuple_one = Tuple(RTypes.u8, ("i8", "bool"))
+    assert len(tuple_one._validators) == 2
+    assert tuple_one.value_from(300, (-200, 1)) == (255, (-127, "true"))
+
+    struct_one = Struct({"A": "u8", "B": tuple_one}, name="compiled_struct")
+    assert set(struct_one._validators) == {"A", "B"}
+    assert (
+        struct_one.value_from({"A": 256, "B": [1, (1, 0)]})
+        == "compiled_struct {A: 255,B: (1, (1, 'false')),};"
+    )
+
+    state = pickle.loads(pickle.dumps(tuple_one, protocol=4))
+    assert state.value_from(1, (2, True)) == (1, (2, "true"))
+
+
+def test_struct_wide_fields():
+    fields = {f"field_{i}": RTypes.u16 for i in range(300)}
+    wide = Struct(fields, name="wide_struct")
+    assert wide._fields["field_299"] == (299, RTypes.u16)
+
+    values = {f"field_{i}": i * 1000 for i in range(300)}
+    literal = wide.value_from(values)
+    assert literal.startswith("wide_struct {field_0: 0,field_1: 1000,")
+    assert literal.endswith("field_299: 65535,};")
+
+    # Missing and repeated fields are reported.
+    assert wide.is_ok({"field_0": 1}) == False
+    out, missing = wide._verify_vals([("field_0", 1), ("field_0", 2)])
+    assert out == [("field_0", 1)]
+    assert len(missing) == 299 and missing[0] == "field_1"
+
+
+def test_number_value_from_many():
+    np = pytest.importorskip("numpy")
+
+    clamped, mask = RTypes.u8.value.value_from_many(
+        np.array([-1, 5, 300], dtype=np.int32)
+    )
+    assert isinstance(clamped, np.ndarray) and isinstance(mask, np.ndarray)
+    assert clamped.tolist() == [0, 5, 255]
+    assert mask.tolist() == [True, False, True]
+    is_ok = RTypes.i8.value.is_ok_many(np.array([-128, 0, 127]))
+    assert is_ok.tolist() == [False, True, True]
+
+    # Bounds wider than the dtype never flag anything.
+    samples = np.arange(-5, 5, dtype=np.int16)
+    assert not RTypes.i128.value.value_from_many(samples)[1].any()
+
+    clamped, mask = RTypes.f32.value.value_from_many(np.array([1.5, 1e39, -np.inf]))
+    assert clamped.tolist() == [1.5, 3.4028234663852886e38, -3.4028234663852886e38]
+    assert mask.tolist() == [False, True, True]
+
+    # Floats are filtered like single values: whole numbers are kept, others are clamped when
+    # out of range and rejected otherwise.
+    with diagnostics.collect() as collector:
+        clamped, mask = RTypes.u8.value.value_from_many(
+            np.array([3.0, 2.5, 300.5, -7.5, np.nan, np.inf, 255.0])
+        )
+    assert clamped.tolist() == [3, 0, 255, 0, 0, 0, 255]
+    assert mask.tolist() == [False, True, True, True, True, True, False]
+    assert len(collector) == 1
+    assert collector.diagnostics[0].code == "invalid-value"
+    assert collector.diagnostics[0].value[0] == 2.5
+    assert len(collector.diagnostics[0].value) == 3
+    assert RTypes.i32.value.value_from_many([3.0]) == ([3], [False])
+
+    # Float bounds are rounded outward, so the largest floats are still clamped exactly.
+    clamped, mask = RTypes.i64.value.value_from_many(
+        np.array([9.3e18, -(2.0**63), 5.0])
+    )
+    assert clamped.tolist() == [2**63 - 1, -(2**63 - 1), 5]
+    assert mask.tolist() == [True, True, False]
+    clamped, mask = RTypes.u64.value.value_from_many(np.array([2.0**64, 1e19]))
+    assert clamped.tolist() == [2**64 - 1, 10**19]
+    assert mask.tolist() == [True, False]
+
+
+def test_number_value_from_many_without_numpy(monkeypatch):
+    monkeypatch.setattr(rtypes, "_numpy", None)
+
+    clamped, mask = RTypes.u16.value.value_from_many(array("i", [-1, 5, 70000]))
+    assert clamped == [0, 5, 65535]
+    assert mask == [True, False, True]
+    assert RTypes.u8.value.is_ok_many(memoryview(bytes([0, 255]))) == [True, True]
+
+    clamped, mask = RTypes.f32.value.value_from_many(array("d", [1.0, -1e39]))
+    assert clamped == [1.0, -3.4028234663852886e38]
+    assert mask == [False, True]
+
+    with diagnostics.collect() as collector:
+        clamped, mask = RTypes.u8.value.value_from_many(
+            array("d", [1.0, 300.0, float("nan")])
+        )
+    assert clamped == [1, 255, 0] and mask == [False, True, True]
+    assert len(collector) == 1
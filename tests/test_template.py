@@ -0,0 +1,128 @@
+from ecdypy import diagnostics
+from ecdypy import template as template_module
+from ecdypy.codewriter import CodeText, CodeWriter, FrozenCodeText
+from ecdypy.rtypes import RTypes, Tuple, Struct
+from ecdypy.rconstructs import Variable, Function
+from ecdypy.template import Placeholder, Template
+import gc
+import pickle
+
+
+def _build(name, typ, limit):
+    func = Function(name, [{"value": typ}], RTypes.bool)
+    func.add(Variable("limit", RTypes.u32, limit))
+    func.add(Variable("label", RTypes.str, "x"))
+    func.add("value < limit")
+    return func
+
+
+def test_template_function():
+    func = _build(Placeholder("name"), Placeholder("T"), Placeholder("limit"))
+    template = Template(func.get_definition())
+    assert template.placeholders == ("name", "T", "limit")
+
+    for i in range(20):
+        expected = str(_build(f"check_{i}", "u16", i).get_definition())
+        assert template.render(name=f"check_{i}", T="u16", limit=i) == expected
+    assert template(name="check", T="u8", limit=1) == template.render(
+        name="check", T="u8", limit=1
+    )
+
+    # Placeholders of a Function added to a CodeWriter stand for both of its forms.
+    template = Template(_build(Placeholder("name"), "u8", 1))
+    assert template.render(name="check") == str(CodeWriter(_build("check", "u8", 1)))
+
+
+def test_template_typed_placeholder():
+    limit = Placeholder("limit", RTypes.u32)
+    label = Placeholder("label", RTypes.str)
+    pair = Placeholder("pair", Tuple(RTypes.u8, RTypes.bool))
+    cwr = CodeWriter()
+    cwr.add(Variable("limit", RTypes.u32, limit))
+    cwr.add(Variable("label", RTypes.str, label))
+    cwr.add(Variable("pair", Tuple(RTypes.u8, RTypes.bool), pair))
+    template = Template(cwr)
+
+    text = template.render(limit=2**40, label='say "hi"', pair=[1, True])
+    assert text == (
+        "let limit: u32 = 4294967295;\n"
+        'let label: str = "say \\"hi\\"";\n'
+        "let pair: (u8, bool) = (1, true);"
+    )
+    copy = pickle.loads(pickle.dumps(limit))
+    assert copy == limit and copy.get_name() == "limit"
+
+
+def test_template_placeholder_dropped():
+    # The Placeholder is only formatted into text, and collected before the Template is built.
+    text = CodeText(f"const X: u32 = {Placeholder('x', RTypes.u32)};")
+    gc.collect()
+    template = Template(text)
+    assert template.render(x=2**40) == "const X: u32 = 4294967295;"
+    with diagnostics.collect() as collector:
+        assert template.render(x="99999999999; evil") is None
+    assert [x.code for x in collector.diagnostics] == ["invalid-value"]
+
+    # Every Placeholder of the same type shares one entry of the registry.
+    count = len(template_module._types)
+    for i in range(100):
+        Placeholder(f"x{i}", RTypes.u32)
+    assert len(template_module._types) == count
+
+
+def test_template_invalid_typed_value():
+    cwr = CodeWriter()
+    cwr.add(Variable("limit", RTypes.u32, Placeholder("limit", RTypes.u32)))
+    cwr.add(
+        Variable(
+            "pair",
+            Tuple(RTypes.u8, RTypes.bool),
+            Placeholder("pair", Tuple(RTypes.u8, RTypes.bool)),
+        )
+    )
+    template = Template(cwr)
+    with diagnostics.collect() as collector:
+        assert template.render(limit=2.5, pair=(1, True)) is None
+        assert template.render(limit=1, pair=("a", True)) is None
+        assert template.instantiate(limit=2.5, pair=(1, True)) is None
+    assert [x.code for x in collector.diagnostics] == ["invalid-value"] * 3
+    assert template.render(limit=1, pair=(1, True)) == (
+        "let limit: u32 = 1;\nlet pair: (u8, bool) = (1, true);"
+    )
+
+
+def test_template_struct():
+    struct = Struct({"a": "u8", Placeholder("field"): "u16"}, name=Placeholder("S"))
+    text = Template(struct).render(S="Point", field="b")
+    assert text == str(Struct({"a": "u8", "b": "u16"}, name="Point").get_declaration())
+
+
+def test_template_instantiate():
+    func = Function(Placeholder("name"))
+    func.add("{ braces }")
+    template = Template(func.get_definition())
+
+    cwr = CodeWriter()
+    outer = Function("outer")
+    for i in range(3):
+        instance = template.instantiate(name=f"func_{i}")
+        assert isinstance(instance, FrozenCodeText) and len(instance) == 3
+        cwr.add(instance)
+        outer.add(instance)
+    assert str(cwr).splitlines()[3:6] == ["fn func_1() {", "    { braces }", "}"]
+    assert "\n    fn func_0() {\n        { braces }\n    }\n" in str(
+        outer.get_definition()
+    )
+
+
+def test_template_invalid_values():
+    template = Template(Function(Placeholder("name"), [{"a": Placeholder("T")}]))
+    with diagnostics.collect() as collector:
+        assert template.render(name="f") is None
+        assert template.render(name="f", T="u8", other=1) is None
+        Placeholder("bad name")
+    assert [x.code for x in collector.diagnostics] == [
+        "missing-fields",
+        "unknown-keys",
+        "invalid-name",
+    ]